@@ -1,3 +1,4 @@
+import os
 from pydantic import BaseSettings
 from functools import lru_cache
 
@@ -9,25 +10,121 @@ class Settings(BaseSettings):
     APP_NAME: str = "Stock Price Prediction API"
     APP_VERSION: str = "1.0.0"
     ENVIRONMENT: str = "development"   # development / production
+    BASE_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
     # ───────────────────────────────
     # MODEL PATHS
     # ───────────────────────────────
     LSTM_MODEL_PATH: str = "app/models/lstm_model.h5"
+    LSTM_NPZ_PATH: str = "app/models/lstm_model.npz"   # NumPy export of the LSTM weights
     ARIMA_MODEL_PATH: str = "app/models/arima_model.pkl"
     SARIMA_MODEL_PATH: str = "app/models/sarima_model.pkl"
     LIGHTGBM_MODEL_PATH: str = "app/models/lightgbm_model.txt"
-    SCALER_PATH: str = "app/models/scaler.pkl"
+    SCALER_PATH: str = "app/models/scaler.pkl"                    # risk / event features
+    LIGHTGBM_SCALER_PATH: str = "app/models/lightgbm_scaler.pkl"  # LightGBM price features (optional)
+    RISK_MODEL_PATH: str = "app/models/risk_model.pkl"            # optional, rule-based fallback
+    EVENT_MODEL_PATH: str = "app/models/event_impact_model.pkl"   # optional, rule-based fallback
+    EVENT_LEXICON_PATH: str = "app/models/event_lexicon.csv"      # weighted terms (built-in list if missing)
+
+    # ───────────────────────────────
+    # MODEL REGISTRY
+    # ───────────────────────────────
+    MODEL_PRELOAD: bool = False   # load every model at startup instead of on first use
+    LSTM_ENGINE: str = "numpy"    # numpy / tensorflow
+    MODEL_WATCH_INTERVAL_S: float = 0.0    # poll artifacts and hot-reload on change (0 = off)
+    MODEL_DRAIN_TIMEOUT_S: float = 30.0    # max wait for in-flight requests on a swapped-out model
+
+    # ───────────────────────────────
+    # LSTM MICRO-BATCHING
+    # ───────────────────────────────
+    LSTM_MAX_BATCH_SIZE: int = 32
+    LSTM_MAX_WAIT_MS: float = 5.0
+    LSTM_MAX_PENDING: int = 1024      # queued single-step requests before 503
+
+    # ───────────────────────────────
+    # EXECUTION POOLS & BACKPRESSURE
+    # ───────────────────────────────
+    CPU_POOL_WORKERS: int = 4
+    CPU_MAX_IN_FLIGHT: int = 64       # queued + running before 503
+    IO_POOL_WORKERS: int = 8
+    IO_MAX_IN_FLIGHT: int = 128
+    OVERLOAD_RETRY_AFTER_S: float = 1.0
+    COMPARE_MODEL_TIMEOUT_S: float = 10.0   # per-model budget for /api/predict/compare
+
+    # ───────────────────────────────
+    # BATCH PREDICTION
+    # ───────────────────────────────
+    BATCH_MAX_ITEMS: int = 10000
+    BATCH_CHUNK_SIZE: int = 500       # items per pool task; results stream after each chunk
 
     # ───────────────────────────────
     # DATA SETTINGS
     # ───────────────────────────────
     REALTIME_CACHE_PATH: str = "data/realtime_cache.json"
 
+    # ───────────────────────────────
+    # MONTE CARLO VaR
+    # ───────────────────────────────
+    VAR_CHUNK_PATHS: int = 20000      # paths per simulation chunk (bounds memory)
+    VAR_MAX_PATHS: int = 1_000_000
+    VAR_MAX_HORIZON_DAYS: int = 252   # longest simulated horizon
+    VAR_MAX_HORIZONS: int = 8         # horizons / confidence levels per request
+    SIMULATION_WORKERS: int = 0       # process pool for chunks (0 = run in the request thread)
+
+    # ───────────────────────────────
+    # LIVE RISK STATE
+    # ───────────────────────────────
+    RISK_EWMA_DECAY: float = 0.94                # RiskMetrics lambda for volatility / volume
+    RISK_STATE_PATH: str = "data/risk_state.npz" # snapshot loaded at startup, written on shutdown
+    RISK_STATE_SNAPSHOT_INTERVAL_S: float = 60.0 # periodic snapshot (0 = only on shutdown)
+
+    # ───────────────────────────────
+    # EVENT NEAR-DUPLICATE DETECTION
+    # ───────────────────────────────
+    EVENT_DEDUP_ENABLED: bool = True
+    EVENT_DEDUP_THRESHOLD: float = 0.8        # estimated Jaccard similarity of character shingles
+    EVENT_DEDUP_WINDOW_S: float = 3600.0      # events older than this are forgotten
+    EVENT_DEDUP_MAX_EVENTS: int = 100_000     # hard cap on indexed events
+
+    # ───────────────────────────────
+    # OHLCV HISTORY STORE
+    # ───────────────────────────────
+    HISTORY_STORE_DIR: str = "data/history"      # memory-mapped column files + index.json
+    HISTORY_INITIAL_CAPACITY: int = 4096         # rows reserved per new ticker
+    HISTORY_DEFAULT_WINDOW: int = 60             # closes used when a request sends only a ticker
+    HISTORY_FLUSH_INTERVAL_S: float = 5.0        # index / page flush period (0 = only on shutdown)
+
+    # ───────────────────────────────
+    # PER-TICKER MODEL STORE
+    # ───────────────────────────────
+    MODEL_STORE_DIR: str = "app/models/store"    # {family}/{ticker}/{version}/model.*
+    MODEL_STORE_BUDGET_BYTES: int = 1024 * 1024 * 1024
+    MODEL_WATCHLIST: str = ""                    # comma-separated tickers prefetched at startup
+
+    # ───────────────────────────────
+    # PER-TICKER ARIMA / SARIMA STATE
+    # ───────────────────────────────
+    STATE_SPACE_HISTORY: int = 2000              # observations kept per ticker for refits
+    STATE_SPACE_REFIT_INTERVAL_S: float = 3600.0 # background refit period (0 = off)
+
+    # ───────────────────────────────
+    # PREDICTION CACHE
+    # ───────────────────────────────
+    CACHE_BACKEND: str = "memory"     # memory / disk / none
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_TTL_SECONDS: float = 60.0
+    CACHE_DIR: str = "data/prediction_cache"   # used by the disk backend
+
     # ───────────────────────────────
     # EXTERNAL APIs (Optional)
     # ───────────────────────────────
     YFINANCE_ENABLED: bool = True
+    REALTIME_API_KEY: str = ""
+
+    # ───────────────────────────────
+    # STARTUP
+    # ───────────────────────────────
+    STARTUP_IMPORT_BUDGET_S: float = 2.0   # checked by tests/test_startup.py
 
     # ───────────────────────────────
     # SECURITY & CORS
@@ -1,6 +1,22 @@
+import os
+import logging
+from functools import lru_cache
+from typing import Optional
 from fastapi import Depends
 from .config import get_settings, Settings
+from .services.history_store import HistoryStore
 from .services.model_handler import ModelHandler
+from .services.model_registry import ModelRegistry
+from .services.model_store import ModelStore
+from .services.prediction_cache import PredictionCache, build_cache
+from .services.dedup import NearDuplicateIndex
+from .services.engines import EngineContainer
+from .services.event_engine import EventEngine
+from .services.risk_engine import RiskEngine
+from .services.risk_state import RiskStateStore
+from .services.var_engine import MonteCarloVaR
+from .services.execution import get_simulation_executor
+from .services.streaming_features import StreamingFeatureEngine
 
 # ─────────────────────────────────────────────
 # SETTINGS DEPENDENCY
@@ -11,14 +27,145 @@ def get_app_settings() -> Settings:
 
 
 # ─────────────────────────────────────────────
-# MODEL HANDLER DEPENDENCY
-# Loads ML models (LSTM, ARIMA, SARIMA, LightGBM)
-# and can be injected into routers
+# MODEL REGISTRY DEPENDENCY
+# One registry per process: every artifact is
+# loaded once and shared by all routers
 # ─────────────────────────────────────────────
-def get_model_handler(
-    settings: Settings = Depends(get_app_settings)
-):
-    return ModelHandler(settings)
+@lru_cache()
+def get_model_registry() -> ModelRegistry:
+    return ModelRegistry(get_settings())
+
+
+# ─────────────────────────────────────────────
+# PER-TICKER MODEL STORE DEPENDENCY
+# Memory-bounded, LRU-evicted models per
+# (ticker, family, version)
+# ─────────────────────────────────────────────
+@lru_cache()
+def get_model_store() -> ModelStore:
+    return ModelStore(get_settings())
+
+
+# ─────────────────────────────────────────────
+# ENGINE CONTAINER
+# Every engine is built once per application and
+# reads its artifacts from the shared registry, so
+# the scaler they all use is loaded exactly once.
+# Created at startup, torn down at shutdown.
+# ─────────────────────────────────────────────
+@lru_cache()
+def get_engines() -> EngineContainer:
+    settings, registry = get_settings(), get_model_registry()
+    return EngineContainer(registry, {
+        "model_handler": lambda: ModelHandler(settings, registry, get_cache(), get_model_store()),
+        "risk": lambda: RiskEngine(settings, registry, state=get_risk_state()),
+        "event": lambda: EventEngine(settings, registry),
+    })
+
+
+def close_engines():
+    if get_engines.cache_info().currsize:
+        get_engines().close()
+        get_engines.cache_clear()
+
+
+# ─────────────────────────────────────────────
+# ENGINE DEPENDENCIES
+# Ready engines from the container, injected into routers
+# ─────────────────────────────────────────────
+def get_model_handler() -> ModelHandler:
+    """ Serves ML models (LSTM, ARIMA, SARIMA, LightGBM) """
+    return get_engines()["model_handler"]
+
+
+def get_risk_engine() -> RiskEngine:
+    return get_engines()["risk"]
+
+
+def get_event_engine() -> EventEngine:
+    return get_engines()["event"]
+
+
+# ─────────────────────────────────────────────
+# LIVE RISK STATE DEPENDENCY
+# Per-ticker EWMA volatility / liquidity / drawdown,
+# restored from the last snapshot if there is one
+# ─────────────────────────────────────────────
+def risk_state_path() -> str:
+    settings = get_settings()
+    path = settings.RISK_STATE_PATH
+    return path if os.path.isabs(path) else os.path.join(settings.BASE_DIR, path)
+
+
+@lru_cache()
+def get_risk_state() -> RiskStateStore:
+    settings = get_settings()
+    path = risk_state_path()
+    if os.path.exists(path):
+        try:
+            return RiskStateStore.load(path, decay=settings.RISK_EWMA_DECAY)
+        except Exception as e:
+            logging.warning(f"Ignoring risk state snapshot {path}: {e}")
+    return RiskStateStore(decay=settings.RISK_EWMA_DECAY)
+
+
+# ─────────────────────────────────────────────
+# EVENT NEAR-DUPLICATE INDEX DEPENDENCY
+# Syndicated copies of a headline map to one
+# canonical event and reuse its cached impact
+# (None when EVENT_DEDUP_ENABLED is off).
+# Cached impacts are dropped when an artifact
+# of the event engine is reloaded.
+# ─────────────────────────────────────────────
+@lru_cache()
+def get_event_dedup() -> Optional[NearDuplicateIndex]:
+    settings = get_settings()
+    if not settings.EVENT_DEDUP_ENABLED:
+        return None
+    index = NearDuplicateIndex(
+        threshold=settings.EVENT_DEDUP_THRESHOLD,
+        window_s=settings.EVENT_DEDUP_WINDOW_S,
+        max_items=settings.EVENT_DEDUP_MAX_EVENTS
+    )
+    get_model_registry().add_listener(
+        lambda name, version: index.clear_results() if name in EventEngine.ARTIFACTS else None
+    )
+    return index
+
+
+# ─────────────────────────────────────────────
+# MONTE CARLO VaR ENGINE DEPENDENCY
+# ─────────────────────────────────────────────
+@lru_cache()
+def get_var_engine() -> MonteCarloVaR:
+    settings = get_settings()
+    return MonteCarloVaR(
+        settings.VAR_CHUNK_PATHS, settings.VAR_MAX_PATHS, get_simulation_executor(),
+        max_horizon=settings.VAR_MAX_HORIZON_DAYS
+    )
+
+
+# ─────────────────────────────────────────────
+# OHLCV HISTORY STORE DEPENDENCY
+# Memory-mapped per-ticker bars; windows are
+# zero-copy slices
+# ─────────────────────────────────────────────
+@lru_cache()
+def get_history_store() -> HistoryStore:
+    settings = get_settings()
+    directory = settings.HISTORY_STORE_DIR
+    if not os.path.isabs(directory):
+        directory = os.path.join(settings.BASE_DIR, directory)
+    return HistoryStore(directory, settings.HISTORY_INITIAL_CAPACITY)
+
+
+# ─────────────────────────────────────────────
+# STREAMING FEATURE ENGINE DEPENDENCY
+# Per-ticker O(1) features updated on every live tick
+# ─────────────────────────────────────────────
+@lru_cache()
+def get_feature_engine() -> StreamingFeatureEngine:
+    return StreamingFeatureEngine()
 
 
 # ─────────────────────────────────────────────
@@ -35,8 +182,16 @@ def get_db():
     return None
 
 
-def get_cache():
+@lru_cache()
+def get_cache() -> Optional[PredictionCache]:
     """
-    Placeholder for Redis / in-memory cache dependency.
+    Prediction cache selected by CACHE_BACKEND (memory / disk / none).
+    Entries of a model are dropped whenever that model is reloaded;
+    a LightGBM scaler reload drops the LightGBM entries.
     """
-    return None
+    cache = build_cache(get_settings())
+    if cache is not None:
+        get_model_registry().add_listener(
+            lambda name, version: cache.invalidate("lightgbm" if name == "lightgbm_scaler" else name)
+        )
+    return cache
@@ -1,11 +1,23 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from .routers import predict, realtime, risk, event, narrative, tracker
-from .config import Settings
-from .utils.logger import log_info
+from .utils.startup import startup_timer   # first import: starts the startup clock
+
+with startup_timer.phase("imports"):
+    import math
+    from fastapi import FastAPI, Request
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+    from .routers import predict, realtime, risk, event, narrative, tracker, history
+    from .config import get_settings
+    from .dependencies import (
+        close_engines, get_engines, get_history_store, get_model_registry, get_model_store,
+        get_risk_state, risk_state_path
+    )
+    from .services.execution import OverloadedError, shutdown_pools
+    from .utils.logger import log_info
+    from .utils import metrics
 
 # Load global settings
-settings = get_Settings()
+with startup_timer.phase("settings"):
+    settings = get_settings()
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -31,6 +43,7 @@ def create_app() -> FastAPI:
     app.include_router(event.router, prefix="/api/event", tags=["Event Impact Predictor"])
     app.include_router(narrative.router, prefix="/api/narrative", tags=["Narrative Engine"])
     app.include_router(tracker.router, prefix="/api/tracker", tags=["Prediction Tracker"])
+    app.include_router(history.router, prefix="/api/history", tags=["Price History"])
 
     # Health Check
     @app.get("/", tags=["Health"])
@@ -41,10 +54,56 @@ def create_app() -> FastAPI:
             "version": "1.0.0"
         }
 
+    # Startup timing breakdown (never touches ML libraries)
+    @app.get("/health/startup", tags=["Health"])
+    async def startup_report():
+        return startup_timer.report()
+
+    # Load shedding: saturated worker pools answer 503 + Retry-After
+    @app.exception_handler(OverloadedError)
+    async def overloaded_handler(request: Request, exc: OverloadedError):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(math.ceil(exc.retry_after))}
+        )
+
+    # Engine construction time and artifact sharing
+    @app.get("/health/engines", tags=["Health"])
+    async def engines_report():
+        return get_engines().report()
+
+    # In-process metrics (batching, queues, caches)
+    @app.get("/metrics", tags=["Health"])
+    async def get_metrics():
+        return metrics.snapshot()
+
     # Startup Event
     @app.on_event("startup")
     async def startup_event():
+        with startup_timer.phase("engines"):
+            engines = get_engines()
+        if settings.MODEL_PRELOAD:
+            with startup_timer.phase("model_load"):
+                engines.warm()
+        if settings.MODEL_WATCHLIST:
+            watchlist = [t.strip() for t in settings.MODEL_WATCHLIST.split(",") if t.strip()]
+            get_model_store().prefetch(watchlist)
+        if settings.MODEL_WATCH_INTERVAL_S > 0:
+            get_model_registry().watch(settings.MODEL_WATCH_INTERVAL_S, on_poll=get_model_store().refresh)
+        get_risk_state().autosave(risk_state_path(), settings.RISK_STATE_SNAPSHOT_INTERVAL_S)
+        get_history_store().autoflush(settings.HISTORY_FLUSH_INTERVAL_S)
         log_info("🚀 API Server Started Successfully")
+        log_info(f"Startup timing: {startup_timer.report()}")
+
+    # Shutdown Event
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        if len(get_risk_state()):
+            get_risk_state().snapshot(risk_state_path())
+        get_history_store().flush()
+        close_engines()
+        shutdown_pools()
 
     return app
 
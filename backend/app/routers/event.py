@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from app.dependencies import get_app_settings
-from app.services.event_engine import EventImpactEngine
+import json
+import time
+import asyncio
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
 from app.config import Settings
+from app.dependencies import get_app_settings, get_event_dedup, get_event_engine, get_risk_state
+from app.services.dedup import NearDuplicateIndex
+from app.services.event_engine import EventEngine
+from app.services.execution import OverloadedError, get_cpu_pool
+from app.services.risk_state import RiskStateStore
 
 
 router = APIRouter()
@@ -15,6 +23,25 @@ class EventInput(BaseModel):
     headline: str         # short event headline
     description: str = "" # optional extended info
     ticker: str = ""      # optional stock symbol
+    sentiment_score: float = 0.0
+    volatility: Optional[float] = None   # default: live volatility of `ticker`, else 0
+
+
+class BulkEventInput(BaseModel):
+    events: List[EventInput]
+
+
+def _event_text(item: EventInput) -> str:
+    return f"{item.headline}. {item.description}" if item.description else item.headline
+
+
+def _volatilities(items: List[EventInput], risk_state: RiskStateStore) -> List[float]:
+    """
+    Requested volatility per item, else the ticker's live volatility, else 0.
+    """
+    live = sorted({i.ticker for i in items if i.volatility is None and i.ticker in risk_state})
+    by_ticker = dict(zip(live, risk_state.features_many(live)["volatility"])) if live else {}
+    return [i.volatility if i.volatility is not None else float(by_ticker.get(i.ticker, 0.0)) for i in items]
 
 
 # ────────────────────────────────────────────
@@ -23,29 +50,237 @@ class EventInput(BaseModel):
 @router.post("/predict")
 async def predict_event_impact(
     request: EventInput,
-    settings: Settings = Depends(get_app_settings)
+    engine: EventEngine = Depends(get_event_engine),
+    risk_state: RiskStateStore = Depends(get_risk_state),
+    dedup: Optional[NearDuplicateIndex] = Depends(get_event_dedup)
 ):
-    try:
-        engine = EventImpactEngine(settings)
+    def _score():
+        text = _event_text(request)
+        volatility = _volatilities([request], risk_state)[0]
+        if dedup is None:
+            return engine.predict_event_impact(text, request.sentiment_score, volatility), {}
+
+        # Syndicated copies of an event already scored reuse its result
+        event, duplicate = dedup.resolve(text)
+        key = _result_key("predict", request.sentiment_score, volatility, engine.version())
+        result = dedup.cached_result(event, key)
+        if result is None:
+            result = engine.predict_event_impact(text, request.sentiment_score, volatility)
+            dedup.store_result(event, key, result)
+        return result, {"event_id": event.id, "duplicate": duplicate}
 
-        result = engine.predict_event_impact(
-            headline=request.headline,
-            description=request.description,
-            ticker=request.ticker
-        )
+    try:
+        result, dedup_info = await get_cpu_pool().run(_score)
 
         return {
             "event_headline": request.headline,
             "ticker": request.ticker if request.ticker else "N/A",
-            "impact": result["impact"],
+            "impact": result["impact_label"],
             "confidence": result["confidence"],
             "impact_score": result["impact_score"],
-            "reasoning": result["reasoning"]
+            "matched_terms": result["matched_terms"],
+            "reasoning": result["explanation"],
+            **dedup_info
         }
 
+    except OverloadedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ────────────────────────────────────────────
+# BULK EVENT IMPACT (NEWS FIREHOSE)
+# Body: {"events": [...]} or an NDJSON stream of
+# EventInput lines (Content-Type: application/x-ndjson).
+# Each chunk is scored with one scaler / model call;
+# one result line per event is streamed back after
+# every chunk, then a throughput summary line.
+# ────────────────────────────────────────────
+def _result_key(kind: str, sentiment: float, volatility: float, version: tuple):
+    """
+    Cached impact results of a canonical event are reused for the same
+    inputs scored by the same artifact versions
+    """
+    return kind, round(sentiment, 3), round(volatility, 4), version
+
+
+def _score_chunk(
+    engine: EventEngine,
+    risk_state: RiskStateStore,
+    dedup: Optional[NearDuplicateIndex],
+    chunk: list
+) -> list:
+    """
+    chunk: (index, EventInput or parse-error message) pairs.
+    Near-duplicates of an already scored event (in this chunk or earlier
+    within the dedup window) reuse its result instead of being scored.
+    """
+    valid = [(i, item) for i, item in chunk if isinstance(item, EventInput)]
+    items = [item for _, item in valid]
+    texts = [_event_text(item) for item in items]
+    volatility = _volatilities(items, risk_state)
+    version = engine.version()
+
+    # (canonical event, result key, cached result, duplicate?) per valid item;
+    # unscored keys go to the engine once
+    resolved, pending = [], {}
+    for k, item in enumerate(items):
+        if dedup is None:
+            resolved.append((None, k, None, False))
+            pending[k] = k
+            continue
+        event, duplicate = dedup.resolve(texts[k])
+        key = _result_key("bulk", item.sentiment_score, volatility[k], version)
+        cached = dedup.cached_result(event, key)
+        resolved.append((event, key, cached, duplicate))
+        if cached is None:
+            pending.setdefault((event.id, key), k)
+
+    scored = list(pending.values())
+    result = engine.predict_batch(
+        [texts[k] for k in scored],
+        [items[k].sentiment_score for k in scored],
+        [volatility[k] for k in scored]
+    )
+    fresh = {}
+    for j, (slot, k) in enumerate(pending.items()):
+        fresh[slot] = {
+            "impact": str(result["impact_label"][j]),
+            "impact_score": round(float(result["impact_score"][j]), 4),
+            "confidence": round(float(result["confidence"][j]), 3),
+            "matched_terms": [term for term, _ in result["matched_terms"][j]],
+        }
+        event = resolved[k][0]
+        if event is not None:
+            dedup.store_result(event, resolved[k][1], fresh[slot])
+
+    rows = {i: {"index": i, "status": "error", "detail": item} for i, item in chunk if not isinstance(item, EventInput)}
+    for k, (i, item) in enumerate(valid):
+        event, key, cached, duplicate = resolved[k]
+        row = {"index": i, "status": "ok", "ticker": item.ticker or "N/A"}
+        if event is None:
+            row.update(fresh[key])
+        else:
+            row.update(cached if cached is not None else fresh[(event.id, key)])
+            row.update(event_id=event.id, duplicate=duplicate)
+        rows[i] = row
+    return [rows[i] for i, _ in chunk]
+
+
+async def _ndjson_events(request: Request):
+    """ (index, EventInput or error) per non-empty line, parsed as the body arrives """
+    index, buffer = 0, b""
+    async for block in request.stream():
+        buffer += block
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield index, _parse_event(line)
+                index += 1
+    if buffer.strip():
+        yield index, _parse_event(buffer)
+
+
+def _parse_event(line: bytes):
+    try:
+        return EventInput.parse_raw(line)
+    except ValidationError as e:   # also raised for malformed JSON
+        return f"invalid event: {e.errors()[0]['msg']}"
+
+
+async def _chunks(events, size: int):
+    chunk = []
+    async for pair in events:
+        chunk.append(pair)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _list_events(items: List[EventInput]):
+    for pair in enumerate(items):
+        yield pair
+
+
+async def _next_chunk(chunks) -> Optional[list]:
+    try:
+        return await chunks.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+async def _run_chunk(engine: EventEngine, risk_state: RiskStateStore, dedup, chunk: list) -> list:
+    """ After the first chunk a 503 can no longer be sent: wait for capacity """
+    while True:
+        try:
+            return await get_cpu_pool().run(_score_chunk, engine, risk_state, dedup, chunk)
+        except OverloadedError as e:
+            await asyncio.sleep(e.retry_after)
+
+
+@router.post("/bulk")
+async def bulk_event_impact(
+    request: Request,
+    engine: EventEngine = Depends(get_event_engine),
+    risk_state: RiskStateStore = Depends(get_risk_state),
+    dedup: Optional[NearDuplicateIndex] = Depends(get_event_dedup),
+    settings: Settings = Depends(get_app_settings)
+):
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        events = _ndjson_events(request)
+    else:
+        try:
+            body = BulkEventInput.parse_raw(await request.body())
+        except (ValidationError, ValueError) as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if len(body.events) > settings.BATCH_MAX_ITEMS:
+            raise HTTPException(status_code=413, detail=f"At most {settings.BATCH_MAX_ITEMS} events per request")
+        events = _list_events(body.events)
+
+    start = time.perf_counter()
+    chunks = _chunks(events, settings.BATCH_CHUNK_SIZE)
+    first_chunk = await _next_chunk(chunks)
+
+    # The first chunk runs before the response starts, so overload still maps to 503
+    try:
+        first = await get_cpu_pool().run(_score_chunk, engine, risk_state, dedup, first_chunk) if first_chunk else []
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def stream():
+        count, rows = 0, first
+        while True:
+            count += len(rows)
+            for row in rows:
+                yield json.dumps(row) + "\n"
+            chunk = await _next_chunk(chunks)
+            if chunk is None:
+                break
+            rows = await _run_chunk(engine, risk_state, dedup, chunk)
+        elapsed = time.perf_counter() - start
+        yield json.dumps({"summary": {
+            "count": count,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "headlines_per_second": round(count / elapsed) if elapsed else None,
+        }}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+# ────────────────────────────────────────────
+# NEAR-DUPLICATE INDEX STATUS
+# ────────────────────────────────────────────
+@router.get("/dedup")
+async def dedup_status(
+    dedup: Optional[NearDuplicateIndex] = Depends(get_event_dedup)
+):
+    return dedup.stats() if dedup is not None else {"enabled": False}
+
 
 # ────────────────────────────────────────────
 # SAMPLE EVENTS FOR TESTING
@@ -0,0 +1,78 @@
+"""
+history.py
+----------
+OHLCV bar ingestion and window reads backed by the memory-mapped
+HistoryStore. Prediction endpoints pull their input windows from the
+same store when a request names a ticker but sends no data.
+"""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from app.dependencies import get_history_store
+from app.services.execution import OverloadedError, get_io_pool
+from app.services.history_store import COLUMNS, HistoryStore
+
+
+router = APIRouter()
+
+
+# ─────────────────────────────────────────────
+# REQUEST MODEL
+# ─────────────────────────────────────────────
+class BarsInput(BaseModel):
+    timestamp: List[int]                  # epoch seconds, strictly increasing
+    close: List[float]
+    open: Optional[List[float]] = None
+    high: Optional[List[float]] = None
+    low: Optional[List[float]] = None
+    volume: Optional[List[int]] = None
+
+
+# ─────────────────────────────────────────────
+# APPEND BARS
+# ─────────────────────────────────────────────
+@router.post("/{ticker}/bars")
+async def append_bars(
+    ticker: str,
+    bars: BarsInput,
+    store: HistoryStore = Depends(get_history_store)
+):
+    columns = {k: v for k, v in bars.dict().items() if v is not None}
+    try:
+        appended = await get_io_pool().run(store.append, ticker, columns)
+        return {"ticker": ticker, "appended": appended, "length": store.length(ticker)}
+    except OverloadedError:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ─────────────────────────────────────────────
+# READ LAST N VALUES
+# ─────────────────────────────────────────────
+@router.get("/{ticker}")
+async def get_window(
+    ticker: str,
+    n: int = Query(60, ge=1),
+    column: str = Query("close"),
+    store: HistoryStore = Depends(get_history_store)
+):
+    if column not in COLUMNS:
+        raise HTTPException(status_code=422, detail=f"Unknown column: {column}")
+    if not store.length(ticker):
+        raise HTTPException(status_code=404, detail=f"No history for {ticker}")
+    return {"ticker": ticker, "column": column, "values": store.window(ticker, n, column).tolist()}
+
+
+# ─────────────────────────────────────────────
+# STORE STATUS
+# ─────────────────────────────────────────────
+@router.get("/")
+async def history_status(
+    store: HistoryStore = Depends(get_history_store)
+):
+    return store.stats()
@@ -9,6 +9,12 @@ import logging
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from app.config import Settings
+from app.dependencies import get_app_settings
+from app.services.narrative_engine import NarrativeEngine
+
 # If you use any LLM API (OpenAI, HuggingFace, Local LLM, etc.)
 # You can plug in your client here
 # from llm_client import LLMClient
@@ -98,3 +104,31 @@ Avoid fluff. Keep it realistic and analytical.
         Summarize multiple events.
         """
         return [self.summarize_event(e) for e in events]
+
+
+# ────────────────────────────────────────────
+# API
+# ────────────────────────────────────────────
+router = APIRouter()
+
+
+class NarrativeInput(BaseModel):
+    events: List[Dict]                    # each {title, description}
+    risk_scores: Optional[Dict] = None
+    market_context: Optional[str] = None
+
+
+@router.post("/generate")
+async def generate_narrative(
+    request: NarrativeInput,
+    settings: Settings = Depends(get_app_settings)
+):
+    try:
+        narrative = NarrativeEngine(settings).generate(
+            events=request.events,
+            risk_scores=request.risk_scores,
+            market_context=request.market_context
+        )
+        return {"narrative": narrative}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
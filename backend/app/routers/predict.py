@@ -1,8 +1,20 @@
+import json
+import time
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from typing import List
-from app.dependencies import get_model_handler
-from app.services.model_handler import ModelHandler
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.config import Settings
+from app.dependencies import (
+    get_app_settings, get_cache, get_history_store, get_model_handler, get_model_registry, get_model_store
+)
+from app.services.execution import OverloadedError, get_cpu_pool, get_io_pool
+from app.services.history_store import HistoryStore
+from app.services.model_handler import ModelHandler, ModelNotLoadedError
+from app.services.model_registry import ModelRegistry
+from app.services.model_store import TICKER_PATTERN, ModelStore
+from app.services.prediction_cache import PredictionCache
 
 
 router = APIRouter()
@@ -12,8 +24,44 @@ router = APIRouter()
 # REQUEST MODEL
 # ─────────────────────────────────────────────
 class PredictInput(BaseModel):
-    data: List[float]      # last N closing prices
-    steps: int = 1         # number of future predictions
+    data: List[float] = []                # last N closing prices (empty: read from history)
+    steps: int = Field(1, ge=1, le=365)   # number of future predictions
+    ticker: Optional[str] = Field(None, regex=TICKER_PATTERN)   # enables per-ticker model state
+    window: Optional[int] = Field(None, ge=1)   # closes pulled from history (default HISTORY_DEFAULT_WINDOW)
+
+
+def _history_window(ticker: Optional[str], window: Optional[int], history: HistoryStore, settings: Settings):
+    """
+    Last closes of the ticker as a zero-copy view, or None if nothing is stored.
+    """
+    if not ticker or not history.length(ticker):
+        return None
+    return history.window(ticker, window or settings.HISTORY_DEFAULT_WINDOW)
+
+
+def input_series(
+    request: PredictInput,
+    history: HistoryStore = Depends(get_history_store),
+    settings: Settings = Depends(get_app_settings)
+):
+    """
+    The request's own data, else the ticker's stored closes.
+    """
+    if request.data:
+        return request.data
+    stored = _history_window(request.ticker, request.window, history, settings)
+    return stored if stored is not None else request.data
+
+
+async def run_lstm(model: ModelHandler, series, steps: int, ticker: Optional[str], timeout: Optional[float] = None):
+    """
+    Single-step requests on the shared model are awaited on the batcher
+    from the event loop, so they never park a CPU pool thread while the
+    micro-batch fills; everything else runs on the CPU pool.
+    """
+    if model.lstm_batchable(series, steps, ticker):
+        return await asyncio.wait_for(model.predict_lstm_batched(series, ticker=ticker), timeout)
+    return await get_cpu_pool().run(model.predict_lstm, series, steps, ticker=ticker, timeout=timeout)
 
 
 # ─────────────────────────────────────────────
@@ -22,11 +70,14 @@ class PredictInput(BaseModel):
 @router.post("/lstm")
 async def predict_lstm(
     request: PredictInput,
+    series=Depends(input_series),
     model: ModelHandler = Depends(get_model_handler)
 ):
     try:
-        output = model.predict_lstm(request.data, request.steps)
-        return {"model": "LSTM", "prediction": output}
+        output = await run_lstm(model, series, request.steps, request.ticker)
+        return {"model": "LSTM", "prediction": output.prediction, "model_version": output.model_version}
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -37,11 +88,14 @@ async def predict_lstm(
 @router.post("/arima")
 async def predict_arima(
     request: PredictInput,
+    series=Depends(input_series),
     model: ModelHandler = Depends(get_model_handler)
 ):
     try:
-        output = model.predict_arima(request.data, request.steps)
-        return {"model": "ARIMA", "prediction": output}
+        output = await get_cpu_pool().run(model.predict_arima, series, request.steps, ticker=request.ticker)
+        return {"model": "ARIMA", "prediction": output.prediction, "model_version": output.model_version}
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -52,11 +106,14 @@ async def predict_arima(
 @router.post("/sarima")
 async def predict_sarima(
     request: PredictInput,
+    series=Depends(input_series),
     model: ModelHandler = Depends(get_model_handler)
 ):
     try:
-        output = model.predict_sarima(request.data, request.steps)
-        return {"model": "SARIMA", "prediction": output}
+        output = await get_cpu_pool().run(model.predict_sarima, series, request.steps, ticker=request.ticker)
+        return {"model": "SARIMA", "prediction": output.prediction, "model_version": output.model_version}
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -67,29 +124,195 @@ async def predict_sarima(
 @router.post("/lightgbm")
 async def predict_lightgbm(
     request: PredictInput,
+    series=Depends(input_series),
     model: ModelHandler = Depends(get_model_handler)
 ):
     try:
-        output = model.predict_lightgbm(request.data, request.steps)
-        return {"model": "LightGBM", "prediction": output}
+        output = await get_cpu_pool().run(model.predict_lightgbm, series, request.steps, ticker=request.ticker)
+        return {"model": "LightGBM", "prediction": output.prediction, "model_version": output.model_version}
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # ─────────────────────────────────────────────
 # MULTI-MODEL COMPARE ENDPOINT
+# All models run concurrently on the shared CPU pool;
+# a slow or missing model only affects its own entry.
 # ─────────────────────────────────────────────
+COMPARE_MODELS = {
+    "LSTM": "predict_lstm",
+    "ARIMA": "predict_arima",
+    "SARIMA": "predict_sarima",
+    "LightGBM": "predict_lightgbm",
+}
+
+
+async def _run_compare_model(model: ModelHandler, method: str, request: PredictInput, series, timeout: float) -> dict:
+    start = time.perf_counter()
+    try:
+        if method == "predict_lstm":
+            output = await run_lstm(model, series, request.steps, request.ticker, timeout=timeout)
+        else:
+            output = await get_cpu_pool().run(
+                getattr(model, method), series, request.steps, ticker=request.ticker, timeout=timeout
+            )
+        result = {"status": "ok", "prediction": output.prediction, "model_version": output.model_version}
+    except OverloadedError:
+        raise
+    except asyncio.TimeoutError:
+        result = {"status": "timeout", "detail": f"no result within {timeout}s"}
+    except ModelNotLoadedError as e:
+        result = {"status": "unavailable", "detail": str(e)}
+    except Exception as e:
+        result = {"status": "error", "detail": str(e)}
+
+    result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
 @router.post("/compare")
 async def compare_models(
     request: PredictInput,
-    model: ModelHandler = Depends(get_model_handler)
+    series=Depends(input_series),
+    model: ModelHandler = Depends(get_model_handler),
+    settings: Settings = Depends(get_app_settings)
+):
+    timeout = settings.COMPARE_MODEL_TIMEOUT_S
+    results = await asyncio.gather(*(
+        _run_compare_model(model, method, request, series, timeout)
+        for method in COMPARE_MODELS.values()
+    ))
+    return dict(zip(COMPARE_MODELS, results))
+
+
+# ─────────────────────────────────────────────
+# BATCH PREDICTION (NDJSON STREAM)
+# Items are grouped per model into vectorized calls;
+# one result line per item, in input order, streamed
+# after every chunk.
+# ─────────────────────────────────────────────
+class BatchItem(BaseModel):
+    ticker: Optional[str] = Field(None, regex=TICKER_PATTERN)
+    series: List[float] = []              # empty: last `window` closes from history
+    window: Optional[int] = Field(None, ge=1)
+    steps: int = Field(1, ge=1, le=365)
+    model: str = Field("lstm", regex="^(lstm|arima|sarima|lightgbm)$")
+
+
+class BatchInput(BaseModel):
+    items: List[BatchItem]
+
+
+async def _run_chunk(model: ModelHandler, chunk: list) -> list:
+    """
+    Once the stream has started a 503 can no longer be sent,
+    so later chunks wait for pool capacity instead.
+    """
+    while True:
+        try:
+            return await get_cpu_pool().run(model.predict_batch, chunk)
+        except OverloadedError as e:
+            await asyncio.sleep(e.retry_after)
+
+
+@router.post("/batch")
+async def predict_batch(
+    request: BatchInput,
+    model: ModelHandler = Depends(get_model_handler),
+    history: HistoryStore = Depends(get_history_store),
+    settings: Settings = Depends(get_app_settings)
 ):
+    if len(request.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BATCH_MAX_ITEMS} items per batch")
+
+    items = [item.dict() for item in request.items]
+    for item in items:
+        # `window` only selects stored history; ModelHandler.predict_batch never sees it
+        window = item.pop("window")
+        if not item["series"]:
+            stored = _history_window(item["ticker"], window, history, settings)
+            if stored is not None:
+                item["series"] = stored
+    size = settings.BATCH_CHUNK_SIZE
+
+    # The first chunk runs before the response starts, so overload still maps to 503
     try:
-        return {
-            "LSTM": model.predict_lstm(request.data, request.steps),
-            "ARIMA": model.predict_arima(request.data, request.steps),
-            "SARIMA": model.predict_sarima(request.data, request.steps),
-            "LightGBM": model.predict_lightgbm(request.data, request.steps),
-        }
+        first = await get_cpu_pool().run(model.predict_batch, items[:size])
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    async def stream():
+        rows = first
+        for start in range(0, len(items), size):
+            if start:
+                rows = await _run_chunk(model, items[start:start + size])
+            for offset, row in enumerate(rows):
+                yield json.dumps({"index": start + offset, **row}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+# ─────────────────────────────────────────────
+# MODEL REGISTRY STATUS
+# ─────────────────────────────────────────────
+@router.get("/models")
+async def model_status(
+    registry: ModelRegistry = Depends(get_model_registry)
+):
+    return registry.stats()
+
+
+# ─────────────────────────────────────────────
+# HOT RELOAD (ADMIN)
+# New artifacts are staged and smoke-tested off the
+# request path; traffic keeps using the live models
+# until the atomic swap.
+# ─────────────────────────────────────────────
+class ReloadInput(BaseModel):
+    names: Optional[List[str]] = None    # default: every registered model
+
+
+@router.post("/models/reload")
+async def reload_models(
+    request: ReloadInput = ReloadInput(),
+    registry: ModelRegistry = Depends(get_model_registry),
+    store: ModelStore = Depends(get_model_store)
+):
+    unknown = set(request.names or ()) - set(registry.names())
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown models: {sorted(unknown)}")
+
+    try:
+        report = await get_io_pool().run(registry.reload, request.names)
+        store.refresh()
+        return {"models": report}
+    except OverloadedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ─────────────────────────────────────────────
+# PER-TICKER MODEL STORE STATUS
+# ─────────────────────────────────────────────
+@router.get("/models/store")
+async def model_store_status(
+    store: ModelStore = Depends(get_model_store)
+):
+    return store.stats()
+
+
+# ─────────────────────────────────────────────
+# PREDICTION CACHE STATUS
+# ─────────────────────────────────────────────
+@router.get("/cache")
+async def cache_status(
+    cache: PredictionCache = Depends(get_cache)
+):
+    if cache is None:
+        return {"backend": None}
+    return cache.stats()
@@ -12,11 +12,19 @@ Integrates all models to provide live insights.
 
 import time
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from event import EventDetector
-from risk_model import RiskModel
-from narrative import NarrativeGenerator, NarrativeConfig
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+from app.config import Settings
+from app.dependencies import get_app_settings, get_feature_engine, get_risk_state
+from app.services.realtime_source import RealtimeSource
+from app.services.execution import OverloadedError, get_io_pool
+from app.services.risk_state import RiskStateStore
+from app.services.streaming_features import StreamingFeatureEngine
+
+
+router = APIRouter()
 
 
 class RealTimePipeline:
@@ -34,6 +42,10 @@ class RealTimePipeline:
             risk_model_path: path to trained risk model
             poll_interval: seconds between each polling of live data
         """
+        # Pipeline-only dependencies are imported on first use
+        from event import EventDetector
+        from risk_model import RiskModel
+        from narrative import NarrativeGenerator, NarrativeConfig
 
         self.event_detector = EventDetector(model_path=event_model_path)
         self.risk_model = RiskModel(model_path=risk_model_path)
@@ -108,3 +120,50 @@ class RealTimePipeline:
             print("Narrative:", output["narrative"])
             print("========================\n")
             time.sleep(self.poll_interval)
+
+
+# ────────────────────────────────────────────
+# GET /api/realtime/{symbol}
+# ────────────────────────────────────────────
+@router.get("/{symbol}")
+async def get_realtime_quote(
+    symbol: str,
+    settings: Settings = Depends(get_app_settings)
+):
+    try:
+        return await get_io_pool().run(lambda: RealtimeSource(settings).get_data(symbol))
+    except OverloadedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ────────────────────────────────────────────
+# LIVE TICKS → INCREMENTAL FEATURES
+# ────────────────────────────────────────────
+class TickInput(BaseModel):
+    close: float = Field(..., gt=0)
+    volume: Optional[float] = Field(None, ge=0)
+
+
+@router.post("/{symbol}/tick")
+async def ingest_tick(
+    symbol: str,
+    tick: TickInput,
+    engine: StreamingFeatureEngine = Depends(get_feature_engine),
+    risk_state: RiskStateStore = Depends(get_risk_state)
+):
+    # Constant-time updates: cheap enough to run on the event loop
+    risk_state.update(symbol, tick.close, tick.volume)
+    return {"symbol": symbol, "features": engine.update(symbol, tick.close, tick.volume)}
+
+
+@router.get("/{symbol}/features")
+async def latest_features(
+    symbol: str,
+    engine: StreamingFeatureEngine = Depends(get_feature_engine)
+):
+    features = engine.latest(symbol)
+    if features is None:
+        raise HTTPException(status_code=404, detail=f"No ticks received for {symbol}")
+    return {"symbol": symbol, "features": features}
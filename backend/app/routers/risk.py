@@ -1,8 +1,14 @@
+from typing import List, Optional
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from app.dependencies import get_app_settings
-from app.services.risk_engine import RiskEngine
-from app.config import Settings
+from pydantic import BaseModel, Field, root_validator, validator
+from app.config import get_settings
+from app.dependencies import get_history_store, get_risk_engine, get_risk_state, get_var_engine
+from app.services.history_store import HistoryStore
+from app.services.risk_engine import CATEGORY_LABELS, RiskEngine, liquidity_risk
+from app.services.risk_state import RiskStateStore
+from app.services.var_engine import MonteCarloVaR, estimate_moments, log_returns
+from app.services.execution import OverloadedError, get_cpu_pool
 
 router = APIRouter()
 
@@ -11,12 +17,99 @@ router = APIRouter()
 # REQUEST BODY SCHEMA
 # ────────────────────────────────────────────
 class RiskInput(BaseModel):
+    """
+    Without volatility, the ticker is scored from its live risk state
+    (fed through /api/risk/ticks or /api/realtime/{symbol}/tick).
+    """
     ticker: str
-    price: float
-    volume: float
-    volatility: float
+    price: Optional[float] = None
+    volume: Optional[float] = None
+    volatility: Optional[float] = None
     sentiment_score: float = 0.0    # optional
     macro_index: float = 0.0        # optional
+    event_severity: float = 0.0     # optional
+
+
+class PortfolioInput(BaseModel):
+    """
+    One column per input; row i describes instrument i. Volatility and
+    liquidity may be omitted when tickers are given: they are then read
+    from the live risk state.
+    """
+    tickers: Optional[List[str]] = None
+    volatility: Optional[List[float]] = None
+    sentiment: List[float]
+    liquidity: Optional[List[float]] = None  # illiquidity in [0, 1]
+    event_severity: Optional[List[float]] = None
+
+    @root_validator(skip_on_failure=True)
+    def same_length(cls, values):
+        columns = [values[k] for k in ("tickers", "volatility", "sentiment", "liquidity", "event_severity")
+                   if values.get(k) is not None]
+        if len({len(c) for c in columns}) > 1:
+            raise ValueError("All portfolio columns must have the same length")
+        if (values.get("volatility") is None or values.get("liquidity") is None) and not values.get("tickers"):
+            raise ValueError("volatility and liquidity are required without tickers")
+        return values
+
+
+class TickBatch(BaseModel):
+    """
+    Price / volume ticks, one column per field; row i is one tick.
+    """
+    tickers: List[str]
+    price: List[float]
+    volume: Optional[List[float]] = None
+    timestamp: Optional[List[float]] = None     # epoch seconds (default: now)
+
+    @root_validator(skip_on_failure=True)
+    def same_length(cls, values):
+        columns = [values[k] for k in ("tickers", "price", "volume", "timestamp") if values.get(k) is not None]
+        if len({len(c) for c in columns}) > 1:
+            raise ValueError("All tick columns must have the same length")
+        return values
+
+
+class VarInput(BaseModel):
+    """
+    Return model, first match wins: mu + cov, then returns, then
+    the stored price history of `tickers`.
+    """
+    positions: List[float]                       # current value per asset
+    tickers: Optional[List[str]] = None
+    returns: Optional[List[List[float]]] = None  # rows = days, columns = assets (log returns)
+    mu: Optional[List[float]] = None
+    cov: Optional[List[List[float]]] = None
+    lookback: int = Field(250, ge=2)             # days of history used with `tickers`
+    n_paths: int = Field(100_000, ge=1)          # at most VAR_MAX_PATHS
+    horizons: List[int] = [1, 10]                # days, each 1..VAR_MAX_HORIZON_DAYS
+    confidences: List[float] = [0.95, 0.99]
+    seed: Optional[int] = None                   # same seed → same result
+
+    @validator("n_paths")
+    def bounded_paths(cls, value):
+        limit = get_settings().VAR_MAX_PATHS
+        if value > limit:
+            raise ValueError(f"n_paths must be at most {limit}")
+        return value
+
+    @validator("horizons")
+    def bounded_horizons(cls, value):
+        settings = get_settings()
+        if not 1 <= len(value) <= settings.VAR_MAX_HORIZONS:
+            raise ValueError(f"Give between 1 and {settings.VAR_MAX_HORIZONS} horizons")
+        if not all(1 <= h <= settings.VAR_MAX_HORIZON_DAYS for h in value):
+            raise ValueError(f"Horizons must be between 1 and {settings.VAR_MAX_HORIZON_DAYS} days")
+        return value
+
+    @validator("confidences")
+    def bounded_confidences(cls, value):
+        limit = get_settings().VAR_MAX_HORIZONS
+        if not 1 <= len(value) <= limit:
+            raise ValueError(f"Give between 1 and {limit} confidence levels")
+        if not all(0 < c < 1 for c in value):
+            raise ValueError("Confidence levels must be between 0 and 1")
+        return value
 
 
 # ────────────────────────────────────────────
@@ -25,29 +118,152 @@ class RiskInput(BaseModel):
 @router.post("/predict")
 async def predict_risk(
     data: RiskInput,
-    settings: Settings = Depends(get_app_settings)
+    engine: RiskEngine = Depends(get_risk_engine)
 ):
-    try:
-        risk_engine = RiskEngine(settings)
-
-        result = risk_engine.predict_risk(
-            ticker=data.ticker,
-            price=data.price,
-            volume=data.volume,
+    def _score():
+        if data.volatility is None:
+            return engine.predict_from_state(data.ticker, data.sentiment_score, data.event_severity)
+        if data.price is None or data.volume is None:
+            raise ValueError("price and volume are required with volatility")
+        return engine.predict(
             volatility=data.volatility,
             sentiment=data.sentiment_score,
-            macro_index=data.macro_index
+            liquidity=float(liquidity_risk(data.price, data.volume)),
+            event_severity=data.event_severity
         )
 
+    try:
+        result = await get_cpu_pool().run(_score)
+
         return {
             "ticker": data.ticker,
-            "risk_level": result["risk_level"],
+            "risk_level": result["risk_category"],
             "risk_score": result["risk_score"],
-            "confidence": result["confidence"],
-            "indicators_used": result["indicators"],
-            "reasoning": result["reasoning"]
+            "indicators_used": result["inputs_used"],
+            "reasoning": result["explanation"],
+            "live_state": result.get("live_state")
         }
 
+    except OverloadedError:
+        raise
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ────────────────────────────────────────────
+# POST /api/risk/portfolio
+# Whole portfolio scored in one vectorized call
+# ────────────────────────────────────────────
+@router.post("/portfolio")
+async def portfolio_risk(
+    data: PortfolioInput,
+    engine: RiskEngine = Depends(get_risk_engine),
+    state: RiskStateStore = Depends(get_risk_state)
+):
+    def _score():
+        volatility, liquidity = data.volatility, data.liquidity
+        if volatility is None or liquidity is None:
+            live = state.features_many(data.tickers)
+            volatility = live["volatility"] if volatility is None else volatility
+            liquidity = live["liquidity"] if liquidity is None else liquidity
+        return engine.predict_batch(volatility, data.sentiment, liquidity, data.event_severity)
+
+    try:
+        result = await get_cpu_pool().run(_score)
+    except OverloadedError:
+        raise
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    scores, categories = result["risk_score"], result["risk_category"]
+    return {
+        "tickers": data.tickers,
+        "risk_score": scores.round(3).tolist(),
+        "risk_category": categories.tolist(),
+        "summary": {
+            "count": len(scores),
+            "mean_score": round(float(scores.mean()), 3) if len(scores) else None,
+            "by_category": {label: int((categories == label).sum()) for label in CATEGORY_LABELS},
+        }
+    }
+
+
+# ────────────────────────────────────────────
+# LIVE RISK STATE
+# O(1) per tick; scored by /predict and /portfolio
+# ────────────────────────────────────────────
+@router.post("/ticks")
+async def ingest_ticks(
+    data: TickBatch,
+    state: RiskStateStore = Depends(get_risk_state)
+):
+    volume = data.volume or [None] * len(data.tickers)
+    timestamp = data.timestamp or [None] * len(data.tickers)
+    try:
+        for row in zip(data.tickers, data.price, volume, timestamp):
+            state.update(*row)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"ingested": len(data.tickers), "tickers_tracked": len(state)}
+
+
+@router.get("/state/{ticker}")
+async def live_risk_state(
+    ticker: str,
+    state: RiskStateStore = Depends(get_risk_state)
+):
+    if ticker not in state:
+        raise HTTPException(status_code=404, detail=f"No live risk state for {ticker}")
+    return {"ticker": ticker, **state.features(ticker)}
+
+
+# ────────────────────────────────────────────
+# POST /api/risk/var
+# Monte Carlo VaR / CVaR (expected shortfall)
+# ────────────────────────────────────────────
+def _moments(data: VarInput, history: HistoryStore):
+    if data.mu is not None and data.cov is not None:
+        return data.mu, data.cov
+    if data.returns is not None:
+        return estimate_moments(data.returns)
+    if data.tickers:
+        missing = [t for t in data.tickers if history.length(t) < 3]
+        if missing:
+            raise ValueError(f"Not enough stored history for {missing}")
+        windows = [history.window(t, data.lookback + 1) for t in data.tickers]
+        length = min(len(w) for w in windows)   # align on the most recent common days
+        prices = np.column_stack([w[-length:] for w in windows])
+        return estimate_moments(log_returns(prices))
+    raise ValueError("Provide mu + cov, returns, or tickers with stored history")
+
+
+@router.post("/var")
+async def value_at_risk(
+    data: VarInput,
+    engine: MonteCarloVaR = Depends(get_var_engine),
+    history: HistoryStore = Depends(get_history_store)
+):
+    def _simulate():
+        mu, cov = _moments(data, history)
+        return engine.run(
+            data.positions, mu, cov,
+            n_paths=data.n_paths, horizons=data.horizons,
+            confidences=data.confidences, seed=data.seed
+        )
+
+    try:
+        result = await get_cpu_pool().run(_simulate)
+        return {"tickers": data.tickers, **result}
+    except OverloadedError:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from app.dependencies import get_app_settings
 from app.services.tracker_engine import TrackerEngine
+from app.services.execution import OverloadedError, get_io_pool
 from app.config import Settings
 
 router = APIRouter()
@@ -31,16 +32,21 @@ async def log_prediction(
     data: PredictionLog,
     settings: Settings = Depends(get_app_settings)
 ):
-    try:
+    def _log():
         tracker = TrackerEngine(settings)
         tracker.log_prediction(
-            ticker=data.ticker,
-            timestamp=data.timestamp,
-            model=data.model_used,
-            predicted=data.predicted_price
+            model_name=data.model_used,
+            symbol=data.ticker,
+            predicted_value=data.predicted_price,
+            timestamp=data.timestamp
         )
+
+    try:
+        await get_io_pool().run(_log)
         return {"message": "Prediction logged successfully"}
 
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -53,18 +59,25 @@ async def log_reality(
     data: RealityLog,
     settings: Settings = Depends(get_app_settings)
 ):
-    try:
+    def _log():
         tracker = TrackerEngine(settings)
-        tracker.log_actual(
-            ticker=data.ticker,
+        return tracker.log_actual(
+            symbol=data.ticker,
             timestamp=data.timestamp,
-            actual=data.actual_price
+            actual_value=data.actual_price
         )
-        return {"message": "Actual market data logged successfully"}
 
+    try:
+        updated = await get_io_pool().run(_log)
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    if not updated:
+        raise HTTPException(status_code=404, detail=f"No prediction logged for {data.ticker} at {data.timestamp}")
+    return {"message": "Actual market data logged successfully", "predictions_updated": updated}
+
 
 # ───────────────────────────────
 # GET /api/tracker/compare?ticker=AAPL
@@ -75,8 +88,7 @@ async def compare_predictions(
     settings: Settings = Depends(get_app_settings)
 ):
     try:
-        tracker = TrackerEngine(settings)
-        result = tracker.compare(ticker)
+        result = await get_io_pool().run(lambda: TrackerEngine(settings).compare(ticker))
 
         return {
             "ticker": ticker,
@@ -87,6 +99,8 @@ async def compare_predictions(
             "predictions": result["merged_data"]
         }
 
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -100,14 +114,15 @@ async def get_accuracy(
     settings: Settings = Depends(get_app_settings)
 ):
     try:
-        tracker = TrackerEngine(settings)
-        accuracy = tracker.compute_accuracy(ticker)
+        accuracy = await get_io_pool().run(lambda: TrackerEngine(settings).compute_accuracy(ticker))
 
         return {
             "ticker": ticker,
             "accuracy_percent": accuracy,
         }
 
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -120,10 +135,11 @@ async def tracker_statistics(
     settings: Settings = Depends(get_app_settings)
 ):
     try:
-        tracker = TrackerEngine(settings)
-        stats = tracker.global_stats()
+        stats = await get_io_pool().run(lambda: TrackerEngine(settings).global_stats())
 
         return stats
 
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
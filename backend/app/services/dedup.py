@@ -0,0 +1,207 @@
+"""
+dedup.py
+--------
+Near-duplicate detection for syndicated headlines.
+
+Every headline gets a MinHash signature over character shingles, so small
+wording changes ("... - Reuters", a reordered clause) barely move it. The
+signature is split into LSH bands; headlines sharing any band bucket are
+candidates, and a candidate whose estimated Jaccard similarity reaches the
+threshold is the same event. The first copy seen is the canonical event and
+holds the cached impact results that later copies reuse (at most
+`max_results` per event, keyed by the caller, e.g. inputs + model version).
+
+Only events from the last `window_s` seconds are indexed (oldest evicted
+first, at most `max_items`), so memory is bounded by the window.
+"""
+
+import re
+import time
+import zlib
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Optional, Tuple
+import numpy as np
+from app.utils import metrics
+
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands x rows <= num_perm whose S-curve midpoint
+    (1 / bands) ** (1 / rows) is closest to the similarity threshold.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+@dataclass
+class CanonicalEvent:
+    id: int
+    text: str
+    signature: np.ndarray
+    first_seen: float
+    duplicates: int = 0
+    results: "OrderedDict[Hashable, Any]" = field(default_factory=OrderedDict)   # cached results, oldest first
+
+
+class NearDuplicateIndex:
+    """
+    MinHash + LSH index of the canonical events seen in a sliding time window.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        window_s: float = 3600.0,
+        num_perm: int = 64,
+        shingle: int = 4,
+        max_items: int = 100_000,
+        max_results: int = 8,
+        seed: int = 1
+    ):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.window_s = window_s
+        self.shingle = shingle
+        self.max_items = max_items
+        self.max_results = max_results
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+
+        # Multiply-shift hash family: h(x) = ((a * x + b) mod 2^64) >> 32, a odd
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 2**63, num_perm, dtype=np.uint64)[:, np.newaxis] * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)[:, np.newaxis]
+
+        self._lock = threading.Lock()
+        self._events: Dict[int, CanonicalEvent] = {}
+        self._order = deque()                                        # event ids, oldest first
+        self._buckets = [dict() for _ in range(self.bands)]          # band key → set of event ids
+        self._next_id = 0
+
+        self._lookups = metrics.counter("event_dedup_lookups_total")
+        self._hits = metrics.counter("event_dedup_duplicates_total")
+        self._size = metrics.gauge("event_dedup_window_events")
+
+    # ────────────────────────────────────────────────
+    # SIGNATURES
+    # ────────────────────────────────────────────────
+    def signature(self, text: str) -> np.ndarray:
+        text = _NON_WORD.sub(" ", text.lower()).strip()
+        if len(text) <= self.shingle:
+            shingles = {text}
+        else:
+            shingles = {text[i:i + self.shingle] for i in range(len(text) - self.shingle + 1)}
+        hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+        # Every permutation x shingle at once (uint64 wrap-around is the mod 2^64)
+        return ((self._a * hashes + self._b) >> np.uint64(32)).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def similarity(self, a: np.ndarray, b: np.ndarray) -> float:
+        """ Estimated Jaccard similarity of two signatures """
+        return float(np.mean(a == b))
+
+    # ────────────────────────────────────────────────
+    # LOOKUP / INSERT
+    # ────────────────────────────────────────────────
+    def resolve(self, text: str, now: Optional[float] = None) -> Tuple[CanonicalEvent, bool]:
+        """
+        Canonical event of `text` and whether `text` is a near-duplicate of
+        an event already in the window (if not, it becomes a new canonical event).
+        """
+        now = time.time() if now is None else now
+        signature = self.signature(text)
+        with self._lock:
+            self._expire(now)
+            self._lookups.inc()
+
+            candidates = set()
+            for band, key in self._band_keys(signature):
+                candidates.update(self._buckets[band].get(key, ()))
+            best, best_similarity = None, self.threshold
+            for event_id in candidates:
+                event = self._events[event_id]
+                similarity = self.similarity(signature, event.signature)
+                if similarity >= best_similarity:
+                    best, best_similarity = event, similarity
+
+            if best is not None:
+                best.duplicates += 1
+                self._hits.inc()
+                return best, True
+
+            event = CanonicalEvent(self._next_id, text, signature, now)
+            self._next_id += 1
+            self._events[event.id] = event
+            self._order.append(event.id)
+            for band, key in self._band_keys(signature):
+                self._buckets[band].setdefault(key, set()).add(event.id)
+            if len(self._order) > self.max_items:
+                self._evict(self._order.popleft())
+            self._size.set(len(self._events))
+            return event, False
+
+    # ────────────────────────────────────────────────
+    # CACHED RESULTS OF A CANONICAL EVENT
+    # ────────────────────────────────────────────────
+    def cached_result(self, event: CanonicalEvent, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            return event.results.get(key)
+
+    def store_result(self, event: CanonicalEvent, key: Hashable, result: Any):
+        """ Keeps the `max_results` most recently stored results of the event """
+        with self._lock:
+            event.results[key] = result
+            event.results.move_to_end(key)
+            while len(event.results) > self.max_results:
+                event.results.popitem(last=False)
+
+    def clear_results(self):
+        """
+        Drops every cached result (e.g. after a model swap); the
+        canonical events themselves stay, so grouping is unaffected.
+        """
+        with self._lock:
+            for event in self._events.values():
+                event.results.clear()
+
+    def _expire(self, now: float):
+        while self._order and now - self._events[self._order[0]].first_seen > self.window_s:
+            self._evict(self._order.popleft())
+        self._size.set(len(self._events))
+
+    def _evict(self, event_id: int):
+        event = self._events.pop(event_id)
+        for band, key in self._band_keys(event.signature):
+            bucket = self._buckets[band][key]
+            bucket.discard(event_id)
+            if not bucket:
+                del self._buckets[band][key]
+
+    # ────────────────────────────────────────────────
+    # REPORTING
+    # ────────────────────────────────────────────────
+    def stats(self) -> Dict:
+        lookups, hits = self._lookups.snapshot(), self._hits.snapshot()
+        return {
+            "window_events": len(self._events),
+            "window_s": self.window_s,
+            "threshold": self.threshold,
+            "bands": self.bands,
+            "rows_per_band": self.rows,
+            "lookups": lookups,
+            "duplicates": hits,
+            "duplicate_hit_rate": round(hits / lookups, 4) if lookups else None,
+        }
@@ -0,0 +1,87 @@
+"""
+engines.py
+----------
+Application-scoped engine container. Built once at startup (and lazily by
+the first request otherwise), torn down at shutdown.
+
+Engines never load artifacts themselves: they read them from one shared
+ModelRegistry, so an artifact used by several engines (the scaler is read
+by RiskEngine and EventEngine) is loaded from disk exactly once and held
+in memory as a single instance.
+"""
+
+import time
+import logging
+from typing import Any, Callable, Dict
+from app.services.model_registry import ModelRegistry
+
+
+class EngineContainer:
+    def __init__(self, registry: ModelRegistry, factories: Dict[str, Callable[[], Any]]):
+        """
+        factories: engine name → zero-argument constructor; every engine is
+                   expected to take `registry` and declare its ARTIFACTS
+        """
+        self.registry = registry
+        self._engines: Dict[str, Any] = {}
+        self._build_ms: Dict[str, float] = {}
+        for name, factory in factories.items():
+            start = time.perf_counter()
+            self._engines[name] = factory()
+            self._build_ms[name] = round((time.perf_counter() - start) * 1000, 3)
+        logging.info(f"Engines ready: {self._build_ms} (ms)")
+
+    def __getitem__(self, name: str):
+        if not self._engines:
+            raise RuntimeError("Engine container has been shut down")
+        return self._engines[name]
+
+    def names(self):
+        return list(self._engines)
+
+    def warm(self):
+        """ Loads every artifact any engine reads """
+        self.registry.warm(self.artifacts())
+
+    def artifacts(self):
+        return sorted({a for engine in self._engines.values() for a in getattr(engine, "ARTIFACTS", ())})
+
+    def close(self):
+        for name, engine in self._engines.items():
+            close = getattr(engine, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception as e:
+                    logging.warning(f"Engine '{name}' did not shut down cleanly: {e}")
+        self._engines.clear()
+
+    # ────────────────────────────────────────────────
+    # REPORTING
+    # ────────────────────────────────────────────────
+    def report(self) -> Dict:
+        """
+        Construction time per engine and, per artifact, which engines share
+        it and how many distinct in-memory instances they hold (1 = shared).
+        """
+        stats = self.registry.stats()
+        artifacts = {}
+        for artifact in self.artifacts():
+            users = [n for n, e in self._engines.items() if artifact in getattr(e, "ARTIFACTS", ())]
+            instances = {id(e.registry.get(artifact)) for n, e in self._engines.items()
+                         if n in users and stats[artifact]["loaded"] and e.registry.get(artifact) is not None}
+            artifacts[artifact] = {
+                "used_by": users,
+                "loaded": stats[artifact]["loaded"],
+                "available": stats[artifact]["available"],
+                "instances": len(instances),
+                "load_time_ms": stats[artifact]["load_time_ms"],
+            }
+        return {
+            "engines": {
+                name: {"type": type(engine).__name__, "build_ms": self._build_ms[name],
+                       "shared_registry": engine.registry is self.registry}
+                for name, engine in self._engines.items()
+            },
+            "artifacts": artifacts,
+        }
@@ -1,40 +1,40 @@
 import numpy as np
+from typing import Dict, Optional, Sequence
 from app.config import Settings
-from sklearn.preprocessing import MinMaxScaler
-import joblib
-import json
-import os
+from app.services.model_registry import ModelRegistry
+from app.services.lexicon import default_matcher
+from app.services.text_hashing import HashedEventModel
 
 
 class EventEngine:
-    def __init__(self, settings: Settings):
-        self.settings = settings
-
-        # Path to model directory
-        self.model_dir = os.path.join(settings.BASE_DIR, "app", "models")
+    # Registry artifacts this engine reads (reported by EngineContainer)
+    ARTIFACTS = ("event_model", "scaler", "event_lexicon")
 
-        # Try loading the model (fallback = rule-based)
-        self.model = None
-        self.scaler = None
+    def __init__(self, settings: Settings, registry: Optional[ModelRegistry] = None):
+        self.settings = settings
 
-        self._load_model()
+        # Model + scaler come from the shared registry (fallback = rule-based)
+        self.registry = registry or ModelRegistry(settings)
 
     # ────────────────────────────────────────────────
-    # LOAD MODEL + SCALER
+    # MODEL + SCALER (None if missing)
     # ────────────────────────────────────────────────
-    def _load_model(self):
-        try:
-            model_path = os.path.join(self.model_dir, "event_impact_model.pkl")
-            scaler_path = os.path.join(self.model_dir, "scaler.pkl")
+    @property
+    def model(self):
+        return self.registry.get("event_model")
 
-            if os.path.exists(model_path):
-                self.model = joblib.load(model_path)
+    @property
+    def scaler(self):
+        return self.registry.get("scaler")
 
-            if os.path.exists(scaler_path):
-                self.scaler = joblib.load(scaler_path)
+    @property
+    def matcher(self):
+        """ Keyword automaton compiled once from the lexicon file """
+        return self.registry.get("event_lexicon") or default_matcher()
 
-        except Exception:
-            self.model = None
+    def version(self) -> tuple:
+        """ Versions of every artifact a score depends on (changes on hot reload) """
+        return tuple(self.registry.version(name) for name in self.ARTIFACTS)
 
 
     # ────────────────────────────────────────────────
@@ -43,107 +43,96 @@ class EventEngine:
     def predict_event_impact(self, event: str, sentiment: float, volatility: float):
         """
         Predicts market movement impact based on:
-        - event description (text embedding = simplified)
+        - event description (weighted lexicon terms)
         - sentiment score
         - volatility
         """
+        batch = self.predict_batch([event], [sentiment], [volatility])
 
-        # STEP 1 → Convert event text to simple numerical features (placeholder)
-        event_features = self._text_to_features(event)
+        return self._format_output(
+            event=event,
+            sentiment=sentiment,
+            volatility=volatility,
+            impact_score=round(float(batch["impact_score"][0]), 4),
+            confidence=round(float(batch["confidence"][0]), 3),
+            matched_terms=batch["matched_terms"][0]
+        )
 
-        # STEP 2 → Build feature array
-        features = np.array([
-            event_features["keyword_strength"],
-            sentiment,
-            volatility
-        ]).reshape(1, -1)
+    # ────────────────────────────────────────────────
+    # BULK SCORING (one model call per batch)
+    # ────────────────────────────────────────────────
+    def predict_batch(self, events: Sequence[str], sentiment, volatility) -> Dict:
+        """
+        Scores N events given as columns. Returns arrays "impact_score",
+        "confidence", "impact_label" and the per-event "matched_terms".
+        """
+        features, matched_terms = self.numeric_features(events, sentiment, volatility)
+
+        # ML model if available, else the rule-based formula
+        model, scaler = self.model, self.scaler
+        if isinstance(model, HashedEventModel) and len(events):
+            # Sparse hashed n-grams + numeric columns, one predict call
+            impact = model.predict(events, features)
+            confidence = np.minimum(0.95, 0.55 + np.abs(impact) * 0.3)
+        elif model is not None and scaler is not None and len(events):
+            impact = np.asarray(model.predict(scaler.transform(features)), dtype=float)
+            confidence = np.minimum(0.95, 0.55 + np.abs(impact) * 0.3)
+        else:
+            impact = rule_based_impact(*features.T)
+            confidence = 0.55 + np.abs(impact) * 0.3
 
-        # STEP 3 → If ML model exists, use it
-        if self.model is not None and self.scaler is not None:
-            scaled = self.scaler.transform(features)
-            prediction = self.model.predict(scaled)[0]
-            confidence = min(0.95, 0.55 + (abs(prediction) * 0.3))
+        return {
+            "impact_score": impact,
+            "confidence": confidence,
+            "impact_label": impact_labels(impact),
+            "matched_terms": matched_terms,
+        }
 
-            return self._format_output(
-                event=event,
-                sentiment=sentiment,
-                volatility=volatility,
-                impact_score=float(prediction),
-                confidence=round(float(confidence), 3)
-            )
+    def numeric_features(self, events: Sequence[str], sentiment, volatility):
+        """
+        (N, 3) matrix [keyword_strength, sentiment, volatility] plus the
+        matched lexicon terms per event. Also used to build training rows.
+        """
+        n = len(events)
+        sentiment = np.asarray(sentiment, dtype=float)
+        volatility = np.asarray(volatility, dtype=float)
+        if len(sentiment) != n or len(volatility) != n:
+            raise ValueError("events, sentiment and volatility must have the same length")
 
-        # STEP 4 → Fallback → Rule-based engine
-        return self._rule_based_prediction(event, sentiment, volatility)
+        # One lexicon scan per event, all rows stacked into one matrix
+        text_features = [self._text_to_features(event) for event in events]
+        features = np.empty((n, 3))
+        features[:, 0] = [f["keyword_strength"] for f in text_features]
+        features[:, 1] = sentiment
+        features[:, 2] = volatility
+        return features, [f["matched_terms"] for f in text_features]
 
 
     # ────────────────────────────────────────────────
     # TEXT → NUMERICAL FEATURE EXTRACTION
     # ────────────────────────────────────────────────
     def _text_to_features(self, text: str):
-        text_lower = text.lower()
-
-        KEYWORDS = {
-            "earnings": 0.8,
-            "inflation": 0.7,
-            "rate hike": 0.9,
-            "war": 1.0,
-            "merger": 0.6,
-            "acquisition": 0.6,
-            "bankruptcy": 1.0,
-            "lawsuit": 0.7,
-            "regulation": 0.5,
-        }
+        # Matched (term, weight) pairs, heaviest first
+        matched = self.matcher.match(text)
 
         strength = 0.3  # Default baseline
+        if matched:
+            strength = max(strength, matched[0][1])
 
-        for word, value in KEYWORDS.items():
-            if word in text_lower:
-                strength = max(strength, value)
-
-        return {"keyword_strength": strength}
-
-
-    # ────────────────────────────────────────────────
-    # RULE-BASED IMPACT ENGINE (if model not found)
-    # ────────────────────────────────────────────────
-    def _rule_based_prediction(self, event, sentiment, volatility):
-        """ Generates a fallback prediction """
-
-        # Basic formula
-        impact = (
-            (sentiment * 0.4) -
-            (volatility * 0.3) +
-            (self._text_to_features(event)["keyword_strength"] * 0.8)
-        )
-
-        # Normalize to -1 to +1
-        impact = max(-1, min(1, impact))
-
-        confidence = 0.55 + (abs(impact) * 0.3)
-
-        return self._format_output(
-            event=event,
-            sentiment=sentiment,
-            volatility=volatility,
-            impact_score=round(float(impact), 4),
-            confidence=round(float(confidence), 3)
-        )
+        return {"keyword_strength": strength, "matched_terms": matched}
 
 
     # ────────────────────────────────────────────────
     # FORMAT OUTPUT FOR API RESPONSE
     # ────────────────────────────────────────────────
-    def _format_output(self, event, sentiment, volatility, impact_score, confidence):
-        if impact_score > 0.4:
-            impact_label = "Strong Positive"
-        elif impact_score > 0.1:
-            impact_label = "Mild Positive"
-        elif impact_score < -0.4:
-            impact_label = "Strong Negative"
-        elif impact_score < -0.1:
-            impact_label = "Mild Negative"
+    def _format_output(self, event, sentiment, volatility, impact_score, confidence, matched_terms=()):
+        impact_label = str(impact_labels(np.array([impact_score]))[0])
+
+        if matched_terms:
+            terms = ", ".join(f"'{term}' ({weight:g})" for term, weight in matched_terms)
+            drivers = f"key terms {terms}, sentiment and volatility"
         else:
-            impact_label = "Neutral"
+            drivers = "sentiment and volatility (no lexicon terms matched)"
 
         return {
             "event": event,
@@ -154,5 +143,31 @@ class EventEngine:
                 "sentiment": sentiment,
                 "volatility": volatility
             },
-            "explanation": f"The event '{event}' combined with sentiment and volatility suggests a {impact_label} impact."
+            "matched_terms": [{"term": term, "weight": weight} for term, weight in matched_terms],
+            "explanation": f"The event '{event}' combined with {drivers} suggests a {impact_label} impact."
         }
+
+
+# ────────────────────────────────────────────────
+# VECTORIZED HELPERS
+# ────────────────────────────────────────────────
+# Impact labels from most negative to most positive. Scores exactly on a
+# threshold belong to the milder label (|score| must exceed 0.1 / 0.4).
+IMPACT_LABELS = np.array(["Strong Negative", "Mild Negative", "Neutral", "Mild Positive", "Strong Positive"])
+NEGATIVE_THRESHOLDS = np.array([-0.4, -0.1])
+POSITIVE_THRESHOLDS = np.array([0.1, 0.4])
+
+
+def rule_based_impact(keyword_strength, sentiment, volatility) -> np.ndarray:
+    """
+    Fallback formula, clipped to [-1, 1]
+    """
+    impact = sentiment * 0.4 - volatility * 0.3 + keyword_strength * 0.8
+    return np.clip(impact, -1.0, 1.0)
+
+
+def impact_labels(scores: np.ndarray) -> np.ndarray:
+    scores = np.asarray(scores, dtype=float)
+    index = np.searchsorted(NEGATIVE_THRESHOLDS, scores, side="right") \
+        + np.searchsorted(POSITIVE_THRESHOLDS, scores, side="left")
+    return IMPACT_LABELS[index]
@@ -0,0 +1,148 @@
+import asyncio
+import functools
+import threading
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Optional
+from app.config import get_settings
+from app.utils import metrics
+
+
+class OverloadedError(Exception):
+    """
+    Raised when a pool already has its maximum number of tasks in flight.
+    Mapped to 503 + Retry-After by the application.
+    """
+
+    def __init__(self, pool: str, retry_after: float):
+        super().__init__(f"{pool} pool is saturated, retry later")
+        self.pool = pool
+        self.retry_after = retry_after
+
+
+class ExecutionPool:
+    """
+    Executor wrapper with a bounded in-flight queue.
+
+    Work is admitted only while fewer than `max_in_flight` tasks are queued
+    or running; beyond that callers are rejected immediately instead of
+    waiting, so latency stays bounded under overload.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        executor: Executor,
+        max_in_flight: int,
+        retry_after_s: float = 1.0
+    ):
+        self.name = name
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        self.retry_after_s = retry_after_s
+
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+        self._depth = metrics.gauge(f"{name}_pool_in_flight")
+        self._rejected = metrics.counter(f"{name}_pool_rejected_total")
+        self._completed = metrics.counter(f"{name}_pool_completed_total")
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    # ────────────────────────────────────────────────
+    # ADMISSION CONTROL
+    # ────────────────────────────────────────────────
+    def _admit(self):
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self._rejected.inc()
+                raise OverloadedError(self.name, self.retry_after_s)
+            self._in_flight += 1
+            self._depth.set(self._in_flight)
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._in_flight -= 1
+            self._depth.set(self._in_flight)
+        self._completed.inc()
+
+    # ────────────────────────────────────────────────
+    # RUN A BLOCKING CALLABLE
+    # ────────────────────────────────────────────────
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        Runs `fn(*args, **kwargs)` on the pool without blocking the event loop.
+
+        Raises OverloadedError when the pool is saturated and asyncio.TimeoutError
+        if the call does not finish within `timeout` seconds. A timed-out task
+        keeps its in-flight slot until it actually finishes.
+        """
+        self._admit()
+        try:
+            future = self.executor.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+
+# ────────────────────────────────────────────────
+# SHARED POOLS
+# cpu → model inference and engine scoring.
+#       Always threads: callers pass bound engine methods and
+#       closures over the loaded models, which cannot be pickled;
+#       NumPy / TF / LightGBM release the GIL anyway.
+# io  → blocking file access (tracker storage, caches).
+# simulation → optional process pool for Monte Carlo chunks
+#       (pure NumPy, module-level functions), fed from cpu tasks.
+# ────────────────────────────────────────────────
+@lru_cache()
+def get_cpu_pool() -> ExecutionPool:
+    settings = get_settings()
+    executor = ThreadPoolExecutor(
+        max_workers=settings.CPU_POOL_WORKERS, thread_name_prefix="cpu"
+    )
+    return ExecutionPool(
+        "cpu", executor, settings.CPU_MAX_IN_FLIGHT, settings.OVERLOAD_RETRY_AFTER_S
+    )
+
+
+@lru_cache()
+def get_io_pool() -> ExecutionPool:
+    settings = get_settings()
+    executor = ThreadPoolExecutor(
+        max_workers=settings.IO_POOL_WORKERS, thread_name_prefix="io"
+    )
+    return ExecutionPool(
+        "io", executor, settings.IO_MAX_IN_FLIGHT, settings.OVERLOAD_RETRY_AFTER_S
+    )
+
+
+@lru_cache()
+def get_simulation_executor() -> Optional[ProcessPoolExecutor]:
+    """
+    None when SIMULATION_WORKERS is 0 (chunks run in the calling thread).
+    Workers are spawned, not forked: the parent may hold TF / BLAS threads.
+    """
+    workers = get_settings().SIMULATION_WORKERS
+    if workers <= 0:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def shutdown_pools():
+    for accessor in (get_cpu_pool, get_io_pool):
+        if accessor.cache_info().currsize:
+            accessor().executor.shutdown(wait=False)
+            accessor.cache_clear()
+    if get_simulation_executor.cache_info().currsize:
+        executor = get_simulation_executor()
+        if executor is not None:
+            executor.shutdown(wait=False)
+        get_simulation_executor.cache_clear()
@@ -0,0 +1,124 @@
+"""
+features.py
+-----------
+Lag / return / moving-average / volatility features from raw prices,
+shared by the LightGBM training script and the serving path so both
+always compute exactly the same transform.
+
+Everything is vectorized over the last axis with NumPy: rolling means and
+standard deviations come from cumulative sums, so a (B, N) batch of windows
+costs a handful of array operations regardless of B.
+"""
+
+from typing import Tuple
+import numpy as np
+
+
+LAGS: Tuple[int, ...] = (1, 2, 3, 5, 10)
+MA_WINDOWS: Tuple[int, ...] = (5, 10)
+VOLATILITY_WINDOW = 5
+
+FEATURE_NAMES = (
+    ["close"]
+    + [f"lag_{k}" for k in LAGS]
+    + ["return_1", "return_5", "log_return"]
+    + [f"ma_{w}" for w in MA_WINDOWS]
+    + [f"volatility_{VOLATILITY_WINDOW}"]
+)
+
+# Prices needed before the first position with every feature defined
+MIN_HISTORY = max(max(LAGS), max(MA_WINDOWS), VOLATILITY_WINDOW) + 1
+
+
+# ────────────────────────────────────────────────
+# ROLLING HELPERS (CUMSUM BASED)
+# ────────────────────────────────────────────────
+def _shift(x: np.ndarray, k: int) -> np.ndarray:
+    """ x[..., t - k], NaN where t < k """
+    out = np.full_like(x, np.nan)
+    out[..., k:] = x[..., :-k]
+    return out
+
+
+def _rolling_sum(csum: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sum over the `window` values ending at each position, NaN before
+    the window is full. `csum` is the cumulative sum with a leading zero.
+    """
+    out = np.full(csum.shape[:-1] + (csum.shape[-1] - 1,), np.nan)
+    out[..., window - 1:] = csum[..., window:] - csum[..., :-window]
+    return out
+
+
+def _cumsum0(x: np.ndarray) -> np.ndarray:
+    csum = np.zeros(x.shape[:-1] + (x.shape[-1] + 1,))
+    np.cumsum(x, axis=-1, out=csum[..., 1:])
+    return csum
+
+
+# ────────────────────────────────────────────────
+# FEATURE BUILDERS
+# ────────────────────────────────────────────────
+def feature_matrix(prices) -> np.ndarray:
+    """
+    Features at every position of every series.
+
+    Parameters:
+        prices: (N,) or (B, N) raw prices
+
+    Returns:
+        (N, F) or (B, N, F) array in FEATURE_NAMES order; positions without
+        enough history (the first MIN_HISTORY - 1) contain NaN.
+    """
+    p = np.asarray(prices, dtype=float)
+
+    # Rolling statistics on prices re-based to the first value: the variance
+    # is shift-invariant and the cumulative sums stay small (less cancellation)
+    base = p[..., :1]
+    x = p - base
+    csum, csq = _cumsum0(x), _cumsum0(x * x)
+
+    columns = [p]
+    columns += [_shift(p, k) for k in LAGS]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        columns.append(p / _shift(p, 1) - 1.0)
+        columns.append(p / _shift(p, 5) - 1.0)
+        columns.append(np.log(p / _shift(p, 1)))
+
+    for w in MA_WINDOWS:
+        columns.append(_rolling_sum(csum, w) / w + base)
+
+    w = VOLATILITY_WINDOW
+    s, sq = _rolling_sum(csum, w), _rolling_sum(csq, w)
+    columns.append(np.sqrt(np.maximum((sq - s * s / w) / (w - 1), 0.0)))   # ddof=1, like pandas
+
+    return np.stack(columns, axis=-1)
+
+
+def latest_features(prices) -> np.ndarray:
+    """
+    Feature vector at the last position of each window (serving path).
+
+    Parameters:
+        prices: (N,) or (B, N) raw prices with N >= MIN_HISTORY
+
+    Returns:
+        (F,) or (B, F) array in FEATURE_NAMES order
+    """
+    p = np.asarray(prices, dtype=float)
+    if p.shape[-1] < MIN_HISTORY:
+        raise ValueError(f"At least {MIN_HISTORY} prices are needed to build features, got {p.shape[-1]}")
+    return feature_matrix(p[..., -MIN_HISTORY:])[..., -1, :]
+
+
+def training_set(prices) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (X, y) for one price series: features at t, target = price at t + 1.
+    Rows without full feature history are dropped.
+    """
+    p = np.asarray(prices, dtype=float)
+    features = feature_matrix(p)[MIN_HISTORY - 1:-1]
+    targets = p[MIN_HISTORY:]
+    keep = np.all(np.isfinite(features), axis=1)
+    return features[keep], targets[keep]
@@ -0,0 +1,75 @@
+from collections import defaultdict
+from typing import Callable, List, Sequence
+import numpy as np
+
+
+# ────────────────────────────────────────────────
+# RECURSIVE (AUTOREGRESSIVE) ROLLOUT
+# ────────────────────────────────────────────────
+def recursive_rollout(
+    forward: Callable[[np.ndarray], np.ndarray],
+    windows: np.ndarray,
+    steps: int
+) -> np.ndarray:
+    """
+    Rolls a one-step model forward `steps` times for a batch of series.
+
+    Parameters:
+        forward: maps a (B, N, 1) window batch to B next values
+        windows: (B, N) or (N,) array of the most recent observations
+        steps: forecast horizon
+
+    Returns:
+        (B, steps) array of forecasts
+
+    The windows and every prediction live in a single preallocated
+    (B, N + steps) buffer; each step feeds the model a sliding view of it,
+    so no per-step arrays are rebuilt.
+    """
+    windows = np.asarray(windows, dtype=np.float32)
+    if windows.ndim == 1:
+        windows = windows[np.newaxis, :]
+
+    batch, length = windows.shape
+    buffer = np.empty((batch, length + steps), dtype=np.float32)
+    buffer[:, :length] = windows
+
+    for t in range(steps):
+        window = buffer[:, t:t + length, np.newaxis]
+        buffer[:, length + t] = np.asarray(forward(window)).reshape(batch)
+
+    return buffer[:, length:]
+
+
+def rollout_many(
+    forward: Callable[[np.ndarray], np.ndarray],
+    sequences: Sequence[Sequence[float]],
+    steps: int
+) -> List[np.ndarray]:
+    """
+    Batched rollout for series of mixed lengths.
+    Series of equal length are stacked into one tensor and rolled out
+    together; results are returned in input order.
+    """
+    groups = defaultdict(list)
+    for i, seq in enumerate(sequences):
+        groups[len(seq)].append(i)
+
+    results: List[np.ndarray] = [None] * len(sequences)
+    for indices in groups.values():
+        stacked = np.asarray([sequences[i] for i in indices], dtype=np.float32)
+        forecasts = recursive_rollout(forward, stacked, steps)
+        for i, row in zip(indices, forecasts):
+            results[i] = row
+
+    return results
+
+
+# ────────────────────────────────────────────────
+# STATSMODELS FORECASTS
+# ────────────────────────────────────────────────
+def statsmodels_forecast(results, steps: int) -> np.ndarray:
+    """
+    Full forecast vector from a fitted statsmodels results object.
+    """
+    return np.asarray(results.forecast(steps=steps), dtype=float).reshape(-1)
@@ -0,0 +1,251 @@
+"""
+history_store.py
+----------------
+Local columnar OHLCV history, one memory-mapped file per column:
+
+    {HISTORY_STORE_DIR}/timestamp.bin   int64   (epoch seconds)
+                        open.bin        float32
+                        high.bin        float32
+                        low.bin         float32
+                        close.bin       float32
+                        volume.bin      int64
+                        index.json      ticker → {offset, capacity, length}
+
+Every ticker owns a contiguous region [offset, offset + capacity) in all
+column files, so its bars are always one slice: "last N closes of AAPL" is
+`close[offset + length - N : offset + length]`, a zero-copy view of the map.
+A ticker that outgrows its region is moved to a new region of twice the
+capacity at the end of the files (the old region is left as dead space).
+
+Appends only write the ticker's new rows into the maps. index.json is
+rewritten at once when a region is allocated, but length updates are only
+marked dirty and persisted by flush() (periodically and at shutdown). A
+crash can therefore lose the bars appended since the last flush, but the
+saved index always points at regions holding the data it describes.
+"""
+
+import os
+import json
+import logging
+import time
+import threading
+from typing import Dict, Iterable, Optional, Sequence
+import numpy as np
+
+
+COLUMNS = {
+    "timestamp": np.int64,
+    "open": np.float32,
+    "high": np.float32,
+    "low": np.float32,
+    "close": np.float32,
+    "volume": np.int64,
+}
+
+
+class HistoryStore:
+    """
+    Append-only per-ticker bar history with zero-copy window reads.
+    One writer at a time (internal lock); readers never block.
+    """
+
+    def __init__(self, directory: str, initial_capacity: int = 4096):
+        self.directory = directory
+        self.initial_capacity = initial_capacity
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, int]] = {}
+        self._rows = 0   # allocated rows in every column file
+        self._dirty = False
+        self._flusher = None
+
+        index_path = os.path.join(directory, "index.json")
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                saved = json.load(f)
+            self._index, self._rows = saved["tickers"], saved["rows"]
+        self._maps = self._open_maps(self._rows)
+
+    # ────────────────────────────────────────────────
+    # FILES
+    # ────────────────────────────────────────────────
+    def _column_path(self, column: str) -> str:
+        return os.path.join(self.directory, f"{column}.bin")
+
+    def _open_maps(self, rows: int) -> Dict[str, Optional[np.memmap]]:
+        maps = {}
+        for column, dtype in COLUMNS.items():
+            path = self._column_path(column)
+            size = rows * np.dtype(dtype).itemsize
+            with open(path, "ab") as f:
+                if f.tell() < size:
+                    f.truncate(size)
+            maps[column] = np.memmap(path, dtype=dtype, mode="r+", shape=(rows,)) if rows else None
+        return maps
+
+    def _allocate(self, capacity: int) -> int:
+        """ Grows every column file by `capacity` rows; returns the new region's offset """
+        offset = self._rows
+        for m in self._maps.values():
+            if m is not None:
+                m.flush()
+        # Existing views keep the old (smaller) mappings alive and valid
+        self._maps = self._open_maps(offset + capacity)
+        self._rows = offset + capacity
+        return offset
+
+    def _save_index(self):
+        """ Caller holds the lock """
+        path = os.path.join(self.directory, "index.json")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"rows": self._rows, "tickers": self._index}, f)
+        os.replace(tmp, path)
+        self._dirty = False
+
+    def flush(self):
+        """ Writes dirty column pages and the index to disk """
+        with self._lock:
+            if not self._dirty:
+                return
+            for m in self._maps.values():
+                if m is not None:
+                    m.flush()
+            self._save_index()
+
+    def autoflush(self, interval_s: float):
+        """ flush() every `interval_s` seconds in a background thread """
+        if self._flusher is not None or interval_s <= 0:
+            return
+
+        def _run():
+            while True:
+                time.sleep(interval_s)
+                try:
+                    self.flush()
+                except Exception as e:
+                    logging.warning(f"History index flush failed: {e}")
+
+        self._flusher = threading.Thread(target=_run, name="history-flush", daemon=True)
+        self._flusher.start()
+
+    # ────────────────────────────────────────────────
+    # APPEND
+    # ────────────────────────────────────────────────
+    def append(self, ticker: str, bars: Dict[str, Sequence]) -> int:
+        """
+        Appends bars (column name → values; timestamp and close required,
+        missing OHLV columns default to close / 0). Bars not newer than the
+        last stored timestamp are skipped. Returns the number appended.
+        """
+        timestamps = np.asarray(bars["timestamp"], dtype=np.int64)
+        n = len(timestamps)
+        close = np.asarray(bars["close"], dtype=np.float32)
+        columns = {
+            "timestamp": timestamps,
+            "close": close,
+            "open": np.asarray(bars.get("open", close), dtype=np.float32),
+            "high": np.asarray(bars.get("high", close), dtype=np.float32),
+            "low": np.asarray(bars.get("low", close), dtype=np.float32),
+            "volume": np.asarray(bars.get("volume", np.zeros(n)), dtype=np.int64),
+        }
+        if any(len(v) != n for v in columns.values()):
+            raise ValueError("All bar columns must have the same length")
+        if n > 1 and np.any(np.diff(timestamps) <= 0):
+            raise ValueError("Bar timestamps must be strictly increasing")
+
+        with self._lock:
+            entry = self._index.get(ticker)
+            if entry is not None and entry["length"]:
+                last = self._maps["timestamp"][entry["offset"] + entry["length"] - 1]
+                keep = timestamps > last
+                columns = {k: v[keep] for k, v in columns.items()}
+                n = int(keep.sum())
+            if n == 0:
+                return 0
+
+            entry = self._reserve(ticker, n)
+            start = entry["offset"] + entry["length"]
+            for column, values in columns.items():
+                self._maps[column][start:start + n] = values
+
+            entry["length"] += n
+            self._dirty = True
+            return n
+
+    def _reserve(self, ticker: str, n: int) -> Dict[str, int]:
+        entry = self._index.get(ticker)
+        if entry is None:
+            capacity = max(self.initial_capacity, n)
+            entry = self._index[ticker] = {"offset": self._allocate(capacity), "capacity": capacity, "length": 0}
+            self._save_index()
+            return entry
+
+        if entry["length"] + n <= entry["capacity"]:
+            return entry
+
+        # Relocate to a region twice as large (copy once, amortized O(1) per bar)
+        capacity = max(2 * entry["capacity"], entry["length"] + n)
+        offset = self._allocate(capacity)
+        old, length = entry["offset"], entry["length"]
+        for m in self._maps.values():
+            m[offset:offset + length] = m[old:old + length]
+        for m in self._maps.values():
+            m.flush()
+        logging.info(f"History of {ticker} moved to a {capacity}-row region")
+        entry.update(offset=offset, capacity=capacity)
+        self._save_index()
+        return entry
+
+    # ────────────────────────────────────────────────
+    # ZERO-COPY READS
+    # ────────────────────────────────────────────────
+    def tickers(self):
+        return list(self._index)
+
+    def length(self, ticker: str) -> int:
+        entry = self._index.get(ticker)
+        return entry["length"] if entry else 0
+
+    def window(self, ticker: str, n: Optional[int] = None, column: str = "close") -> np.ndarray:
+        """
+        Last `n` values (all if None) of one column as a read-only view.
+        """
+        entry = self._index.get(ticker)
+        if entry is None:
+            raise KeyError(f"No history for {ticker}")
+        end = entry["offset"] + entry["length"]
+        start = entry["offset"] if n is None else max(entry["offset"], end - n)
+        view = self._maps[column][start:end]
+        view.flags.writeable = False
+        return view
+
+    def range(self, ticker: str, start_ts: int, end_ts: int, columns: Iterable[str] = tuple(COLUMNS)) -> Dict[str, np.ndarray]:
+        """
+        Bars with start_ts <= timestamp < end_ts, as read-only views per column.
+        """
+        timestamps = self.window(ticker, column="timestamp")
+        lo, hi = np.searchsorted(timestamps, [start_ts, end_ts])
+        offset = self._index[ticker]["offset"]
+        result = {}
+        for column in columns:
+            view = self._maps[column][offset + lo:offset + hi]
+            view.flags.writeable = False
+            result[column] = view
+        return result
+
+    def to_frame(self, ticker: str, n: Optional[int] = None):
+        """
+        Last `n` bars as a DataFrame (a copy), e.g. for Preprocessor.
+        """
+        import pandas as pd
+        return pd.DataFrame({column: np.array(self.window(ticker, n, column)) for column in COLUMNS})
+
+    def stats(self) -> Dict:
+        return {
+            "tickers": len(self._index),
+            "allocated_rows": self._rows,
+            "stored_bars": sum(e["length"] for e in self._index.values()),
+            "size_mb": round(self._rows * sum(np.dtype(d).itemsize for d in COLUMNS.values()) / 2**20, 3),
+        }
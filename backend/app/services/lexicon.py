@@ -0,0 +1,132 @@
+"""
+lexicon.py
+----------
+Weighted financial-term lexicon and a multi-pattern matcher over it.
+
+The lexicon is a plain text file, one `term,weight` per line (`#` starts a
+comment; terms may be multi-word phrases). It is compiled once into an
+Aho–Corasick automaton, so a headline is scanned in a single pass whose
+cost does not depend on how many terms the lexicon holds. Matches only
+count on word boundaries ("war" does not fire inside "software").
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+# Built-in lexicon used when no lexicon file is configured
+DEFAULT_LEXICON = {
+    "earnings": 0.8,
+    "inflation": 0.7,
+    "rate hike": 0.9,
+    "war": 1.0,
+    "merger": 0.6,
+    "acquisition": 0.6,
+    "bankruptcy": 1.0,
+    "lawsuit": 0.7,
+    "regulation": 0.5,
+}
+
+
+def load_lexicon(path: str) -> Dict[str, float]:
+    """
+    Reads `term,weight` lines; later duplicates override earlier ones.
+    """
+    lexicon = {}
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            term, sep, weight = line.rpartition(",")
+            if not sep or not term.strip():
+                raise ValueError(f"{path}:{number}: expected 'term,weight'")
+            lexicon[" ".join(term.lower().split())] = float(weight)
+    return lexicon
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """
+    Aho–Corasick automaton over the lexicon terms (lower-cased,
+    whitespace-normalized). Build once, share across threads: match()
+    does not mutate the automaton.
+    """
+
+    def __init__(self, lexicon: Dict[str, float]):
+        self.weights: Dict[str, float] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[str, ...]] = [()]   # terms ending at each state (incl. via fail links)
+
+        for term, weight in lexicon.items():
+            term = " ".join(term.lower().split())
+            if term:
+                self.weights[term] = float(weight)
+                self._insert(term)
+        self._link()
+
+    def _insert(self, term: str):
+        state = 0
+        for ch in term:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = (term,)
+
+    def _link(self):
+        """ Breadth-first failure links; outputs are merged along them """
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def match(self, text: str) -> List[Tuple[str, float]]:
+        """
+        Distinct lexicon terms found in `text` as (term, weight),
+        heaviest first.
+        """
+        text = " ".join(text.lower().split())
+        goto, fail, out = self._goto, self._fail, self._out
+        found = {}
+        state = 0
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for term in out[state]:
+                start = end - len(term) + 1
+                if term not in found \
+                        and (start == 0 or not _is_word_char(text[start - 1])) \
+                        and (end + 1 == len(text) or not _is_word_char(text[end + 1])):
+                    found[term] = self.weights[term]
+        return sorted(found.items(), key=lambda item: -item[1])
+
+
+def build_matcher(path: str) -> KeywordMatcher:
+    """ Registry loader: matcher compiled from the lexicon file at `path` """
+    return KeywordMatcher(load_lexicon(path))
+
+
+@lru_cache()
+def default_matcher() -> KeywordMatcher:
+    return KeywordMatcher(DEFAULT_LEXICON)
@@ -0,0 +1,138 @@
+import time
+import queue
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, List, Sequence
+import numpy as np
+from app.services.execution import OverloadedError
+from app.utils import metrics
+
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+QUEUE_WAIT_MS_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 250)
+
+
+class _Request:
+    __slots__ = ("sequence", "model", "version", "future", "enqueued_at")
+
+    def __init__(self, sequence: np.ndarray, model: Any, version: Hashable):
+        self.sequence = sequence
+        self.model = model
+        self.version = version
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class LSTMBatcher:
+    """
+    Dynamic micro-batching for LSTM inference.
+
+    Concurrent callers submit single sequences; a background worker collects
+    them for at most `max_wait_ms` (or until `max_batch_size` is reached),
+    groups them by model version and sequence length, runs one forward pass
+    per group on the model its callers leased and resolves each caller's
+    future with its own output.
+
+    Callers should await the future (asyncio.wrap_future) rather than block
+    a worker thread on it; at most `max_pending` requests may wait at once.
+    """
+
+    def __init__(
+        self,
+        forward: Callable[[np.ndarray, Any], np.ndarray],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_pending: int = 1024,
+        retry_after_s: float = 1.0
+    ):
+        """
+        forward: takes a (B, N, 1) float32 array and a model, returns B outputs
+        """
+        self.forward = forward
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_s = max(0.0, max_wait_ms) / 1000.0
+        self.max_pending = max(1, max_pending)
+        self.retry_after_s = retry_after_s
+
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+
+        self._batch_sizes = metrics.histogram("lstm_batch_size", BATCH_SIZE_BUCKETS)
+        self._queue_wait = metrics.histogram("lstm_queue_wait_ms", QUEUE_WAIT_MS_BUCKETS)
+
+    # ────────────────────────────────────────────────
+    # PUBLIC API
+    # ────────────────────────────────────────────────
+    def submit(self, sequence: Sequence[float], model: Any = None, version: Hashable = None) -> Future:
+        """
+        `model` / `version` come from the caller's lease, so a reload in
+        between never answers a request with a different model than the one
+        its result is reported (and cached) under.
+        Raises OverloadedError when `max_pending` requests are already queued.
+        """
+        if self._queue.qsize() >= self.max_pending:
+            raise OverloadedError("lstm_batcher", self.retry_after_s)
+        self._ensure_worker()
+        request = _Request(np.asarray(sequence, dtype=np.float32).reshape(-1), model, version)
+        self._queue.put(request)
+        return request.future
+
+    # ────────────────────────────────────────────────
+    # WORKER LOOP
+    # ────────────────────────────────────────────────
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._start_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name="lstm-batcher", daemon=True
+                    )
+                    self._worker.start()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            batch = [first]
+            deadline = first.enqueued_at + self.max_wait_s
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[_Request]):
+        # Callers that timed out / disconnected cancelled their futures
+        batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+        now = time.perf_counter()
+        for request in batch:
+            self._queue_wait.observe((now - request.enqueued_at) * 1000)
+
+        # Sequences of different lengths cannot share a forward pass
+        # without masking, so group them by length instead of padding;
+        # requests leased on different model versions never share one either.
+        groups = defaultdict(list)
+        for request in batch:
+            groups[(request.version, len(request.sequence))].append(request)
+
+        for requests in groups.values():
+            self._batch_sizes.observe(len(requests))
+            try:
+                x = np.stack([r.sequence for r in requests])[..., np.newaxis]
+                outputs = np.asarray(self.forward(x, requests[0].model)).reshape(len(requests), -1)
+            except Exception as e:
+                logging.warning(f"LSTM batch of {len(requests)} failed: {e}")
+                for r in requests:
+                    r.future.set_exception(e)
+                continue
+
+            for r, out in zip(requests, outputs):
+                r.future.set_result(float(out[0]))
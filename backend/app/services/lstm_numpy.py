@@ -0,0 +1,255 @@
+"""
+lstm_numpy.py
+-------------
+TensorFlow-free inference for the Keras LSTM model.
+
+The weights of `lstm_model.h5` are exported once into a compact `.npz`
+(layer spec + float32 arrays) and served by a pure-NumPy forward pass.
+Only the layer types used by the forecasting model are supported
+(LSTM, Dense, Dropout); anything else raises UnsupportedLayerError so the
+caller can fall back to TensorFlow.
+
+Export / verify from the backend directory:
+    python -m app.services.lstm_numpy app/models/lstm_model.h5 app/models/lstm_model.npz [--verify]
+"""
+
+import sys
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+
+SKIPPED_LAYERS = {"InputLayer", "Dropout"}   # identity at inference time
+
+
+class UnsupportedLayerError(ValueError):
+    """ The model uses a layer or option the NumPy engine cannot reproduce """
+
+
+# ────────────────────────────────────────────────
+# ACTIVATIONS
+# ────────────────────────────────────────────────
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _hard_sigmoid_keras2(x):
+    return np.clip(0.2 * x + 0.5, 0.0, 1.0)
+
+
+def _hard_sigmoid_keras3(x):
+    """ relu6(x + 3) / 6 """
+    return np.clip(x / 6.0 + 0.5, 0.0, 1.0)
+
+
+# Spec names; "hard_sigmoid" is resolved per Keras version at export
+ACTIVATIONS = {
+    None: lambda x: x,
+    "linear": lambda x: x,
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+    "hard_sigmoid_keras2": _hard_sigmoid_keras2,
+    "hard_sigmoid_keras3": _hard_sigmoid_keras3,
+    "relu": lambda x: np.maximum(x, 0.0),
+}
+
+
+def _keras_major(version) -> Optional[int]:
+    if isinstance(version, bytes):
+        version = version.decode()
+    try:
+        return int(str(version).split(".")[0])
+    except ValueError:
+        return None
+
+
+def _activation(name, keras_major: Optional[int] = None):
+    """
+    Spec name of a saved activation. Anything not recognised (custom
+    functions, serialized configs) raises UnsupportedLayerError.
+    """
+    if name == "hard_sigmoid":
+        if keras_major not in (2, 3):
+            raise UnsupportedLayerError("hard_sigmoid needs a known Keras version (2 or 3)")
+        name = f"hard_sigmoid_keras{keras_major}"
+    if not (name is None or isinstance(name, str)) or name not in ACTIVATIONS:
+        raise UnsupportedLayerError(f"Unsupported activation: {name!r}")
+    return name
+
+
+# ────────────────────────────────────────────────
+# EXPORT: KERAS .h5 → (spec, arrays)
+# ────────────────────────────────────────────────
+def read_keras_h5(h5_path: str) -> Tuple[List[Dict], Dict[str, np.ndarray]]:
+    """
+    Reads the layer config and weights of a Keras (legacy HDF5) Sequential model
+    with h5py only; TensorFlow is not imported.
+    """
+    import h5py
+
+    with h5py.File(h5_path, "r") as f:
+        raw = f.attrs["model_config"]
+        config = json.loads(raw.decode() if isinstance(raw, bytes) else raw)
+        if config.get("class_name") != "Sequential":
+            raise UnsupportedLayerError(f"Unsupported model class: {config.get('class_name')}")
+        keras_major = _keras_major(f.attrs.get("keras_version", ""))
+
+        layers = config["config"]
+        layers = layers["layers"] if isinstance(layers, dict) else layers
+        weights_root = f["model_weights"] if "model_weights" in f else f
+
+        spec, arrays = [], {}
+        for layer in layers:
+            kind, cfg = layer["class_name"], layer["config"]
+            if kind in SKIPPED_LAYERS:
+                continue
+
+            group = weights_root[cfg["name"]]
+            names = [n.decode() if isinstance(n, bytes) else n for n in group.attrs["weight_names"]]
+            weights = [np.asarray(group[n], dtype=np.float32) for n in names]
+            prefix = f"l{len(spec)}"
+
+            if kind == "LSTM":
+                if cfg.get("go_backwards") or cfg.get("stateful"):
+                    raise UnsupportedLayerError("go_backwards / stateful LSTM is not supported")
+                entry = {
+                    "type": "LSTM",
+                    "units": cfg["units"],
+                    "activation": _activation(cfg.get("activation", "tanh"), keras_major),
+                    "recurrent_activation": _activation(cfg.get("recurrent_activation", "sigmoid"), keras_major),
+                    "return_sequences": bool(cfg.get("return_sequences", False)),
+                }
+                arrays[f"{prefix}_kernel"] = weights[0]
+                arrays[f"{prefix}_recurrent_kernel"] = weights[1]
+                arrays[f"{prefix}_bias"] = (
+                    weights[2] if len(weights) > 2 else np.zeros(4 * cfg["units"], np.float32)
+                )
+
+            elif kind == "Dense":
+                entry = {"type": "Dense", "activation": _activation(cfg.get("activation"), keras_major)}
+                arrays[f"{prefix}_kernel"] = weights[0]
+                arrays[f"{prefix}_bias"] = (
+                    weights[1] if len(weights) > 1 else np.zeros(weights[0].shape[1], np.float32)
+                )
+
+            else:
+                raise UnsupportedLayerError(f"Unsupported layer type: {kind}")
+
+            entry["prefix"] = prefix
+            spec.append(entry)
+
+    return spec, arrays
+
+
+def save_npz(npz_path: str, spec: List[Dict], arrays: Dict[str, np.ndarray]):
+    np.savez(npz_path, spec=np.array(json.dumps(spec)), **arrays)
+
+
+def export_lstm_weights(h5_path: str, npz_path: str) -> List[Dict]:
+    spec, arrays = read_keras_h5(h5_path)
+    save_npz(npz_path, spec, arrays)
+    return spec
+
+
+# ────────────────────────────────────────────────
+# FORWARD ENGINE
+# ────────────────────────────────────────────────
+class NumpyLSTMModel:
+    """
+    Batch-capable float32 forward pass over exported LSTM/Dense layers.
+    Exposes `predict(x)` like a Keras model so it can be swapped in directly.
+    """
+
+    def __init__(self, spec: List[Dict], arrays: Dict[str, np.ndarray]):
+        """
+        Raises UnsupportedLayerError for activations this engine does not
+        know (e.g. a plain "hard_sigmoid" from an export predating the
+        per-version split), so the caller re-exports or falls back.
+        """
+        for layer in spec:
+            for key in ("activation", "recurrent_activation"):
+                if key in layer:
+                    _activation(layer[key], keras_major=None)
+        self.spec = spec
+        self.arrays = {k: np.asarray(v, dtype=np.float32) for k, v in arrays.items()}
+
+    @classmethod
+    def load(cls, npz_path: str) -> "NumpyLSTMModel":
+        with np.load(npz_path) as data:
+            spec = json.loads(str(data["spec"]))
+            arrays = {k: data[k] for k in data.files if k != "spec"}
+        return cls(spec, arrays)
+
+    def predict(self, x, verbose=0) -> np.ndarray:
+        out = np.asarray(x, dtype=np.float32)
+        for layer in self.spec:
+            if layer["type"] == "LSTM":
+                out = self._lstm(out, layer)
+            else:
+                out = self._dense(out, layer)
+        return out
+
+    def _dense(self, x: np.ndarray, layer: Dict) -> np.ndarray:
+        p = layer["prefix"]
+        return ACTIVATIONS[layer["activation"]](x @ self.arrays[f"{p}_kernel"] + self.arrays[f"{p}_bias"])
+
+    def _lstm(self, x: np.ndarray, layer: Dict) -> np.ndarray:
+        p = layer["prefix"]
+        units = layer["units"]
+        kernel = self.arrays[f"{p}_kernel"]
+        recurrent = self.arrays[f"{p}_recurrent_kernel"]
+        act = ACTIVATIONS[layer["activation"]]
+        rec_act = ACTIVATIONS[layer["recurrent_activation"]]
+
+        batch, timesteps, _ = x.shape
+        # Input projection for every timestep in one matmul: (B, T, 4U)
+        projected = x @ kernel + self.arrays[f"{p}_bias"]
+
+        h = np.zeros((batch, units), dtype=np.float32)
+        c = np.zeros((batch, units), dtype=np.float32)
+        sequence = np.empty((batch, timesteps, units), dtype=np.float32) if layer["return_sequences"] else None
+
+        # Keras gate order: input, forget, cell, output
+        for t in range(timesteps):
+            z = projected[:, t] + h @ recurrent
+            i = rec_act(z[:, :units])
+            f = rec_act(z[:, units:2 * units])
+            g = act(z[:, 2 * units:3 * units])
+            o = rec_act(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * act(c)
+            if sequence is not None:
+                sequence[:, t] = h
+
+        return sequence if sequence is not None else h
+
+
+# ────────────────────────────────────────────────
+# CLI: EXPORT (+ OPTIONAL PARITY CHECK AGAINST KERAS)
+# ────────────────────────────────────────────────
+def verify_against_keras(h5_path: str, npz_path: str, seq_length: int = 60, batch: int = 16) -> float:
+    """
+    Max absolute difference between Keras and NumPy outputs on random inputs.
+    """
+    import tensorflow as tf
+
+    keras_model = tf.keras.models.load_model(h5_path)
+    numpy_model = NumpyLSTMModel.load(npz_path)
+    x = np.random.default_rng(0).random((batch, seq_length, 1), dtype=np.float32)
+    return float(np.max(np.abs(keras_model.predict(x, verbose=0) - numpy_model.predict(x))))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    logging.basicConfig(level=logging.INFO)
+    layers = export_lstm_weights(sys.argv[1], sys.argv[2])
+    logging.info(f"Exported {len(layers)} layers to {sys.argv[2]}")
+
+    if "--verify" in sys.argv:
+        diff = verify_against_keras(sys.argv[1], sys.argv[2])
+        logging.info(f"Max |keras - numpy| = {diff:.2e}")
+        sys.exit(0 if diff < 1e-4 else 1)
@@ -1,10 +1,59 @@
-import os
-import joblib
+import asyncio
+import functools
 import numpy as np
-import tensorflow as tf
-from statsmodels.tsa.statespace.sarimax import SARIMAXResults
-from pydantic import BaseModel
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional, Sequence
 from app.config import Settings
+from app.services.model_registry import ModelRegistry
+from app.services.lstm_batcher import LSTMBatcher
+from app.services.features import latest_features
+from app.services.forecasting import recursive_rollout, rollout_many, statsmodels_forecast
+from app.services.prediction_cache import MemoryCache, PredictionCache, cache_key
+from app.services.execution import get_io_pool
+from app.services.state_space import StateSpaceStore
+from app.services.model_store import ModelStore
+
+
+class ModelNotLoadedError(RuntimeError):
+    """ Raised when a requested model artifact is missing or failed to load """
+
+
+MODEL_LABELS = {"lstm": "LSTM", "arima": "ARIMA", "sarima": "SARIMA", "lightgbm": "LightGBM"}
+
+
+class Forecast(NamedTuple):
+    prediction: list
+    model_version: Optional[str]
+
+
+def _prediction(name: str):
+    """
+    Pins one model version for the whole request (a hot reload never mixes
+    versions), passes the model to the wrapped method and serves repeated
+    (model, version, series, steps) requests from the cache.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, data=None, steps=1, ticker=None) -> Forecast:
+            with self._lease(name, ticker) as (model, version):
+                if model is None:
+                    raise ModelNotLoadedError(f"{MODEL_LABELS[name]} model not loaded")
+
+                if self.cache is None or data is None:
+                    return Forecast(method(self, model, data, steps, ticker), version)
+
+                scope = f"{name}/{ticker}" if ticker else name
+                key = cache_key(scope, version, data, steps)
+                cached = self.cache.get(key, name)
+                if cached is not None:
+                    return Forecast(cached, version)
+
+                result = method(self, model, data, steps, ticker)
+                self.cache.set(key, result, name)
+                return Forecast(result, version)
+        return wrapper
+    return decorator
 
 
 class ModelHandler:
@@ -16,119 +65,298 @@ class ModelHandler:
     - LightGBM
     """
 
-    def __init__(self, settings: Settings):
+    # Registry artifacts this engine reads (reported by EngineContainer)
+    ARTIFACTS = ("lstm", "arima", "sarima", "lightgbm", "lightgbm_scaler")
+
+    def __init__(
+        self,
+        settings: Settings,
+        registry: Optional[ModelRegistry] = None,
+        cache: Optional[PredictionCache] = None,
+        model_store: Optional[ModelStore] = None
+    ):
         self.settings = settings
-        self.model_dir = os.path.join(settings.BASE_DIR, "app", "models")
 
-        # Model placeholders
-        self.lstm_model = None
-        self.arima_model = None
-        self.sarima_model = None
-        self.lightgbm_model = None
-        self.scaler = None
+        # Shared, lazily-loaded artifacts (one instance per process)
+        self.registry = registry or ModelRegistry(settings)
+
+        # Optional prediction cache (see dependencies.get_cache)
+        self.cache = cache
 
-        # Load models at startup
-        self.load_all_models()
+        # Optional per-ticker models; tickers without one use the shared model
+        self.model_store = model_store
+
+        # Per-ticker ARIMA / SARIMA state updated incrementally from new bars
+        self.arima_states = StateSpaceStore(
+            "arima", lambda ticker: self._resolve("arima", ticker)[0],
+            history_size=settings.STATE_SPACE_HISTORY,
+            refit_interval_s=settings.STATE_SPACE_REFIT_INTERVAL_S
+        )
+        self.sarima_states = StateSpaceStore(
+            "sarima", lambda ticker: self._resolve("sarima", ticker)[0],
+            history_size=settings.STATE_SPACE_HISTORY,
+            refit_interval_s=settings.STATE_SPACE_REFIT_INTERVAL_S
+        )
+
+        # Per-ticker states were built on the old base model
+        self.registry.add_listener(self._on_model_swapped)
+
+        # Concurrent LSTM requests share batched forward passes
+        self.lstm_batcher = LSTMBatcher(
+            self._lstm_forward,
+            max_batch_size=settings.LSTM_MAX_BATCH_SIZE,
+            max_wait_ms=settings.LSTM_MAX_WAIT_MS,
+            max_pending=settings.LSTM_MAX_PENDING,
+            retry_after_s=settings.OVERLOAD_RETRY_AFTER_S
+        )
 
     # ────────────────────────────────────────────────
-    # LOAD ALL MODELS
+    # MODEL ACCESSORS (resolved through the registry)
     # ────────────────────────────────────────────────
-    def load_all_models(self):
-        self.lstm_model = self._load_lstm()
-        self.arima_model = self._load_arima()
-        self.sarima_model = self._load_sarima()
-        self.lightgbm_model = self._load_lightgbm()
-        self.scaler = self._load_scaler()
+    @property
+    def lstm_model(self):
+        return self.registry.get("lstm")
+
+    @property
+    def arima_model(self):
+        return self.registry.get("arima")
+
+    @property
+    def sarima_model(self):
+        return self.registry.get("sarima")
+
+    @property
+    def lightgbm_model(self):
+        return self.registry.get("lightgbm")
+
+    @property
+    def lightgbm_scaler(self):
+        """ Scaler fitted on the LightGBM price features (not the risk / event scaler) """
+        return self.registry.get("lightgbm_scaler")
+
+    def _resolve(self, family: str, ticker: Optional[str] = None):
+        """
+        (model, version): the ticker's own model when the store has one,
+        otherwise the shared registry model.
+        """
+        if ticker and self.model_store is not None:
+            found = self.model_store.get(ticker, family)
+            if found is not None:
+                return found
+        return self.registry.get(family), self.registry.version(family)
+
+    @contextmanager
+    def _lease(self, family: str, ticker: Optional[str] = None):
+        """
+        Like _resolve, but a shared model stays leased until the block exits.
+        """
+        if ticker and self.model_store is not None:
+            found = self.model_store.get(ticker, family)
+            if found is not None:
+                yield found
+                return
+        with self.registry.lease(family) as entry:
+            yield entry.model, entry.version
+
+    def _on_model_swapped(self, name: str, version: Optional[str]):
+        if name == "arima":
+            self.arima_states.reset()
+        elif name == "sarima":
+            self.sarima_states.reset()
 
     # ────────────────────────────────────────────────
-    # INDIVIDUAL LOADERS
+    # LOAD ALL MODELS
     # ────────────────────────────────────────────────
-    def _load_lstm(self):
-        try:
-            path = os.path.join(self.model_dir, "lstm_model.h5")
-            if os.path.exists(path):
-                return tf.keras.models.load_model(path)
-        except:
-            return None
-        return None
-
-    def _load_arima(self):
-        try:
-            path = os.path.join(self.model_dir, "arima_model.pkl")
-            if os.path.exists(path):
-                return joblib.load(path)
-        except:
-            return None
-        return None
-
-    def _load_sarima(self):
-        try:
-            path = os.path.join(self.model_dir, "sarima_model.pkl")
-            if os.path.exists(path):
-                return SARIMAXResults.load(path)
-        except:
-            return None
-        return None
-
-    def _load_lightgbm(self):
-        try:
-            path = os.path.join(self.model_dir, "lightgbm_model.txt")
-            if os.path.exists(path):
-                import lightgbm as lgb
-                return lgb.Booster(model_file=path)
-        except:
-            return None
-        return None
-
-    def _load_scaler(self):
-        try:
-            path = os.path.join(self.model_dir, "scaler.pkl")
-            if os.path.exists(path):
-                return joblib.load(path)
-        except:
-            return None
-        return None
+    def load_all_models(self):
+        self.registry.warm()
 
     # ────────────────────────────────────────────────
     # LSTM PREDICTION
     # ────────────────────────────────────────────────
-    def predict_lstm(self, sequence):
-        if self.lstm_model is None:
-            raise RuntimeError("LSTM model not loaded")
+    @_prediction("lstm")
+    def predict_lstm(self, model, sequence, steps=1, ticker=None) -> List[float]:
+        """
+        Forecasts `steps` values ahead by feeding each prediction back
+        into the input window. Runs on the calling thread; single-step
+        requests on the shared model go through predict_lstm_batched instead.
+        """
+        if sequence is None or not len(sequence):
+            raise ValueError("LSTM needs a non-empty input sequence")
+
+        forward = functools.partial(self._lstm_forward, model=model)
+        return recursive_rollout(forward, sequence, steps)[0].tolist()
+
+    def lstm_batchable(self, sequence, steps=1, ticker=None) -> bool:
+        """
+        True when the request can join a micro-batch: one step ahead on the
+        already-loaded shared model. Anything else (first load, per-ticker
+        model, longer horizon) belongs on the CPU pool.
+        """
+        return steps == 1 and sequence is not None and len(sequence) > 0 \
+            and self.registry.is_loaded("lstm") and self.lstm_model is not None \
+            and not self._has_ticker_model("lstm", ticker)
+
+    async def predict_lstm_batched(self, sequence, ticker=None) -> Forecast:
+        """
+        Single-step LSTM prediction awaited on the event loop: the request
+        waits on the batcher's future without holding a pool thread, so a
+        micro-batch can collect every concurrent request.
+        Callers check lstm_batchable first.
+        """
+        with self.registry.lease("lstm") as entry:
+            if entry.model is None:
+                raise ModelNotLoadedError("LSTM model not loaded")
 
-        seq = np.array(sequence).reshape(1, -1, 1)
-        return float(self.lstm_model.predict(seq)[0][0])
+            key = None
+            if self.cache is not None:
+                scope = f"lstm/{ticker}" if ticker else "lstm"
+                key = cache_key(scope, entry.version, sequence, 1)
+                cached = await self._cache_call(self.cache.get, key, "lstm")
+                if cached is not None:
+                    return Forecast(cached, entry.version)
+
+            result = [await asyncio.wrap_future(self.lstm_batcher.submit(sequence, entry.model, entry.version))]
+            if key is not None:
+                await self._cache_call(self.cache.set, key, result, "lstm")
+            return Forecast(result, entry.version)
+
+    async def _cache_call(self, fn, *args):
+        """ In-memory lookups run inline; other backends touch disk, so they go to the IO pool """
+        if isinstance(self.cache, MemoryCache):
+            return fn(*args)
+        return await get_io_pool().run(fn, *args)
+
+    def predict_lstm_batch(self, sequences, steps=1) -> Forecast:
+        """
+        Rolls out many series at once; equal-length series share each forward pass.
+        """
+        with self._lease("lstm") as (model, version):
+            if model is None:
+                raise ModelNotLoadedError("LSTM model not loaded")
+
+            forward = functools.partial(self._lstm_forward, model=model)
+            return Forecast([row.tolist() for row in rollout_many(forward, sequences, steps)], version)
+
+    def _lstm_forward(self, batch: np.ndarray, model=None) -> np.ndarray:
+        """ One forward pass over a (B, N, 1) batch """
+        return (model or self.lstm_model).predict(batch, verbose=0)[:, 0]
 
     # ────────────────────────────────────────────────
     # ARIMA PREDICTION
     # ────────────────────────────────────────────────
-    def predict_arima(self, steps=1):
-        if self.arima_model is None:
-            raise RuntimeError("ARIMA model not loaded")
-
-        return float(self.arima_model.forecast(steps=steps)[0])
+    @_prediction("arima")
+    def predict_arima(self, model, data=None, steps=1, ticker=None) -> List[float]:
+        """
+        Full `steps`-ahead ARIMA forecast (see _state_space_forecast).
+        """
+        return self._state_space_forecast(self.arima_states, model, data, steps, ticker)
 
     # ────────────────────────────────────────────────
     # SARIMA PREDICTION
     # ────────────────────────────────────────────────
-    def predict_sarima(self, steps=1):
-        if self.sarima_model is None:
-            raise RuntimeError("SARIMA model not loaded")
+    @_prediction("sarima")
+    def predict_sarima(self, model, data=None, steps=1, ticker=None) -> List[float]:
+        """
+        Full `steps`-ahead SARIMA forecast (see _state_space_forecast).
+        """
+        return self._state_space_forecast(self.sarima_states, model, data, steps, ticker)
 
-        return float(self.sarima_model.forecast(steps)[0])
+    def _state_space_forecast(self, store: StateSpaceStore, results, data, steps, ticker) -> List[float]:
+        """
+        - ticker + data → the ticker's state absorbs only the new observations
+        - data only     → data is filtered through the fitted parameters (no refit)
+        - no data       → forecast from the fitted state itself
+        """
+        has_data = data is not None and len(data) > 0
+        if has_data and ticker:
+            return store.forecast(ticker, data, steps).tolist()
+        if has_data and hasattr(results, "apply"):
+            results = results.apply(np.asarray(data, dtype=float), refit=False)
+        return statsmodels_forecast(results, steps).tolist()
 
     # ────────────────────────────────────────────────
     # LIGHTGBM PREDICTION
     # ────────────────────────────────────────────────
-    def predict_lightgbm(self, features):
-        if self.lightgbm_model is None:
-            raise RuntimeError("LightGBM model not loaded")
+    @_prediction("lightgbm")
+    def predict_lightgbm(self, model, prices, steps=1, ticker=None) -> List[float]:
+        """
+        LightGBM maps the features of a raw price window (see services.features)
+        to the next price; longer horizons feed each prediction back in.
+        """
+        forward = functools.partial(self._lightgbm_forward, model=model)
+        return recursive_rollout(forward, prices, steps)[0].tolist()
 
-        arr = np.array(features).reshape(1, -1)
-        if self.scaler:
-            arr = self.scaler.transform(arr)
+    def _lightgbm_forward(self, batch: np.ndarray, model) -> np.ndarray:
+        """ One 2-D predict over the latest features of a (B, N, 1) window batch """
+        arr = latest_features(batch[:, :, 0])
+        scaler = self.lightgbm_scaler
+        if scaler is not None:
+            arr = scaler.transform(arr)
+        return model.predict(arr)
 
-        return float(self.lightgbm_model.predict(arr)[0])
+    # ────────────────────────────────────────────────
+    # BATCH PREDICTION (MANY TICKERS, ONE CALL PER MODEL)
+    # ────────────────────────────────────────────────
+    def predict_batch(self, items: Sequence[Dict]) -> List[Dict]:
+        """
+        items: dicts with model, series, steps and an optional ticker.
+        Returns one result dict per item, in input order.
+
+        LSTM and LightGBM items on the shared model are grouped into one batched
+        rollout per horizon (one forward pass / one 2-D predict per step);
+        ARIMA / SARIMA and per-ticker models are served item by item.
+        A failing item only affects its own result.
+        """
+        results: List[Optional[Dict]] = [None] * len(items)
+        grouped = defaultdict(list)
+
+        for i, item in enumerate(items):
+            family = item["model"]
+            if family in ("lstm", "lightgbm") and not len(item["series"]):
+                results[i] = _batch_error(item, ValueError("No input series and no stored history"))
+            elif family in ("lstm", "lightgbm") and not self._has_ticker_model(family, item.get("ticker")):
+                grouped[family].append(i)
+            else:
+                results[i] = self._predict_item(item)
+
+        for family, indices in grouped.items():
+            self._predict_group(family, items, indices, results)
+        return results
+
+    def _has_ticker_model(self, family: str, ticker: Optional[str]) -> bool:
+        return bool(ticker) and self.model_store is not None \
+            and self.model_store.latest_version(ticker, family) is not None
+
+    def _predict_item(self, item: Dict) -> Dict:
+        method = getattr(self, f"predict_{item['model']}")
+        try:
+            return _batch_result(item, method(item["series"], item["steps"], ticker=item.get("ticker")))
+        except Exception as e:
+            return _batch_error(item, e)
+
+    def _predict_group(self, family: str, items, indices: List[int], results: List[Optional[Dict]]):
+        forwards = {"lstm": self._lstm_forward, "lightgbm": self._lightgbm_forward}
+        with self._lease(family) as (model, version):
+            if model is None:
+                error = ModelNotLoadedError(f"{MODEL_LABELS[family]} model not loaded")
+                for i in indices:
+                    results[i] = _batch_error(items[i], error)
+                return
+
+            forward = functools.partial(forwards[family], model=model)
+            by_steps = defaultdict(list)
+            for i in indices:
+                by_steps[items[i]["steps"]].append(i)
+
+            for steps, group in by_steps.items():
+                try:
+                    forecasts = rollout_many(forward, [items[i]["series"] for i in group], steps)
+                except Exception as e:
+                    for i in group:
+                        results[i] = _batch_error(items[i], e)
+                    continue
+                for i, row in zip(group, forecasts):
+                    results[i] = _batch_result(items[i], Forecast(row.tolist(), version))
 
     # ────────────────────────────────────────────────
     # CHECK WHICH MODELS ARE AVAILABLE
@@ -139,5 +367,24 @@ class ModelHandler:
             "arima": self.arima_model is not None,
             "sarima": self.sarima_model is not None,
             "lightgbm": self.lightgbm_model is not None,
-            "scaler": self.scaler is not None
+            "lightgbm_scaler": self.lightgbm_scaler is not None
         }
+
+
+def _batch_result(item: Dict, forecast: Forecast) -> Dict:
+    return {
+        "ticker": item.get("ticker"),
+        "model": item["model"],
+        "status": "ok",
+        "prediction": forecast.prediction,
+        "model_version": forecast.model_version,
+    }
+
+
+def _batch_error(item: Dict, error: Exception) -> Dict:
+    return {
+        "ticker": item.get("ticker"),
+        "model": item["model"],
+        "status": "unavailable" if isinstance(error, ModelNotLoadedError) else "error",
+        "detail": str(error),
+    }
@@ -0,0 +1,401 @@
+import os
+import time
+import hashlib
+import functools
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import numpy as np
+from app.config import Settings
+
+
+# ────────────────────────────────────────────────
+# ARTIFACT LOADERS
+# Heavy libraries are imported inside the loader so that
+# only the models actually used pay for their import.
+# ────────────────────────────────────────────────
+def _load_keras(path: str):
+    import tensorflow as tf
+    return tf.keras.models.load_model(path)
+
+
+def _load_lstm_numpy(path: str, npz_path: Optional[str] = None):
+    """
+    Serves the LSTM through the NumPy engine, exporting the .h5 weights
+    to `npz_path` (default: next to the .h5) when the export is missing
+    or stale. Falls back to TensorFlow only if the model uses unsupported layers.
+    """
+    from app.services.lstm_numpy import NumpyLSTMModel, UnsupportedLayerError, read_keras_h5, save_npz
+
+    npz_path = npz_path or os.path.splitext(path)[0] + ".npz"
+
+    if os.path.exists(npz_path) and os.path.getmtime(npz_path) >= os.path.getmtime(path):
+        try:
+            return NumpyLSTMModel.load(npz_path)
+        except UnsupportedLayerError as e:
+            logging.info(f"Re-exporting stale LSTM export {npz_path}: {e}")
+
+    try:
+        spec, arrays = read_keras_h5(path)
+    except UnsupportedLayerError as e:
+        logging.info(f"NumPy LSTM engine unavailable ({e}); falling back to TensorFlow")
+        return _load_keras(path)
+
+    try:
+        save_npz(npz_path, spec, arrays)
+    except OSError as e:
+        logging.warning(f"Could not write LSTM export {npz_path}: {e}")
+    return NumpyLSTMModel(spec, arrays)
+
+
+def _load_joblib(path: str):
+    import joblib
+    return joblib.load(path)
+
+
+def _load_lexicon(path: str):
+    from app.services.lexicon import build_matcher
+    return build_matcher(path)
+
+
+def _load_sarimax(path: str):
+    from statsmodels.tsa.statespace.sarimax import SARIMAXResults
+    return SARIMAXResults.load(path)
+
+
+def _load_lightgbm(path: str):
+    import lightgbm as lgb
+    return lgb.Booster(model_file=path)
+
+
+def family_loader(family: str, settings: Settings, npz_path: Optional[str] = None) -> Callable[[str], Any]:
+    """
+    Loader for a model family, shared by the registry and the per-ticker model store.
+    """
+    if family == "lstm":
+        if settings.LSTM_ENGINE == "numpy":
+            return functools.partial(_load_lstm_numpy, npz_path=npz_path)
+        return _load_keras
+    return {
+        "arima": _load_joblib,
+        "sarima": _load_sarimax,
+        "lightgbm": _load_lightgbm,
+        "scaler": _load_joblib,
+        "lightgbm_scaler": _load_joblib,
+    }[family]
+
+
+# ────────────────────────────────────────────────
+# HELPERS
+# ────────────────────────────────────────────────
+def rss_bytes() -> int:
+    """
+    Resident set size of the current process (0 if unknown).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except Exception:
+        return 0
+
+
+def _artifact_version(path: str) -> str:
+    """
+    Short content hash used as the model version.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def _smoke_test(name: str, model):
+    """
+    One cheap prediction on zeros; raises if the artifact is unusable.
+    """
+    if name == "lstm":
+        shape = getattr(model, "input_shape", None)
+        length = shape[1] if shape and shape[1] else 60
+        out = model.predict(np.zeros((1, length, 1), dtype=np.float32), verbose=0)
+    elif name in ("arima", "sarima"):
+        out = model.forecast(steps=1)
+    elif name == "lightgbm":
+        out = model.predict(np.zeros((1, model.num_feature())))
+    elif name in ("scaler", "lightgbm_scaler"):
+        out = model.transform(np.zeros((1, model.n_features_in_)))
+    else:
+        return
+    if not np.all(np.isfinite(np.asarray(out, dtype=float))):
+        raise ValueError("smoke prediction returned non-finite values")
+
+
+@dataclass
+class ModelEntry:
+    name: str
+    path: str
+    loader: Callable[[str], Any]
+    model: Any = None
+    version: Optional[str] = None
+    loaded: bool = False
+    load_time_s: Optional[float] = None
+    memory_bytes: Optional[int] = None
+    error: Optional[str] = None
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    # In-flight requests using this entry (drained after a swap)
+    active: int = 0
+    retired: bool = False
+    drained: threading.Event = field(default_factory=threading.Event, repr=False)
+    _active_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def acquire(self):
+        with self._active_lock:
+            self.active += 1
+
+    def release(self):
+        with self._active_lock:
+            self.active -= 1
+            if self.retired and self.active == 0:
+                self.drained.set()
+
+    def retire(self):
+        with self._active_lock:
+            self.retired = True
+            if self.active == 0:
+                self.drained.set()
+
+
+class ModelRegistry:
+    """
+    Process-wide registry for model artifacts.
+    Each artifact is loaded lazily on first access, exactly once,
+    and the same instance is shared by every caller.
+
+    reload() stages a new artifact next to the live one, smoke-tests it and
+    swaps it in atomically; requests holding a lease on the old entry finish
+    on it before it is released.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._entries: Dict[str, ModelEntry] = {}
+        self._listeners: List[Callable[[str, Optional[str]], None]] = []
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+
+        npz_path = self._resolve(settings.LSTM_NPZ_PATH)
+        self.register("lstm", settings.LSTM_MODEL_PATH, family_loader("lstm", settings, npz_path))
+        self.register("arima", settings.ARIMA_MODEL_PATH, family_loader("arima", settings))
+        self.register("sarima", settings.SARIMA_MODEL_PATH, family_loader("sarima", settings))
+        self.register("lightgbm", settings.LIGHTGBM_MODEL_PATH, family_loader("lightgbm", settings))
+        self.register("scaler", settings.SCALER_PATH, family_loader("scaler", settings))
+        self.register("lightgbm_scaler", settings.LIGHTGBM_SCALER_PATH, family_loader("lightgbm_scaler", settings))
+        self.register("risk_model", settings.RISK_MODEL_PATH, _load_joblib)
+        self.register("event_model", settings.EVENT_MODEL_PATH, _load_joblib)
+        self.register("event_lexicon", settings.EVENT_LEXICON_PATH, _load_lexicon)
+
+    # ────────────────────────────────────────────────
+    # REGISTRATION
+    # ────────────────────────────────────────────────
+    def _resolve(self, path: str) -> str:
+        if not os.path.isabs(path):
+            path = os.path.join(self.settings.BASE_DIR, path)
+        return path
+
+    def register(self, name: str, path: str, loader: Callable[[str], Any]):
+        self._entries[name] = ModelEntry(name=name, path=self._resolve(path), loader=loader)
+
+    def names(self):
+        return list(self._entries)
+
+    def add_listener(self, callback: Callable[[str, Optional[str]], None]):
+        """
+        callback(name, version) runs every time a reloaded artifact is
+        swapped in, e.g. to invalidate cached predictions.
+        """
+        self._listeners.append(callback)
+
+    # ────────────────────────────────────────────────
+    # LAZY, THREAD-SAFE ACCESS
+    # ────────────────────────────────────────────────
+    def _current(self, name: str) -> ModelEntry:
+        entry = self._entries[name]
+        if not entry.loaded:
+            with entry.lock:
+                if not entry.loaded:
+                    self._load(entry)
+        return entry
+
+    def get(self, name: str):
+        """
+        Returns the loaded model, or None if the artifact is missing or broken.
+        """
+        return self._current(name).model
+
+    def version(self, name: str) -> Optional[str]:
+        return self._current(name).version
+
+    def is_loaded(self, name: str) -> bool:
+        """
+        True once the artifact has been loaded (or found missing / broken),
+        i.e. get() will not block on I/O.
+        """
+        return self._entries[name].loaded
+
+    @contextmanager
+    def lease(self, name: str):
+        """
+        Pins one consistent entry (model + version) for the duration of a request.
+        """
+        while True:
+            entry = self._current(name)
+            entry.acquire()
+            # A reload may have swapped (and retired) the entry between the
+            # lookup and acquire(); only a lease on the live entry is safe.
+            if self._entries[name] is entry:
+                break
+            entry.release()
+        try:
+            yield entry
+        finally:
+            entry.release()
+
+    def warm(self, names: Optional[Iterable[str]] = None):
+        for name in names or self.names():
+            self.get(name)
+
+    def _load(self, entry: ModelEntry):
+        entry.model = None
+        entry.version = None
+        entry.error = None
+
+        if not os.path.exists(entry.path):
+            entry.error = "artifact not found"
+        else:
+            rss_before = rss_bytes()
+            start = time.perf_counter()
+            try:
+                entry.version = _artifact_version(entry.path)
+                entry.model = entry.loader(entry.path)
+            except Exception as e:
+                entry.error = str(e)
+                logging.warning(f"Could not load model '{entry.name}': {e}")
+            entry.load_time_s = time.perf_counter() - start
+            entry.memory_bytes = max(0, rss_bytes() - rss_before)
+
+        entry.loaded = True
+        logging.info(f"Model '{entry.name}' registered (version={entry.version}, error={entry.error})")
+
+    # ────────────────────────────────────────────────
+    # HOT RELOAD: STAGE → SMOKE TEST → ATOMIC SWAP → DRAIN
+    # ────────────────────────────────────────────────
+    def reload(self, names: Optional[Iterable[str]] = None, drain_timeout_s: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Per model: "swapped", "unchanged" (same content hash) or "rejected"
+        (missing, unloadable or failed smoke test; the live model stays).
+        """
+        if drain_timeout_s is None:
+            drain_timeout_s = self.settings.MODEL_DRAIN_TIMEOUT_S
+        with self._reload_lock:
+            return {name: self._reload_one(name, drain_timeout_s) for name in names or self.names()}
+
+    def _reload_one(self, name: str, drain_timeout_s: float) -> Dict:
+        old = self._current(name)
+        staged = ModelEntry(name=name, path=old.path, loader=old.loader)
+        self._load(staged)
+
+        if staged.model is None:
+            return {"status": "rejected", "version": old.version, "error": staged.error}
+        if staged.version == old.version and old.model is not None:
+            return {"status": "unchanged", "version": old.version}
+        try:
+            _smoke_test(name, staged.model)
+        except Exception as e:
+            logging.warning(f"Reload of '{name}' rejected by smoke test: {e}")
+            return {"status": "rejected", "version": old.version, "error": f"smoke test failed: {e}"}
+
+        self._entries[name] = staged   # atomic swap: new requests see only the new entry
+        logging.info(f"Model '{name}' swapped {old.version} → {staged.version}")
+
+        for callback in self._listeners:
+            try:
+                callback(name, staged.version)
+            except Exception as e:
+                logging.warning(f"Model listener failed for '{name}': {e}")
+
+        old.retire()
+        drained = old.drained.wait(drain_timeout_s)
+        if drained:
+            old.model = None
+        return {
+            "status": "swapped",
+            "previous_version": old.version,
+            "version": staged.version,
+            "drained": drained,
+        }
+
+    def watch(self, interval_s: float, on_poll: Optional[Callable[[], None]] = None):
+        """
+        Polls artifact modification times and reloads changed models
+        in a background thread. `on_poll` runs on every poll (e.g. to
+        refresh the per-ticker model store).
+        """
+        if self._watcher is not None or interval_s <= 0:
+            return
+
+        def _mtime(path):
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return None
+
+        def _run():
+            seen = {name: _mtime(e.path) for name, e in self._entries.items()}
+            while True:
+                time.sleep(interval_s)
+                changed = []
+                for name, entry in list(self._entries.items()):
+                    mtime = _mtime(entry.path)
+                    if mtime != seen.get(name):
+                        seen[name] = mtime
+                        changed.append(name)
+                try:
+                    if changed:
+                        logging.info(f"Model artifacts changed: {changed}")
+                        self.reload(changed)
+                    if on_poll is not None:
+                        on_poll()
+                except Exception as e:
+                    logging.warning(f"Model watcher failed: {e}")
+
+        self._watcher = threading.Thread(target=_run, name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    # ────────────────────────────────────────────────
+    # REPORTING
+    # ────────────────────────────────────────────────
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Load time and approximate memory (RSS delta) per model.
+        Models that have not been requested yet are reported as not loaded.
+        """
+        report = {}
+        for name, entry in self._entries.items():
+            report[name] = {
+                "path": entry.path,
+                "loaded": entry.loaded,
+                "available": entry.model is not None,
+                "version": entry.version,
+                "load_time_ms": round(entry.load_time_s * 1000, 2) if entry.load_time_s is not None else None,
+                "memory_mb": round(entry.memory_bytes / 2**20, 2) if entry.memory_bytes is not None else None,
+                "error": entry.error,
+            }
+        return report
@@ -0,0 +1,210 @@
+import os
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.config import Settings
+from app.services.model_registry import family_loader, rss_bytes
+from app.utils import metrics
+
+
+# Artifact file inside {MODEL_STORE_DIR}/{family}/{ticker}/{version}/
+ARTIFACT_FILES = {
+    "lstm": "model.h5",
+    "arima": "model.pkl",
+    "sarima": "model.pkl",
+    "lightgbm": "model.txt",
+}
+
+# Tickers become path components: no separators, no leading dot, no ".."
+TICKER_PATTERN = r"^(?!\.)(?!.*\.\.)[A-Za-z0-9._-]{1,16}$"
+_TICKER_RE = re.compile(TICKER_PATTERN)
+
+LOAD_MS_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+StoreKey = Tuple[str, str, str]   # (ticker, family, version)
+
+
+@dataclass
+class StoredModel:
+    model: Any
+    size_bytes: int
+    load_time_s: float
+    last_used: float
+
+
+def validate_ticker(ticker: str) -> str:
+    """
+    Returns the ticker unchanged, or raises ValueError if it could
+    escape MODEL_STORE_DIR (or is not a plausible symbol at all).
+    """
+    if not isinstance(ticker, str) or not _TICKER_RE.match(ticker):
+        raise ValueError(f"Invalid ticker {ticker!r}")
+    return ticker
+
+
+class ModelStore:
+    """
+    Per-ticker models keyed by (ticker, family, version), loaded on demand
+    and kept within a memory budget by evicting the least recently used.
+
+    On-disk layout:
+        {MODEL_STORE_DIR}/{family}/{ticker}/{version}/model.{h5|pkl|txt}
+    The lexicographically greatest version directory is the latest.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.directory = settings.MODEL_STORE_DIR
+        if not os.path.isabs(self.directory):
+            self.directory = os.path.join(settings.BASE_DIR, self.directory)
+        self.budget_bytes = settings.MODEL_STORE_BUDGET_BYTES
+
+        self._models: "OrderedDict[StoreKey, StoredModel]" = OrderedDict()
+        self._resident = 0
+        self._latest: Dict[Tuple[str, str], Optional[str]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[StoreKey, threading.Lock] = {}
+
+        self._load_ms = metrics.histogram("model_store_load_ms", LOAD_MS_BUCKETS)
+        self._evictions = metrics.counter("model_store_evictions_total")
+        self._hits = metrics.counter("model_store_hits_total")
+        self._misses = metrics.counter("model_store_misses_total")
+        self._resident_gauge = metrics.gauge("model_store_resident_bytes")
+        self._count_gauge = metrics.gauge("model_store_models")
+
+    # ────────────────────────────────────────────────
+    # VERSION RESOLUTION
+    # ────────────────────────────────────────────────
+    def versions(self, ticker: str, family: str) -> List[str]:
+        path = os.path.join(self.directory, family, validate_ticker(ticker))
+        if not os.path.isdir(path):
+            return []
+        return sorted(v for v in os.listdir(path)
+                      if os.path.exists(os.path.join(path, v, ARTIFACT_FILES[family])))
+
+    def latest_version(self, ticker: str, family: str) -> Optional[str]:
+        """
+        Cached per (ticker, family), including "no model"; call refresh()
+        after publishing new versions.
+        """
+        key = (ticker, family)
+        if key not in self._latest:
+            found = self.versions(ticker, family)
+            self._latest[key] = found[-1] if found else None
+        return self._latest[key]
+
+    def refresh(self):
+        self._latest.clear()
+
+    # ────────────────────────────────────────────────
+    # ON-DEMAND ACCESS
+    # ────────────────────────────────────────────────
+    def get(self, ticker: str, family: str, version: Optional[str] = None) -> Optional[Tuple[Any, str]]:
+        """
+        Returns (model, version) for the ticker, or None if it has no model of this family.
+        """
+        validate_ticker(ticker)
+        version = version or self.latest_version(ticker, family)
+        if version is None:
+            return None
+
+        key = (ticker, family, version)
+        with self._lock:
+            stored = self._models.get(key)
+            if stored is not None:
+                self._models.move_to_end(key)
+                stored.last_used = time.time()
+        if stored is not None:
+            self._hits.inc()
+            return stored.model, version
+
+        self._misses.inc()
+        model = self._load(key)
+        return (model, version) if model is not None else None
+
+    def _load(self, key: StoreKey):
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._models:
+                    return self._models[key].model
+
+            ticker, family, version = key
+            path = os.path.join(self.directory, family, validate_ticker(ticker), version, ARTIFACT_FILES[family])
+            rss_before = rss_bytes()
+            start = time.perf_counter()
+            try:
+                model = family_loader(family, self.settings)(path)
+            except Exception as e:
+                logging.warning(f"Could not load {family} model for {ticker} ({version}): {e}")
+                return None
+            elapsed = time.perf_counter() - start
+            self._load_ms.observe(elapsed * 1000)
+
+            # RSS delta is noisy under concurrent loads; the file size is a floor
+            size = max(os.path.getsize(path), rss_bytes() - rss_before)
+
+            with self._lock:
+                self._models[key] = StoredModel(model, size, elapsed, time.time())
+                self._resident += size
+                self._evict_over_budget()
+                self._key_locks.pop(key, None)
+            return model
+
+    def _evict_over_budget(self):
+        # Never evict the model that was just loaded (the last entry)
+        while self._resident > self.budget_bytes and len(self._models) > 1:
+            _, evicted = self._models.popitem(last=False)
+            self._resident -= evicted.size_bytes
+            self._evictions.inc()
+        self._resident_gauge.set(self._resident)
+        self._count_gauge.set(len(self._models))
+
+    # ────────────────────────────────────────────────
+    # WATCHLIST PREFETCH
+    # ────────────────────────────────────────────────
+    def prefetch(self, tickers: Iterable[str], families: Iterable[str] = tuple(ARTIFACT_FILES)):
+        """
+        Loads the latest models of every watched ticker in a background thread.
+        """
+        pairs = [(t, f) for t in tickers for f in families]
+
+        def _run():
+            for ticker, family in pairs:
+                try:
+                    self.get(ticker, family)
+                except ValueError as e:
+                    logging.warning(f"Skipping watchlist entry: {e}")
+            logging.info(f"Model store prefetched {len(pairs)} (ticker, family) pairs")
+
+        thread = threading.Thread(target=_run, name="model-store-prefetch", daemon=True)
+        thread.start()
+        return thread
+
+    # ────────────────────────────────────────────────
+    # REPORTING
+    # ────────────────────────────────────────────────
+    def stats(self) -> Dict:
+        with self._lock:
+            models = [
+                {
+                    "ticker": t, "family": f, "version": v,
+                    "size_mb": round(m.size_bytes / 2**20, 3),
+                    "load_time_ms": round(m.load_time_s * 1000, 2),
+                }
+                for (t, f, v), m in self._models.items()
+            ]
+        return {
+            "budget_mb": round(self.budget_bytes / 2**20, 2),
+            "resident_mb": round(self._resident / 2**20, 3),
+            "evictions": self._evictions.snapshot(),
+            "hits": self._hits.snapshot(),
+            "misses": self._misses.snapshot(),
+            "models": models,
+        }
@@ -0,0 +1,223 @@
+import os
+import time
+import pickle
+import shutil
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+import numpy as np
+
+
+# ────────────────────────────────────────────────
+# CONTENT-ADDRESSED KEY
+# ────────────────────────────────────────────────
+def cache_key(model: str, version: Optional[str], series: Sequence[float], steps: int) -> str:
+    """
+    Hash of (model name, model version, input series, steps).
+    """
+    digest = hashlib.sha256(f"{model}|{version}|{steps}|".encode())
+    digest.update(np.ascontiguousarray(series, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """
+    Base class for prediction caches.
+    Entries are tagged with their model name so a reload can drop them.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, model: str) -> Optional[Any]:
+        """ Returns the cached value, or None on a miss / expired entry """
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, model: str):
+        raise NotImplementedError
+
+    def invalidate(self, model: Optional[str] = None):
+        raise NotImplementedError
+
+    def _usage(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+    # ────────────────────────────────────────────────
+    # STATS
+    # ────────────────────────────────────────────────
+    def _record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            **self._usage(),
+        }
+
+
+# ────────────────────────────────────────────────
+# IN-PROCESS LRU + TTL
+# ────────────────────────────────────────────────
+class MemoryCache(PredictionCache):
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        super().__init__(max_bytes, ttl_seconds)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()   # key → (expires_at, model, size, blob)
+        self._bytes = 0
+
+    def get(self, key: str, model: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self._drop(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        self._record(entry is not None)
+        return pickle.loads(entry[3]) if entry is not None else None
+
+    def set(self, key: str, value: Any, model: str):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        size = len(blob) + len(key)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, model, size, blob)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, model: Optional[str] = None):
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if model is None or e[1] == model]:
+                self._drop(key)
+
+    def _drop(self, key: str):
+        self._bytes -= self._entries.pop(key)[2]
+
+    def _usage(self):
+        return {"entries": len(self._entries), "bytes": self._bytes}
+
+
+# ────────────────────────────────────────────────
+# LOCAL DISK (one pickle per entry, grouped by model)
+# Survives restarts and can be shared by workers on one host.
+# ────────────────────────────────────────────────
+class DiskCache(PredictionCache):
+
+    def __init__(self, directory: str, max_bytes: int, ttl_seconds: float):
+        super().__init__(max_bytes, ttl_seconds)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._bytes = sum(os.path.getsize(p) for p in self._files())
+
+    def _path(self, key: str, model: str) -> str:
+        return os.path.join(self.directory, model, f"{key}.pkl")
+
+    def _files(self):
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".pkl"):
+                    yield os.path.join(root, name)
+
+    def get(self, key: str, model: str) -> Optional[Any]:
+        path = self._path(key, model)
+        value = None
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                self._remove(path)
+            else:
+                with open(path, "rb") as f:
+                    value = pickle.load(f)
+                os.utime(path)   # refresh recency for LRU eviction
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Dropping unreadable cache entry {path}: {e}")
+            self._remove(path)
+        self._record(value is not None)
+        return value
+
+    def set(self, key: str, value: Any, model: str):
+        path = self._path(key, model)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            try:
+                previous = os.path.getsize(path)   # overwritten entry no longer counts
+            except OSError:
+                previous = 0
+            os.replace(tmp, path)
+            self._bytes += os.path.getsize(path) - previous
+        if self._bytes > self.max_bytes:
+            self._evict()
+
+    def invalidate(self, model: Optional[str] = None):
+        targets = [model] if model else os.listdir(self.directory)
+        for name in targets:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+        with self._lock:
+            self._bytes = sum(os.path.getsize(p) for p in self._files())
+
+    def _evict(self):
+        files = sorted(self._files(), key=os.path.getmtime)
+        for path in files:
+            if self._bytes <= self.max_bytes:
+                break
+            self._remove(path)
+            self.evictions += 1
+
+    def _remove(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._bytes -= size
+
+    def _usage(self):
+        return {"entries": sum(1 for _ in self._files()), "bytes": self._bytes}
+
+
+# ────────────────────────────────────────────────
+# FACTORY
+# ────────────────────────────────────────────────
+def build_cache(settings) -> Optional[PredictionCache]:
+    backend = settings.CACHE_BACKEND
+    if backend == "memory":
+        return MemoryCache(settings.CACHE_MAX_BYTES, settings.CACHE_TTL_SECONDS)
+    if backend == "disk":
+        directory = settings.CACHE_DIR
+        if not os.path.isabs(directory):
+            directory = os.path.join(settings.BASE_DIR, directory)
+        return DiskCache(directory, settings.CACHE_MAX_BYTES, settings.CACHE_TTL_SECONDS)
+    if backend == "none":
+        return None
+    raise ValueError("Invalid CACHE_BACKEND, choose 'memory', 'disk' or 'none'")
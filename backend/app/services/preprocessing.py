@@ -1,9 +1,40 @@
-import pandas as pd
+"""
+preprocessing.py
+----------------
+Cleaning, feature engineering and scaling for the training pipelines.
+
+Out-of-core run over a CSV / Parquet file (from the backend directory):
+    python -m app.services.preprocessing input.csv output.csv state.pkl [--chunksize 100000] [--scaler minmax]
+fits the imputer + scaler chunk by chunk, writes the transformed chunks and
+persists the fitted state (Preprocessor.load(state.pkl) restores it).
+"""
+
+import os
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler, StandardScaler
-from sklearn.impute import SimpleImputer
-from typing import Tuple, Optional
+from typing import Iterator, Tuple, Optional, TYPE_CHECKING
 import logging
+from app.services.sequence_stream import sequence_windows
+
+if TYPE_CHECKING:   # pandas / scikit-learn are imported on first use
+    import pandas as pd
+
+
+# Rows of the previous chunk prepended to the next one so rolling features
+# (longest window: ma_10) and pct_change continue across chunk boundaries
+CARRY_ROWS = 10
+
+
+def iter_chunks(path: str, chunksize: int) -> Iterator["pd.DataFrame"]:
+    """
+    Reads a CSV or Parquet file as DataFrames of at most `chunksize` rows.
+    """
+    if path.endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq   # optional: only needed for Parquet input
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+        yield from pd.read_csv(path, chunksize=chunksize)
 
 
 class Preprocessor:
@@ -12,12 +43,18 @@ class Preprocessor:
     - Feature engineering
     - Scaling
     - Handling missing values
+
+    process() works on an in-memory DataFrame; fit_chunked() /
+    transform_chunked() run the same pipeline out of core.
     """
 
     def __init__(self, scaler_type: str = "minmax"):
         """
         scaler_type: 'minmax' or 'standard'
         """
+        from sklearn.preprocessing import MinMaxScaler, StandardScaler
+        from sklearn.impute import SimpleImputer
+
         self.scaler_type = scaler_type
         self.scaler = None
 
@@ -28,13 +65,15 @@ class Preprocessor:
         else:
             raise ValueError("Invalid scaler_type, choose 'minmax' or 'standard'")
 
-        self.imputer = SimpleImputer(strategy="mean")
+        # Columns with no observed value are filled with 0 rather than dropped,
+        # so transform() keeps the input's shape (fit_chunked relies on it)
+        self.imputer = SimpleImputer(strategy="mean", keep_empty_features=True)
         logging.info(f"Preprocessor initialized with {scaler_type} scaler.")
 
     # ────────────────────────────────────────────────
     # CLEAN DATA
     # ────────────────────────────────────────────────
-    def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    def clean_data(self, df: "pd.DataFrame") -> "pd.DataFrame":
         """
         Fills missing values and removes duplicates.
         """
@@ -46,7 +85,7 @@ class Preprocessor:
     # ────────────────────────────────────────────────
     # FEATURE ENGINEERING
     # ────────────────────────────────────────────────
-    def engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def engineer_features(self, df: "pd.DataFrame") -> "pd.DataFrame":
         """
         Creates derived features commonly used for stock prediction.
         Example: Returns, moving averages, volatility
@@ -62,8 +101,8 @@ class Preprocessor:
 
         # Rolling features
         if "close" in df.columns:
-            df["ma_5"] = df["close"].rolling(window=5).mean().fillna(method="bfill")
-            df["ma_10"] = df["close"].rolling(window=10).mean().fillna(method="bfill")
+            df["ma_5"] = df["close"].rolling(window=5).mean().bfill()
+            df["ma_10"] = df["close"].rolling(window=10).mean().bfill()
             df["volatility_5"] = df["close"].rolling(window=5).std().fillna(0)
 
         return df
@@ -71,7 +110,7 @@ class Preprocessor:
     # ────────────────────────────────────────────────
     # SCALE FEATURES
     # ────────────────────────────────────────────────
-    def scale_features(self, df: pd.DataFrame, fit: bool = True) -> pd.DataFrame:
+    def scale_features(self, df: "pd.DataFrame", fit: bool = True) -> "pd.DataFrame":
         """
         Scales numeric features using the chosen scaler
         """
@@ -89,8 +128,8 @@ class Preprocessor:
     # FULL PIPELINE
     # ────────────────────────────────────────────────
     def process(
-        self, df: pd.DataFrame, fit_scaler: bool = True
-    ) -> pd.DataFrame:
+        self, df: "pd.DataFrame", fit_scaler: bool = True
+    ) -> "pd.DataFrame":
         """
         Clean, engineer, and scale data in one step
         """
@@ -99,21 +138,122 @@ class Preprocessor:
         df = self.scale_features(df, fit=fit_scaler)
         return df
 
+    # ────────────────────────────────────────────────
+    # CHUNKED (OUT-OF-CORE) PIPELINE
+    # Peak memory is one chunk plus CARRY_ROWS rows.
+    # Only numeric columns are used; duplicates are
+    # dropped within each chunk only.
+    # ────────────────────────────────────────────────
+    def fit_chunked(self, path: str, chunksize: int = 100_000) -> "Preprocessor":
+        """
+        Fits the imputer and scaler over a CSV / Parquet file in two passes:
+        1. running column means → mean imputer
+        2. impute + engineer features → scaler.partial_fit
+        """
+        import pandas as pd
+
+        sums, counts = None, None
+        for chunk in self._read_chunks(path, chunksize):
+            sums = chunk.sum() if sums is None else sums.add(chunk.sum(), fill_value=0)
+            counts = chunk.count() if counts is None else counts.add(chunk.count(), fill_value=0)
+        if sums is None:
+            raise ValueError(f"No rows in {path}")
+
+        # A one-row fit sets statistics_ to exactly the running means
+        self.imputer.fit(pd.DataFrame([sums / counts]))
+
+        for features in self._engineered_chunks(path, chunksize):
+            self.scaler.partial_fit(features.select_dtypes(include=np.number))
+
+        logging.info(f"Preprocessor fitted out of core on {int(counts.max())} rows of {path}")
+        return self
+
+    def transform_chunked(self, path: str, output_path: str, chunksize: int = 100_000) -> int:
+        """
+        Second pass: impute, engineer and scale every chunk with the fitted
+        state and append it to `output_path` (CSV, or Parquet by extension).
+        Returns the number of rows written.
+        """
+        parquet = output_path.endswith((".parquet", ".pq"))
+        writer, rows = None, 0
+
+        for features in self._engineered_chunks(path, chunksize):
+            scaled = self.scale_features(features, fit=False)
+            if parquet:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(scaled, preserve_index=False)
+                writer = writer or pq.ParquetWriter(output_path, table.schema)
+                writer.write_table(table)
+            else:
+                scaled.to_csv(output_path, mode="a" if rows else "w", header=not rows, index=False)
+            rows += len(scaled)
+
+        if writer is not None:
+            writer.close()
+        return rows
+
+    def _read_chunks(self, path: str, chunksize: int) -> Iterator["pd.DataFrame"]:
+        # Non-numeric columns (dates, tickers) cannot be imputed or scaled
+        for chunk in iter_chunks(path, chunksize):
+            yield chunk.select_dtypes(include=np.number).drop_duplicates()
+
+    def _engineered_chunks(self, path: str, chunksize: int) -> Iterator["pd.DataFrame"]:
+        import pandas as pd
+
+        carry = None
+        for chunk in self._read_chunks(path, chunksize):
+            chunk = pd.DataFrame(self.imputer.transform(chunk), columns=chunk.columns, index=chunk.index)
+
+            frame = chunk if carry is None else pd.concat([carry, chunk])
+            features = self.engineer_features(frame)
+            yield features.iloc[len(frame) - len(chunk):]
+
+            carry = chunk.iloc[-CARRY_ROWS:]
+
+    # ────────────────────────────────────────────────
+    # PERSISTED STATE (FITTED IMPUTER + SCALER)
+    # ────────────────────────────────────────────────
+    def save(self, path: str):
+        import joblib
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        joblib.dump(
+            {"scaler_type": self.scaler_type, "imputer": self.imputer, "scaler": self.scaler}, path
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "Preprocessor":
+        import joblib
+        state = joblib.load(path)
+        pre = cls(state["scaler_type"])
+        pre.imputer, pre.scaler = state["imputer"], state["scaler"]
+        return pre
+
     # ────────────────────────────────────────────────
     # SEQUENCE CREATION FOR LSTM
     # ────────────────────────────────────────────────
-    def create_sequences(self, data: pd.DataFrame, seq_length: int, target_col: str) -> Tuple[np.ndarray, np.ndarray]:
+    def create_sequences(self, data: "pd.DataFrame", seq_length: int, target_col: str) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Converts DataFrame to sequences for LSTM training
+        Converts DataFrame to sequences for LSTM training.
+        Returns read-only sliding-window views (no copy); use
+        SequenceBatchStream for shuffled mini-batches.
         """
-        sequences = []
-        targets = []
-        values = data[target_col].values
+        return sequence_windows(data[target_col].values, seq_length)
+
+
+if __name__ == "__main__":
+    import argparse
 
-        for i in range(len(values) - seq_length):
-            seq = values[i:i+seq_length]
-            label = values[i+seq_length]
-            sequences.append(seq)
-            targets.append(label)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("state")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--scaler", default="minmax", choices=["minmax", "standard"])
+    args = parser.parse_args()
 
-        return np.array(sequences).reshape(-1, seq_length, 1), np.array(targets)
+    logging.basicConfig(level=logging.INFO)
+    pre = Preprocessor(args.scaler).fit_chunked(args.input, args.chunksize)
+    rows = pre.transform_chunked(args.input, args.output, args.chunksize)
+    pre.save(args.state)
+    logging.info(f"Wrote {rows} rows to {args.output}; fitted state saved to {args.state}")
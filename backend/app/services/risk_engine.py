@@ -1,7 +1,7 @@
-import os
 import numpy as np
-import joblib
+from typing import Dict, Optional
 from app.config import Settings
+from app.services.model_registry import ModelRegistry
 import logging
 
 
@@ -11,32 +11,31 @@ class RiskEngine:
     Calculates risk score for stocks/events based on features and optional ML model.
     """
 
-    def __init__(self, settings: Settings):
+    # Registry artifacts this engine reads (reported by EngineContainer)
+    ARTIFACTS = ("risk_model", "scaler")
+
+    def __init__(self, settings: Settings, registry: Optional[ModelRegistry] = None, state=None):
+        """
+        registry: shared artifact registry; the scaler is the same instance
+                  the other engines use
+        state:    optional RiskStateStore with live per-ticker inputs,
+                  used by predict_from_state()
+        """
         self.settings = settings
-        self.model_dir = os.path.join(settings.BASE_DIR, "app", "models")
-        self.model = None
-        self.scaler = None
-        self._load_model()
+        self.registry = registry or ModelRegistry(settings)
+        self.state = state
         logging.info("RiskEngine initialized.")
 
     # ────────────────────────────────────────────────
-    # LOAD ML MODEL IF AVAILABLE
+    # ML MODEL + SCALER (resolved through the registry, None if missing)
     # ────────────────────────────────────────────────
-    def _load_model(self):
-        try:
-            model_path = os.path.join(self.model_dir, "risk_model.pkl")
-            scaler_path = os.path.join(self.model_dir, "scaler.pkl")
-
-            if os.path.exists(model_path):
-                self.model = joblib.load(model_path)
-
-            if os.path.exists(scaler_path):
-                self.scaler = joblib.load(scaler_path)
+    @property
+    def model(self):
+        return self.registry.get("risk_model")
 
-        except Exception as e:
-            logging.warning(f"Could not load risk model: {e}")
-            self.model = None
-            self.scaler = None
+    @property
+    def scaler(self):
+        return self.registry.get("scaler")
 
     # ────────────────────────────────────────────────
     # PREDICT RISK SCORE
@@ -51,18 +50,9 @@ class RiskEngine:
         """
         Returns risk score and risk category
         """
-
-        features = np.array([volatility, sentiment, liquidity, event_severity]).reshape(1, -1)
-
-        if self.model and self.scaler:
-            scaled_features = self.scaler.transform(features)
-            score = float(self.model.predict(scaled_features)[0])
-        else:
-            # Fallback rule-based calculation
-            score = 0.4 * volatility - 0.3 * sentiment + 0.2 * liquidity + 0.1 * event_severity
-            score = max(0, min(1, score))  # normalize to [0,1]
-
-        category = self._risk_category(score)
+        batch = self.predict_batch([volatility], [sentiment], [liquidity], [event_severity])
+        score = float(batch["risk_score"][0])
+        category = str(batch["risk_category"][0])
 
         return {
             "risk_score": round(score, 3),
@@ -76,13 +66,100 @@ class RiskEngine:
             "explanation": f"The calculated risk is {category} based on the given inputs."
         }
 
+    # ────────────────────────────────────────────────
+    # SCORE FROM LIVE TICKER STATE
+    # ────────────────────────────────────────────────
+    def predict_from_state(
+        self,
+        ticker: str,
+        sentiment: float = 0.0,
+        event_severity: float = 0.0
+    ) -> dict:
+        """
+        Like predict(), with volatility and liquidity taken from the live
+        EWMA state of `ticker` (KeyError if no ticks were received for it).
+        """
+        if self.state is None or ticker not in self.state:
+            raise KeyError(f"No live risk state for {ticker}")
+        live = self.state.features(ticker)
+        result = self.predict(live["volatility"], sentiment, live["liquidity"], event_severity)
+        result["live_state"] = live
+        return result
+
+    # ────────────────────────────────────────────────
+    # VECTORIZED PORTFOLIO SCORING
+    # ────────────────────────────────────────────────
+    def predict_batch(
+        self,
+        volatility,
+        sentiment,
+        liquidity,
+        event_severity=None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Scores N instruments given as column arrays.
+        Returns {"risk_score": float array, "risk_category": str array}.
+        """
+        volatility = np.asarray(volatility, dtype=float)
+        n = len(volatility)
+        columns = (
+            volatility,
+            np.asarray(sentiment, dtype=float),
+            np.asarray(liquidity, dtype=float),
+            np.zeros(n) if event_severity is None else np.asarray(event_severity, dtype=float),
+        )
+        if any(len(c) != n for c in columns):
+            raise ValueError("All risk input columns must have the same length")
+
+        model, scaler = self.model, self.scaler
+        if model is not None and scaler is not None:
+            scores = np.empty(n)
+            # Bounded temporaries: the (chunk, 4) feature matrix is reused per chunk
+            features = np.empty((min(n, BATCH_CHUNK_ROWS), 4))
+            for start in range(0, n, BATCH_CHUNK_ROWS):
+                stop = min(start + BATCH_CHUNK_ROWS, n)
+                block = features[:stop - start]
+                for j, column in enumerate(columns):
+                    block[:, j] = column[start:stop]
+                scores[start:stop] = model.predict(scaler.transform(block))
+        else:
+            scores = rule_based_score(*columns)
+
+        return {"risk_score": scores, "risk_category": risk_categories(scores)}
+
     # ────────────────────────────────────────────────
     # RISK CATEGORY
     # ────────────────────────────────────────────────
     def _risk_category(self, score: float) -> str:
-        if score >= 0.7:
-            return "High Risk"
-        elif score >= 0.4:
-            return "Medium Risk"
-        else:
-            return "Low Risk"
+        return str(risk_categories(np.array([score]))[0])
+
+
+# ────────────────────────────────────────────────
+# VECTORIZED HELPERS
+# ────────────────────────────────────────────────
+BATCH_CHUNK_ROWS = 65536
+
+# Lower bounds of Medium / High risk; labels indexed by searchsorted
+CATEGORY_THRESHOLDS = np.array([0.4, 0.7])
+CATEGORY_LABELS = np.array(["Low Risk", "Medium Risk", "High Risk"])
+
+
+def rule_based_score(volatility, sentiment, liquidity, event_severity) -> np.ndarray:
+    """
+    Fallback formula, clipped to [0, 1]
+    """
+    score = 0.4 * volatility - 0.3 * sentiment + 0.2 * liquidity + 0.1 * event_severity
+    return np.clip(score, 0.0, 1.0, out=score)
+
+
+def risk_categories(scores: np.ndarray) -> np.ndarray:
+    return CATEGORY_LABELS[np.searchsorted(CATEGORY_THRESHOLDS, scores, side="right")]
+
+
+def liquidity_risk(price, volume) -> np.ndarray:
+    """
+    Illiquidity in [0, 1] from traded value: ~1 for almost no turnover,
+    0 from 10^10 (price x volume) upward.
+    """
+    traded = np.asarray(price, dtype=float) * np.asarray(volume, dtype=float)
+    return 1.0 - np.clip(np.log10(1.0 + np.maximum(traded, 0.0)) / 10.0, 0.0, 1.0)
@@ -0,0 +1,149 @@
+"""
+risk_state.py
+-------------
+Live per-ticker risk state updated from a price / volume feed:
+
+- EWMA variance of log returns (RiskMetrics, decay LAMBDA) → volatility
+- EWMA traded volume → illiquidity via risk_engine.liquidity_risk
+- running peak price → current and maximum drawdown
+
+Every field is one column of a preallocated float64 array (row per ticker,
+grown by doubling), so a tick is O(1) and 10k tickers take well under 1 MB
+of state plus the ticker → row index. snapshot() / load() persist the
+arrays as one .npz for a fast restart.
+"""
+
+import os
+import math
+import time
+import logging
+import threading
+from typing import Dict, Optional, Sequence
+import numpy as np
+from app.services.risk_engine import liquidity_risk
+
+
+FIELDS = ("price", "ewma_var", "ewma_volume", "peak", "max_drawdown", "ticks", "updated_at")
+_COL = {name: i for i, name in enumerate(FIELDS)}
+
+
+class RiskStateStore:
+    def __init__(self, decay: float = 0.94, capacity: int = 1024):
+        self.decay = decay
+        self._data = np.zeros((capacity, len(FIELDS)))
+        self._rows: Dict[str, int] = {}
+        self._tickers = []
+        self._lock = threading.Lock()
+        self._autosaver = None
+
+    # ────────────────────────────────────────────────
+    # O(1) TICK UPDATE
+    # ────────────────────────────────────────────────
+    def update(self, ticker: str, price: float, volume: Optional[float] = None, timestamp: Optional[float] = None):
+        if price <= 0:
+            raise ValueError("price must be positive")
+        with self._lock:
+            row = self._rows.get(ticker)
+            if row is None:
+                row = self._add(ticker)
+                r = self._data[row]
+                r[_COL["peak"]] = price
+                r[_COL["ewma_volume"]] = volume or 0.0
+            else:
+                r = self._data[row]
+                log_ret = math.log(price / r[_COL["price"]])
+                r[_COL["ewma_var"]] = self.decay * r[_COL["ewma_var"]] + (1 - self.decay) * log_ret * log_ret
+                if volume is not None:
+                    r[_COL["ewma_volume"]] = self.decay * r[_COL["ewma_volume"]] + (1 - self.decay) * volume
+
+            r[_COL["price"]] = price
+            r[_COL["peak"]] = max(r[_COL["peak"]], price)
+            r[_COL["max_drawdown"]] = max(r[_COL["max_drawdown"]], 1.0 - price / r[_COL["peak"]])
+            r[_COL["ticks"]] += 1
+            r[_COL["updated_at"]] = timestamp if timestamp is not None else time.time()
+
+    def _add(self, ticker: str) -> int:
+        row = len(self._tickers)
+        if row == len(self._data):
+            grown = np.zeros((2 * len(self._data), len(FIELDS)))
+            grown[:row] = self._data
+            self._data = grown
+        self._rows[ticker] = row
+        self._tickers.append(ticker)
+        return row
+
+    # ────────────────────────────────────────────────
+    # READS (SCALAR + VECTORIZED)
+    # ────────────────────────────────────────────────
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._rows
+
+    def __len__(self) -> int:
+        return len(self._tickers)
+
+    def features(self, ticker: str) -> Dict[str, float]:
+        batch = self.features_many([ticker])
+        return {k: float(v[0]) for k, v in batch.items()}
+
+    def features_many(self, tickers: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Risk inputs for many tickers as column arrays (KeyError if one is unknown).
+        """
+        missing = [t for t in tickers if t not in self._rows]
+        if missing:
+            raise KeyError(f"No live risk state for {missing}")
+        with self._lock:
+            rows = self._data[[self._rows[t] for t in tickers]]
+        price, peak = rows[:, _COL["price"]], rows[:, _COL["peak"]]
+        return {
+            "volatility": np.sqrt(rows[:, _COL["ewma_var"]]),
+            "liquidity": liquidity_risk(price, rows[:, _COL["ewma_volume"]]),
+            "drawdown": 1.0 - price / peak,
+            "max_drawdown": rows[:, _COL["max_drawdown"]],
+            "price": price,
+            "ticks": rows[:, _COL["ticks"]],
+        }
+
+    def nbytes(self) -> int:
+        return self._data[:len(self._tickers)].nbytes
+
+    # ────────────────────────────────────────────────
+    # SNAPSHOT / RESTORE
+    # ────────────────────────────────────────────────
+    def snapshot(self, path: str):
+        with self._lock:
+            data = self._data[:len(self._tickers)].copy()
+            tickers = np.array(self._tickers, dtype=str)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp.npz"
+        np.savez(tmp, data=data, tickers=tickers, fields=np.array(FIELDS), decay=self.decay)
+        os.replace(tmp, path)
+
+    def autosave(self, path: str, interval_s: float):
+        """ Snapshots to `path` every `interval_s` seconds in a background thread """
+        if self._autosaver is not None or interval_s <= 0:
+            return
+
+        def _run():
+            while True:
+                time.sleep(interval_s)
+                try:
+                    if len(self):
+                        self.snapshot(path)
+                except Exception as e:
+                    logging.warning(f"Risk state snapshot failed: {e}")
+
+        self._autosaver = threading.Thread(target=_run, name="risk-state-autosave", daemon=True)
+        self._autosaver.start()
+
+    @classmethod
+    def load(cls, path: str, decay: Optional[float] = None) -> "RiskStateStore":
+        with np.load(path) as saved:
+            if tuple(saved["fields"]) != FIELDS:
+                raise ValueError(f"Incompatible risk state snapshot: {path}")
+            data, tickers = saved["data"], saved["tickers"].tolist()
+            store = cls(decay if decay is not None else float(saved["decay"]), capacity=max(len(tickers), 1024))
+        store._data[:len(tickers)] = data
+        store._tickers = tickers
+        store._rows = {t: i for i, t in enumerate(tickers)}
+        return store
@@ -0,0 +1,114 @@
+"""
+sequence_stream.py
+------------------
+LSTM training windows without materializing them.
+
+`sequence_windows` returns (X, y) as strided views over the price array,
+so no memory is allocated for the seq_length-times-larger window matrix.
+`SequenceBatchStream` yields shuffled mini-batches from one or more
+(memory-mapped) price arrays; only the rows of the current block are read
+from disk and only the current batch is copied. `as_tf_dataset()` wraps
+it for `model.fit`, so datasets larger than RAM can be trained on.
+"""
+
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sequence_windows(values: np.ndarray, seq_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Zero-copy (X, y) for next-value prediction:
+        X[i] = values[i : i + seq_length]   shape (n - seq_length, seq_length, 1)
+        y[i] = values[i + seq_length]       shape (n - seq_length,)
+    Both are read-only views of `values`.
+    """
+    values = np.asarray(values)
+    if len(values) <= seq_length:
+        empty = values[:0]
+        return empty.reshape(0, seq_length, 1), empty
+    X = sliding_window_view(values[:-1], seq_length)[..., np.newaxis]
+    return X, values[seq_length:]
+
+
+class SequenceBatchStream:
+    """
+    Shuffled (X, y) mini-batches over one or more price series.
+
+    Windows never cross series boundaries (one series per ticker). Shuffling
+    is two-level so disk reads stay sequential: the order of contiguous blocks
+    of windows is shuffled, then the windows inside each block.
+    """
+
+    def __init__(
+        self,
+        series: Sequence[np.ndarray],
+        seq_length: int,
+        batch_size: int = 256,
+        block_batches: int = 64,
+        shuffle: bool = True,
+        seed: Optional[int] = None,
+        dtype=np.float32
+    ):
+        """
+        series: 1-D arrays (typically np.load(..., mmap_mode="r"))
+        block_batches: batches per shuffle block (bounds memory per block)
+        """
+        self.series = [s for s in series if len(s) > seq_length]
+        self.seq_length = seq_length
+        self.batch_size = batch_size
+        self.block_size = batch_size * block_batches
+        self.shuffle = shuffle
+        self.dtype = dtype
+        self._rng = np.random.default_rng(seed)
+
+        # (series index, first window, window count) per block
+        self._blocks: List[Tuple[int, int, int]] = []
+        for s, values in enumerate(self.series):
+            n_windows = len(values) - seq_length
+            for start in range(0, n_windows, self.block_size):
+                self._blocks.append((s, start, min(self.block_size, n_windows - start)))
+
+    @classmethod
+    def from_npy(cls, paths: Union[str, Sequence[str]], seq_length: int, **kwargs) -> "SequenceBatchStream":
+        """
+        Memory-maps one .npy file per series; nothing is read until iteration.
+        """
+        paths = [paths] if isinstance(paths, str) else paths
+        return cls([np.load(p, mmap_mode="r") for p in paths], seq_length, **kwargs)
+
+    @property
+    def n_windows(self) -> int:
+        return sum(count for _, _, count in self._blocks)
+
+    def __len__(self) -> int:
+        """ Batches per epoch (a short batch closes each block) """
+        return sum(-(-count // self.batch_size) for _, _, count in self._blocks)
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        order = self._rng.permutation(len(self._blocks)) if self.shuffle else range(len(self._blocks))
+        for b in order:
+            s, start, count = self._blocks[b]
+            # One sequential read covering every window of the block
+            values = np.asarray(self.series[s][start:start + count + self.seq_length], dtype=self.dtype)
+            X, y = sequence_windows(values, self.seq_length)
+
+            idx = self._rng.permutation(count) if self.shuffle else np.arange(count)
+            for i in range(0, count, self.batch_size):
+                batch = idx[i:i + self.batch_size]
+                yield X[batch], y[batch]
+
+    def as_tf_dataset(self, prefetch: bool = True):
+        """
+        tf.data.Dataset over the stream (a fresh shuffle every epoch).
+        """
+        import tensorflow as tf
+
+        dataset = tf.data.Dataset.from_generator(
+            self.__iter__,
+            output_signature=(
+                tf.TensorSpec(shape=(None, self.seq_length, 1), dtype=tf.as_dtype(self.dtype)),
+                tf.TensorSpec(shape=(None,), dtype=tf.as_dtype(self.dtype)),
+            ),
+        ).apply(tf.data.experimental.assert_cardinality(len(self)))
+        return dataset.prefetch(tf.data.AUTOTUNE) if prefetch else dataset
@@ -0,0 +1,205 @@
+import time
+import inspect
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Sequence
+import numpy as np
+
+
+MIN_OVERLAP = 5   # matching observations needed to treat a window as a continuation
+
+
+@dataclass
+class TickerState:
+    results: object                 # statsmodels MLEResults holding the filtered state
+    tail: np.ndarray                # last observations seen (for window alignment)
+    history: deque                  # bounded history used by background refits
+    observed: int = 0               # total observations absorbed
+    updated_at: float = field(default_factory=time.time)
+
+
+def _new_observations(tail: np.ndarray, window: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Returns the part of `window` that comes after the stored `tail`,
+    an empty array if nothing is new, or None when the window does not
+    overlap the tail (a gap → the state must be rebuilt).
+    """
+    longest = min(len(tail), len(window))
+    needed = min(MIN_OVERLAP, len(window))
+    for m in range(longest, needed - 1, -1):
+        if np.array_equal(window[:m], tail[-m:]):
+            return window[m:]
+    return None
+
+
+class StateSpaceStore:
+    """
+    Per-ticker ARIMA / SARIMA state on top of one fitted base model.
+
+    A ticker's state starts as the base parameters applied to its first
+    window (a Kalman filter pass, no fit). Later windows only push their new
+    observations through `results.extend(...)`, which costs milliseconds.
+    A background thread periodically refits each ticker on its recent
+    history and swaps the new state in atomically.
+    """
+
+    def __init__(
+        self,
+        family: str,
+        base_results: Callable[[str], object],
+        history_size: int = 2000,
+        refit_interval_s: float = 0.0
+    ):
+        """
+        base_results: returns the fitted base results for a ticker (resolved
+                      per call so per-ticker and reloaded models are picked up)
+        """
+        self.family = family
+        self.base_results = base_results
+        self.history_size = history_size
+        self.refit_interval_s = refit_interval_s
+
+        self._states: Dict[str, TickerState] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._generation = 0            # bumped by reset(); older states are never written back
+        self._refit_thread = None
+
+    # ────────────────────────────────────────────────
+    # FORECAST FROM (UPDATED) TICKER STATE
+    # ────────────────────────────────────────────────
+    def forecast(self, ticker: str, data: Sequence[float], steps: int) -> np.ndarray:
+        window = np.asarray(data, dtype=float)
+        with self._lock_for(ticker):
+            generation = self._generation
+            state = self._states.get(ticker)
+            new = _new_observations(state.tail, window) if state is not None else None
+
+            if new is None:
+                state = self._initial_state(ticker, window)
+            elif len(new):
+                state = self._extend(state, new)
+
+            self._store(ticker, state, generation)
+
+        self._ensure_refit_loop()
+        return np.asarray(state.results.forecast(steps=steps), dtype=float).reshape(-1)
+
+    def observe(self, ticker: str, values: Sequence[float]):
+        """
+        Pushes new observations (e.g. a live bar) into an existing ticker state.
+        """
+        new = np.asarray(values, dtype=float).reshape(-1)
+        with self._lock_for(ticker):
+            generation = self._generation
+            state = self._states.get(ticker)
+            self._store(
+                ticker,
+                self._initial_state(ticker, new) if state is None else self._extend(state, new),
+                generation
+            )
+
+    def tickers(self):
+        return list(self._states)
+
+    def reset(self):
+        """
+        Drops every ticker state, e.g. after the base model was reloaded.
+        Forecasts / refits already running on an old state finish, but
+        their state is not written back.
+        """
+        with self._locks_guard:
+            self._generation += 1
+            self._states.clear()
+
+    def _store(self, ticker: str, state: TickerState, generation: int):
+        """ Keeps `state` unless reset() ran since it was read (it was built on the old base model) """
+        with self._locks_guard:
+            if self._generation == generation:
+                self._states[ticker] = state
+
+    # ────────────────────────────────────────────────
+    # STATE TRANSITIONS
+    # ────────────────────────────────────────────────
+    def _initial_state(self, ticker: str, window: np.ndarray) -> TickerState:
+        base = self.base_results(ticker)
+        if base is None:
+            raise RuntimeError(f"{self.family.upper()} model not loaded")
+
+        results = base.apply(window, refit=False) if hasattr(base, "apply") else base
+        history = deque(window, maxlen=self.history_size)
+        return TickerState(results=results, tail=window, history=history, observed=len(window))
+
+    def _extend(self, state: TickerState, new: np.ndarray) -> TickerState:
+        results = state.results.extend(new) if hasattr(state.results, "extend") else state.results
+        state.history.extend(new)
+        tail = np.concatenate([state.tail, new])[-max(len(state.tail), len(new), MIN_OVERLAP):]
+        return TickerState(
+            results=results,
+            tail=tail,
+            history=state.history,
+            observed=state.observed + len(new),
+        )
+
+    def _lock_for(self, ticker: str) -> threading.Lock:
+        lock = self._locks.get(ticker)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.setdefault(ticker, threading.Lock())
+        return lock
+
+    # ────────────────────────────────────────────────
+    # BACKGROUND REFIT + ATOMIC SWAP
+    # ────────────────────────────────────────────────
+    def refit(self, ticker: str):
+        """
+        Re-estimates the parameters on the ticker's recent history
+        (warm-started from the current ones) and swaps the state in.
+        """
+        with self._lock_for(ticker):
+            generation = self._generation
+            state = self._states.get(ticker)
+            if state is None or not hasattr(state.results, "model"):
+                return
+            snapshot = np.asarray(state.history, dtype=float)
+            seen = state.observed
+
+        model = state.results.model.clone(snapshot)
+        fit_kwargs = {"disp": False} if "disp" in inspect.signature(model.fit).parameters else {}
+        refitted = model.fit(start_params=state.results.params, **fit_kwargs)
+
+        with self._lock_for(ticker):
+            current = self._states.get(ticker)
+            if current is None:
+                return
+            # Observations that arrived while fitting are replayed on the new state
+            missed = current.observed - seen
+            if missed > 0:
+                refitted = refitted.extend(np.asarray(current.history, dtype=float)[-missed:])
+            self._store(ticker, TickerState(
+                results=refitted,
+                tail=current.tail,
+                history=current.history,
+                observed=current.observed,
+            ), generation)
+
+    def _ensure_refit_loop(self):
+        if self.refit_interval_s <= 0 or self._refit_thread is not None:
+            return
+        with self._locks_guard:
+            if self._refit_thread is None:
+                self._refit_thread = threading.Thread(
+                    target=self._refit_loop, name=f"{self.family}-refit", daemon=True
+                )
+                self._refit_thread.start()
+
+    def _refit_loop(self):
+        while True:
+            time.sleep(self.refit_interval_s)
+            for ticker in self.tickers():
+                try:
+                    self.refit(ticker)
+                except Exception as e:
+                    logging.warning(f"{self.family} refit failed for {ticker}: {e}")
@@ -0,0 +1,133 @@
+"""
+streaming_features.py
+---------------------
+Incremental version of Preprocessor.engineer_features for live ticks.
+
+Each ticker keeps a fixed-size ring buffer of its last closes plus running
+sums / sums of squares, so a tick updates return, log_return, volume_change,
+ma_5, ma_10 and volatility_5 in constant time, independent of history length.
+
+Differences from the batch Preprocessor (by construction, not precision):
+- ma_5 / ma_10 are None until their window is full; the batch path
+  back-fills those rows from future values, which a stream cannot know.
+- Everything else matches from the first tick (volatility_5 is 0 until
+  five closes have been seen, like the batch fillna(0)).
+
+Parity with the batch Preprocessor is checked in tests/test_streaming_features.py.
+"""
+
+import math
+import threading
+from typing import Dict, Optional
+
+
+MA_WINDOWS = (5, 10)
+VOLATILITY_WINDOW = 5
+CAPACITY = max(max(MA_WINDOWS), VOLATILITY_WINDOW)
+
+# Running sums are recomputed from the ring every RESYNC_EVERY ticks so
+# floating-point drift from add/subtract never accumulates (amortized O(1))
+RESYNC_EVERY = 1024
+
+
+class _TickerState:
+    __slots__ = ("anchor", "ring", "count", "sums", "sumsq", "prev_close", "prev_volume", "features")
+
+    def __init__(self, anchor: float):
+        # Values are stored relative to the first close to limit cancellation
+        self.anchor = anchor
+        self.ring = [0.0] * CAPACITY
+        self.count = 0
+        self.sums = {w: 0.0 for w in MA_WINDOWS}
+        self.sumsq = 0.0
+        self.prev_close: Optional[float] = None
+        self.prev_volume: Optional[float] = None
+        self.features: Dict[str, Optional[float]] = {}
+
+
+class StreamingFeatureEngine:
+    """
+    Per-ticker O(1) feature updates; thread-safe.
+    """
+
+    def __init__(self):
+        self._states: Dict[str, _TickerState] = {}
+        self._lock = threading.Lock()
+
+    # ────────────────────────────────────────────────
+    # TICK UPDATE
+    # ────────────────────────────────────────────────
+    def update(self, ticker: str, close: float, volume: Optional[float] = None) -> Dict[str, Optional[float]]:
+        with self._lock:
+            state = self._states.get(ticker)
+            if state is None:
+                state = self._states[ticker] = _TickerState(close)
+            features = self._push(state, float(close), volume)
+            state.features = features
+            return dict(features)
+
+    def _push(self, state: _TickerState, close: float, volume: Optional[float]) -> Dict[str, Optional[float]]:
+        x = close - state.anchor
+        n = state.count
+        ring = state.ring
+
+        # Values leaving each window (read before the slot is overwritten)
+        for w in MA_WINDOWS:
+            leaving = ring[(n - w) % CAPACITY] if n >= w else 0.0
+            state.sums[w] += x - leaving
+        leaving = ring[(n - VOLATILITY_WINDOW) % CAPACITY] if n >= VOLATILITY_WINDOW else 0.0
+        state.sumsq += x * x - leaving * leaving
+
+        ring[n % CAPACITY] = x
+        state.count = n = n + 1
+        if n % RESYNC_EVERY == 0:
+            self._resync(state)
+
+        ret = 0.0 if state.prev_close is None else close / state.prev_close - 1.0
+        features = {
+            "close": close,
+            "return": ret,
+            "log_return": math.log1p(ret) if ret > -1.0 else float("nan"),
+        }
+        if volume is not None:
+            prev = state.prev_volume
+            features["volume_change"] = 0.0 if not prev else volume / prev - 1.0
+            state.prev_volume = volume
+
+        for w in MA_WINDOWS:
+            features[f"ma_{w}"] = state.sums[w] / w + state.anchor if n >= w else None
+
+        w = VOLATILITY_WINDOW
+        if n >= w:
+            s = state.sums[w]
+            features[f"volatility_{w}"] = math.sqrt(max((state.sumsq - s * s / w) / (w - 1), 0.0))
+        else:
+            features[f"volatility_{w}"] = 0.0
+
+        state.prev_close = close
+        return features
+
+    def _resync(self, state: _TickerState):
+        n, ring = state.count, state.ring
+        last = lambda w: [ring[(n - 1 - k) % CAPACITY] for k in range(min(w, n))]
+        for w in MA_WINDOWS:
+            state.sums[w] = math.fsum(last(w))
+        state.sumsq = math.fsum(v * v for v in last(VOLATILITY_WINDOW))
+
+    # ────────────────────────────────────────────────
+    # READ / RESET
+    # ────────────────────────────────────────────────
+    def latest(self, ticker: str) -> Optional[Dict[str, Optional[float]]]:
+        with self._lock:
+            state = self._states.get(ticker)
+            return dict(state.features) if state is not None and state.count else None
+
+    def tickers(self):
+        return list(self._states)
+
+    def reset(self, ticker: Optional[str] = None):
+        with self._lock:
+            if ticker is None:
+                self._states.clear()
+            else:
+                self._states.pop(ticker, None)
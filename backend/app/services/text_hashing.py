@@ -0,0 +1,74 @@
+"""
+text_hashing.py
+---------------
+Stateless sparse text features for the event impact model, shared by
+training (frontend/scripts/retrain_event.py) and serving (EventEngine).
+
+Word n-grams and character n-grams are hashed into two fixed-width blocks
+(the hashing trick: no vocabulary is fitted or held in memory, and unseen
+terms at serving time need no refit) and stacked with the numeric event
+features into one scipy CSR matrix, which stays sparse all the way into
+a linear model.
+"""
+
+from typing import Optional, Sequence, Tuple
+import numpy as np
+
+
+class EventVectorizer:
+    """
+    texts (+ optional dense numeric columns) → CSR matrix of width
+    word_features + char_features + n_numeric.
+    """
+
+    def __init__(
+        self,
+        word_features: int = 2 ** 18,
+        char_features: int = 2 ** 18,
+        word_ngrams: Tuple[int, int] = (1, 2),
+        char_ngrams: Tuple[int, int] = (3, 5)
+    ):
+        self.word_features = word_features
+        self.char_features = char_features
+        self.word_ngrams = tuple(word_ngrams)
+        self.char_ngrams = tuple(char_ngrams)
+        self._hashers = None
+
+    def __getstate__(self):
+        # Only the parameters are persisted; hashers are rebuilt on demand
+        state = self.__dict__.copy()
+        state["_hashers"] = None
+        return state
+
+    def _build(self):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        common = dict(alternate_sign=False, norm="l2", dtype=np.float32, lowercase=True)
+        self._hashers = (
+            HashingVectorizer(analyzer="word", ngram_range=self.word_ngrams, n_features=self.word_features, **common),
+            HashingVectorizer(analyzer="char_wb", ngram_range=self.char_ngrams, n_features=self.char_features, **common),
+        )
+        return self._hashers
+
+    def transform(self, texts: Sequence[str], numeric: Optional[np.ndarray] = None):
+        import scipy.sparse as sp
+
+        words, chars = self._hashers or self._build()
+        blocks = [words.transform(texts), chars.transform(texts)]
+        if numeric is not None:
+            blocks.append(sp.csr_matrix(np.asarray(numeric, dtype=np.float32).reshape(len(texts), -1)))
+        return sp.hstack(blocks, format="csr")
+
+
+class HashedEventModel:
+    """
+    Event impact artifact: the vectorizer parameters plus a regressor
+    trained on its output (anything with a sparse-capable predict()).
+    """
+
+    def __init__(self, vectorizer: EventVectorizer, estimator):
+        self.vectorizer = vectorizer
+        self.estimator = estimator
+
+    def predict(self, texts: Sequence[str], numeric: np.ndarray) -> np.ndarray:
+        return np.asarray(self.estimator.predict(self.vectorizer.transform(texts, numeric)), dtype=float)
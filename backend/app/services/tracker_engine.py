@@ -1,10 +1,16 @@
 import os
 import json
 import logging
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, Optional, Union
 from app.config import Settings
 
 
+# The storage file is rewritten whole on every change and requests run on a
+# thread pool, so every read-modify-write in the process is serialized here.
+_STORAGE_LOCK = threading.Lock()
+
+
 class TrackerEngine:
     """
     Prediction vs Reality Tracker Engine
@@ -16,9 +22,10 @@ class TrackerEngine:
         self.storage_file = os.path.join(settings.BASE_DIR, "data", "prediction_tracker.json")
 
         # Initialize storage file if it does not exist
-        if not os.path.exists(self.storage_file):
-            with open(self.storage_file, "w") as f:
-                json.dump([], f, indent=2)
+        with _STORAGE_LOCK:
+            if not os.path.exists(self.storage_file):
+                os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
+                self._write_storage([])
 
         logging.info("TrackerEngine initialized.")
 
@@ -31,7 +38,7 @@ class TrackerEngine:
         symbol: str,
         predicted_value: float,
         actual_value: Optional[float] = None,
-        timestamp: Optional[int] = None
+        timestamp: Optional[Union[int, str]] = None
     ) -> Dict:
         """
         Logs prediction and optionally actual value.
@@ -44,12 +51,30 @@ class TrackerEngine:
             "timestamp": timestamp or int(__import__("time").time())
         }
 
-        data = self._read_storage()
-        data.append(entry)
-        self._write_storage(data)
+        with _STORAGE_LOCK:
+            data = self._read_storage()
+            data.append(entry)
+            self._write_storage(data)
 
         return entry
 
+    # ────────────────────────────────────────────────
+    # LOG THE ACTUAL VALUE OF EARLIER PREDICTIONS
+    # ────────────────────────────────────────────────
+    def log_actual(self, symbol: str, timestamp: Union[int, str], actual_value: float) -> int:
+        """
+        Fills in the actual value of every prediction logged for
+        (symbol, timestamp). Returns how many were updated.
+        """
+        with _STORAGE_LOCK:
+            data = self._read_storage()
+            matched = [d for d in data if d["symbol"] == symbol and d["timestamp"] == timestamp]
+            for d in matched:
+                d["actual_value"] = actual_value
+            if matched:
+                self._write_storage(data)
+        return len(matched)
+
     # ────────────────────────────────────────────────
     # GET ALL TRACKED PREDICTIONS
     # ────────────────────────────────────────────────
@@ -81,6 +106,39 @@ class TrackerEngine:
 
         return {"rmse": round(rmse, 4), "mae": round(mae, 4), "count": len(actuals)}
 
+    # ────────────────────────────────────────────────
+    # PREDICTION VS REALITY PER SYMBOL
+    # ────────────────────────────────────────────────
+    def compare(self, symbol: str) -> Dict:
+        """
+        Error statistics over the symbol's predictions that have an actual value.
+        """
+        merged = [d for d in self._read_storage() if d["symbol"] == symbol and d["actual_value"] is not None]
+        errors = [abs(d["actual_value"] - d["predicted_value"]) for d in merged]
+        pct = [e / abs(d["actual_value"]) for e, d in zip(errors, merged) if d["actual_value"]]
+
+        return {
+            "count": len(merged),
+            "avg_error": round(sum(errors) / len(errors), 4) if errors else None,
+            "mape": round(100 * sum(pct) / len(pct), 4) if pct else None,
+            "max_error": round(max(errors), 4) if errors else None,
+            "merged_data": merged,
+        }
+
+    def compute_accuracy(self, symbol: str) -> Optional[float]:
+        """ 100 - MAPE, floored at 0 (None without actual values) """
+        mape = self.compare(symbol)["mape"]
+        return None if mape is None else round(max(0.0, 100 - mape), 2)
+
+    def global_stats(self) -> Dict:
+        data = self._read_storage()
+        return {
+            "total_predictions": len(data),
+            "with_actuals": sum(1 for d in data if d["actual_value"] is not None),
+            "symbols": sorted({d["symbol"] for d in data}),
+            **self.calculate_accuracy(),
+        }
+
     # ────────────────────────────────────────────────
     # INTERNAL: READ STORAGE
     # ────────────────────────────────────────────────
@@ -97,7 +155,9 @@ class TrackerEngine:
     # ────────────────────────────────────────────────
     def _write_storage(self, data: List[Dict]):
         try:
-            with open(self.storage_file, "w") as f:
+            tmp = f"{self.storage_file}.tmp"
+            with open(tmp, "w") as f:
                 json.dump(data, f, indent=2)
+            os.replace(tmp, self.storage_file)
         except Exception as e:
             logging.warning(f"Failed to write tracker storage: {e}")
@@ -0,0 +1,188 @@
+"""
+var_engine.py
+-------------
+Monte Carlo Value-at-Risk / Expected Shortfall (CVaR) for positions and
+portfolios, alongside the heuristic RiskEngine score.
+
+Daily log returns are drawn from N(mu, cov) (correlated through the Cholesky
+factor of the covariance estimate) and accumulated up to the longest horizon;
+portfolio P&L is recorded at every requested horizon. Paths are simulated in
+fixed-size chunks, each with its own child of one SeedSequence, so
+
+- memory per chunk is bounded (chunk_paths x assets), and
+- results depend only on (seed, n_paths, chunk_paths), not on how the
+  chunks are spread over worker processes.
+"""
+
+import time
+import logging
+from concurrent.futures import Executor
+from typing import Dict, Optional, Sequence
+import numpy as np
+
+
+# ────────────────────────────────────────────────
+# INPUT ESTIMATES
+# ────────────────────────────────────────────────
+def estimate_moments(returns) -> tuple:
+    """
+    (mu, cov) of a (T, A) matrix of daily log returns.
+    """
+    returns = np.asarray(returns, dtype=float)
+    if returns.ndim == 1:
+        returns = returns[:, np.newaxis]
+    if len(returns) < 2:
+        raise ValueError("At least two return observations are needed")
+    return returns.mean(axis=0), np.atleast_2d(np.cov(returns, rowvar=False))
+
+
+def log_returns(prices) -> np.ndarray:
+    """ (T, A) prices → (T - 1, A) daily log returns """
+    return np.diff(np.log(np.asarray(prices, dtype=float)), axis=0)
+
+
+# Largest diagonal jitter, relative to the mean variance. Enough to absorb
+# rounding in singular estimates (collinear assets, short histories), far
+# too small to hide a genuinely indefinite covariance.
+MAX_RELATIVE_JITTER = 1e-8
+
+
+def cholesky(cov: np.ndarray) -> np.ndarray:
+    """
+    Lower Cholesky factor; a small diagonal jitter (at most
+    MAX_RELATIVE_JITTER x the mean variance) makes near-singular estimates
+    factorizable. Raises ValueError for anything that needs more.
+    """
+    cov = np.asarray(cov, dtype=float)
+    if not np.all(np.isfinite(cov)):
+        raise ValueError("Covariance matrix has non-finite entries")
+    scale = abs(np.trace(cov)) / len(cov) or 1.0
+    for jitter in (0.0, 1e-12, 1e-10, MAX_RELATIVE_JITTER):
+        try:
+            return np.linalg.cholesky(cov + jitter * scale * np.eye(len(cov)))
+        except np.linalg.LinAlgError:
+            continue
+    raise ValueError("Covariance matrix is not positive semi-definite")
+
+
+# ────────────────────────────────────────────────
+# ONE CHUNK OF PATHS (module-level: runs in worker processes)
+# ────────────────────────────────────────────────
+def simulate_chunk(
+    seed: np.random.SeedSequence,
+    n_paths: int,
+    mu: np.ndarray,
+    chol: np.ndarray,
+    positions: np.ndarray,
+    horizons: Sequence[int]
+) -> np.ndarray:
+    """
+    Portfolio losses (positive = loss) of `n_paths` paths, shape (n_paths, len(horizons)).
+    """
+    rng = np.random.default_rng(seed)
+    n_assets = len(mu)
+    column = {h: i for i, h in enumerate(horizons)}
+
+    cumulative = np.zeros((n_paths, n_assets))
+    shocks = np.empty((n_paths, n_assets))
+    losses = np.empty((n_paths, len(horizons)))
+
+    for step in range(1, max(horizons) + 1):
+        rng.standard_normal(out=shocks)
+        cumulative += shocks @ chol.T
+        cumulative += mu
+        if step in column:
+            losses[:, column[step]] = -(np.expm1(cumulative) @ positions)
+    return losses
+
+
+# ────────────────────────────────────────────────
+# ENGINE
+# ────────────────────────────────────────────────
+class MonteCarloVaR:
+    def __init__(
+        self,
+        chunk_paths: int = 20000,
+        max_paths: int = 1_000_000,
+        executor: Optional[Executor] = None,
+        max_horizon: int = 252
+    ):
+        """
+        executor:    optional process pool the chunks are spread over
+                     (None → simulated in the calling thread)
+        max_horizon: longest horizon in days; simulation cost grows with it
+        """
+        self.chunk_paths = chunk_paths
+        self.max_paths = max_paths
+        self.executor = executor
+        self.max_horizon = max_horizon
+
+    def run(
+        self,
+        positions: Sequence[float],
+        mu: Sequence[float],
+        cov,
+        n_paths: int = 100_000,
+        horizons: Sequence[int] = (1, 10),
+        confidences: Sequence[float] = (0.95, 0.99),
+        seed: Optional[int] = None
+    ) -> Dict:
+        """
+        positions: current value per asset (negative = short)
+        mu, cov:   daily log-return mean vector and covariance matrix
+
+        Returns VaR / CVaR per horizon and confidence as positive losses.
+        """
+        positions = np.asarray(positions, dtype=float)
+        mu = np.atleast_1d(np.asarray(mu, dtype=float))
+        cov = np.atleast_2d(np.asarray(cov, dtype=float))
+        if not (len(positions) == len(mu) == len(cov) == cov.shape[1]):
+            raise ValueError("positions, mu and cov must describe the same assets")
+        if not 0 < n_paths <= self.max_paths:
+            raise ValueError(f"n_paths must be between 1 and {self.max_paths}")
+        horizons = sorted(set(int(h) for h in horizons))
+        if not horizons or horizons[0] < 1 or horizons[-1] > self.max_horizon:
+            raise ValueError(f"Horizons are in days and must be between 1 and {self.max_horizon}")
+
+        chol = cholesky(cov)
+        root = np.random.SeedSequence(seed)
+        sizes = [min(self.chunk_paths, n_paths - start) for start in range(0, n_paths, self.chunk_paths)]
+        seeds = root.spawn(len(sizes))
+
+        start = time.perf_counter()
+        if self.executor is None:
+            chunks = [simulate_chunk(s, n, mu, chol, positions, horizons) for s, n in zip(seeds, sizes)]
+        else:
+            futures = [
+                self.executor.submit(simulate_chunk, s, n, mu, chol, positions, horizons)
+                for s, n in zip(seeds, sizes)
+            ]
+            chunks = [f.result() for f in futures]
+        losses = np.concatenate(chunks)
+        elapsed = time.perf_counter() - start
+
+        report = {}
+        for j, h in enumerate(horizons):
+            column = losses[:, j]
+            report[str(h)] = {
+                "expected_pnl": round(float(-column.mean()), 6),
+                **{str(c): _var_cvar(column, c) for c in confidences},
+            }
+
+        logging.info(f"Monte Carlo VaR: {n_paths} paths x {horizons[-1]} days in {elapsed * 1000:.0f} ms")
+        return {
+            "n_paths": n_paths,
+            "seed": root.entropy,
+            "portfolio_value": round(float(positions.sum()), 6),
+            "horizons": report,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "paths_per_second": round(n_paths / elapsed) if elapsed else None,
+        }
+
+
+def _var_cvar(losses: np.ndarray, confidence: float) -> Dict[str, float]:
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence levels must be between 0 and 1")
+    var = float(np.quantile(losses, confidence))
+    tail = losses[losses >= var]
+    return {"var": round(var, 6), "cvar": round(float(tail.mean()), 6)}
@@ -32,3 +32,11 @@ logging.basicConfig(
 )
 
 logger = logging.getLogger("app_logger")
+
+
+def log_info(message: str):
+    logger.info(message)
+
+
+def log_warning(message: str):
+    logger.warning(message)
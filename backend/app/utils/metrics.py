@@ -0,0 +1,101 @@
+import bisect
+import threading
+from typing import Dict, Iterable
+
+# ────────────────────────────────────────────────
+# IN-PROCESS METRICS
+# Lightweight counters / gauges / histograms that
+# are exposed as JSON through GET /metrics.
+# ────────────────────────────────────────────────
+_lock = threading.Lock()
+_metrics: Dict[str, object] = {}
+
+
+class Counter:
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self._value += amount
+
+    def snapshot(self):
+        return self._value
+
+
+class Gauge:
+    def __init__(self):
+        self._value = 0
+
+    def set(self, value: float):
+        self._value = value
+
+    def snapshot(self):
+        return self._value
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram. Bucket counts are cumulative ("le" semantics).
+    """
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        cumulative, running = {}, 0
+        for bound, c in zip(self.buckets + ["+Inf"], counts):
+            running += c
+            cumulative[str(bound)] = running
+
+        return {
+            "count": count,
+            "sum": round(total, 6),
+            "mean": round(total / count, 6) if count else None,
+            "buckets": cumulative,
+        }
+
+
+# ────────────────────────────────────────────────
+# GET-OR-CREATE ACCESSORS
+# ────────────────────────────────────────────────
+def _get_or_create(name: str, factory):
+    with _lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = factory()
+        return metric
+
+
+def counter(name: str) -> Counter:
+    return _get_or_create(name, Counter)
+
+
+def gauge(name: str) -> Gauge:
+    return _get_or_create(name, Gauge)
+
+
+def histogram(name: str, buckets: Iterable[float]) -> Histogram:
+    return _get_or_create(name, lambda: Histogram(buckets))
+
+
+def snapshot() -> Dict[str, object]:
+    with _lock:
+        items = list(_metrics.items())
+    return {name: metric.snapshot() for name, metric in sorted(items)}
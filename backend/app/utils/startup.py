@@ -0,0 +1,72 @@
+"""
+startup.py
+----------
+Startup-time accounting and the import-time probe.
+
+main.py wraps its startup phases (imports, settings, model load) in
+`startup_timer.phase(...)`; the breakdown is served at GET /health/startup.
+
+measure_import() times `import app.main` in a fresh interpreter;
+tests/test_startup.py holds it to STARTUP_IMPORT_BUDGET_S and to no heavy
+ML library being imported.
+"""
+
+import sys
+import time
+import json
+import os
+import subprocess
+from contextlib import contextmanager
+from typing import Dict
+
+# Libraries that must only be imported on first use
+HEAVY_MODULES = ("tensorflow", "statsmodels", "lightgbm", "sklearn", "pandas", "scipy")
+
+
+class StartupTimer:
+    def __init__(self):
+        self.created_at = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def report(self) -> Dict:
+        return {
+            "phases_ms": {k: round(v * 1000, 2) for k, v in self.phases.items()},
+            "total_ms": round(sum(self.phases.values()) * 1000, 2),
+            "heavy_modules_loaded": [m for m in HEAVY_MODULES if m in sys.modules],
+        }
+
+
+startup_timer = StartupTimer()
+
+
+# ────────────────────────────────────────────────
+# IMPORT BUDGET CHECK
+# ────────────────────────────────────────────────
+_PROBE = (
+    "import sys, time, json\n"
+    "start = time.perf_counter()\n"
+    "import app.main\n"
+    "elapsed = time.perf_counter() - start\n"
+    "heavy = [m for m in %r if m in sys.modules]\n"
+    "print(json.dumps({'import_s': elapsed, 'heavy_modules': heavy}))\n"
+) % (HEAVY_MODULES,)
+
+
+def measure_import() -> Dict:
+    """
+    Times `import app.main` in a fresh interpreter (cold module cache),
+    run from the backend directory whatever the caller's working directory.
+    """
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True, cwd=backend_dir
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
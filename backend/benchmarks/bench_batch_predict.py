@@ -0,0 +1,83 @@
+"""
+bench_batch_predict.py
+----------------------
+Throughput of ModelHandler.predict_batch (one batched LSTM rollout per
+request) against one predict_lstm call per series, on a randomly
+initialised NumPy LSTM (no trained artifacts needed).
+
+Run from the backend directory:
+    python -m benchmarks.bench_batch_predict [--units 50] [--length 60] [--steps 5]
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+from app.config import Settings
+from app.services.lstm_numpy import NumpyLSTMModel, save_npz
+from app.services.model_handler import ModelHandler
+from app.services.model_registry import ModelRegistry
+
+
+BATCH_SIZES = (1, 10, 50, 100, 500, 1000)
+
+
+def random_lstm(path: str, units: int) -> str:
+    rng = np.random.default_rng(0)
+    spec = [
+        {"type": "LSTM", "units": units, "activation": "tanh",
+         "recurrent_activation": "sigmoid", "return_sequences": False, "prefix": "l0"},
+        {"type": "Dense", "activation": None, "prefix": "l1"},
+    ]
+    arrays = {
+        "l0_kernel": rng.normal(0, 0.1, (1, 4 * units)),
+        "l0_recurrent_kernel": rng.normal(0, 0.1, (units, 4 * units)),
+        "l0_bias": np.zeros(4 * units),
+        "l1_kernel": rng.normal(0, 0.1, (units, 1)),
+        "l1_bias": np.zeros(1),
+    }
+    save_npz(path, spec, {k: v.astype(np.float32) for k, v in arrays.items()})
+    return path
+
+
+def build_handler(npz_path: str) -> ModelHandler:
+    settings = Settings(CACHE_BACKEND="none")
+    registry = ModelRegistry(settings)
+    registry.register("lstm", npz_path, NumpyLSTMModel.load)
+    return ModelHandler(settings, registry)
+
+
+def throughput(fn, n: int, repeat: int = 3) -> float:
+    """ Best-of-`repeat` series per second """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return n / best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--units", type=int, default=50)
+    parser.add_argument("--length", type=int, default=60)
+    parser.add_argument("--steps", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        handler = build_handler(random_lstm(os.path.join(tmp, "lstm.npz"), args.units))
+        rng = np.random.default_rng(1)
+
+        print(f"{'batch':>6} {'per-item series/s':>18} {'batched series/s':>17} {'speedup':>8}")
+        for n in BATCH_SIZES:
+            series = rng.random((n, args.length)).tolist()
+            items = [{"model": "lstm", "series": s, "steps": args.steps, "ticker": None} for s in series]
+
+            single = throughput(lambda: [handler.predict_lstm(s, args.steps) for s in series], n)
+            batched = throughput(lambda: handler.predict_batch(items), n)
+            print(f"{n:>6} {single:>18.0f} {batched:>17.0f} {batched / single:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
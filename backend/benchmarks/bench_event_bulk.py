@@ -0,0 +1,95 @@
+"""
+bench_event_bulk.py
+-------------------
+Headlines/second of EventEngine.predict_batch (one lexicon scan per
+headline, one scaler / model call per batch) against one
+predict_event_impact call per headline. With --model, a small linear
+impact model and scaler are fitted on random data so the ML path is
+measured too; otherwise the rule-based formula is used.
+
+Run from the backend directory:
+    python -m benchmarks.bench_event_bulk [--headlines 20000] [--model]
+"""
+
+import time
+import argparse
+import tempfile
+import numpy as np
+from app.config import Settings
+from app.services.event_engine import EventEngine
+from app.services.model_registry import ModelRegistry
+
+
+FILLER = ("shares", "investors", "analysts", "quarter", "company", "market", "announces", "says",
+          "global", "outlook", "after", "amid", "report", "new", "plans", "expected")
+TERMS = ("rate hike", "earnings beat", "bankruptcy", "merger", "lawsuit", "trade war", "recall",
+         "record profits", "fda approval", "layoffs")
+
+
+def random_headlines(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    headlines = []
+    for _ in range(n):
+        words = list(rng.choice(FILLER, rng.integers(6, 14)))
+        if rng.random() < 0.6:
+            words.insert(int(rng.integers(len(words))), str(rng.choice(TERMS)))
+        headlines.append(" ".join(words).capitalize())
+    return headlines
+
+
+def build_engine(with_model: bool) -> EventEngine:
+    settings = Settings()
+    registry = ModelRegistry(settings)
+    if with_model:
+        import joblib
+        from sklearn.linear_model import Ridge
+        from sklearn.preprocessing import StandardScaler
+
+        rng = np.random.default_rng(1)
+        X = rng.normal(size=(500, 3))
+        scaler = StandardScaler().fit(X)
+        model = Ridge().fit(scaler.transform(X), X @ [0.8, 0.4, -0.3])
+        directory = tempfile.mkdtemp()
+        for name, artifact in (("scaler", scaler), ("event_model", model)):
+            joblib.dump(artifact, f"{directory}/{name}.pkl")
+            registry.register(name, f"{directory}/{name}.pkl", joblib.load)
+    return EventEngine(settings, registry)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--headlines", type=int, default=20_000)
+    parser.add_argument("--chunk", type=int, default=500)
+    parser.add_argument("--model", action="store_true")
+    args = parser.parse_args()
+
+    engine = build_engine(args.model)
+    headlines = random_headlines(args.headlines)
+    rng = np.random.default_rng(2)
+    sentiment = rng.uniform(-1, 1, len(headlines))
+    volatility = rng.uniform(0, 0.1, len(headlines))
+    engine.predict_batch(headlines[:10], sentiment[:10], volatility[:10])   # load artifacts
+
+    n_single = min(len(headlines), 2000)
+    start = time.perf_counter()
+    single = [engine.predict_event_impact(h, s, v)
+              for h, s, v in zip(headlines[:n_single], sentiment[:n_single], volatility[:n_single])]
+    per_row = n_single / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(0, len(headlines), args.chunk):
+        batch = engine.predict_batch(headlines[i:i + args.chunk], sentiment[i:i + args.chunk],
+                                     volatility[i:i + args.chunk])
+    batched = len(headlines) / (time.perf_counter() - start)
+
+    check = engine.predict_batch(headlines[:n_single], sentiment[:n_single], volatility[:n_single])
+    assert [r["impact_label"] for r in single] == check["impact_label"].tolist()
+    assert np.allclose([r["impact_score"] for r in single], check["impact_score"], atol=1e-4)
+
+    print(f"{len(headlines)} headlines, path: {'model' if args.model else 'rule-based'}")
+    print(f"  {'one call per headline':<24} {per_row:>10,.0f} headlines/s")
+    print(f"  {f'batches of {args.chunk}':<24} {batched:>10,.0f} headlines/s  ({batched / per_row:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+bench_features.py
+-----------------
+Feature building for a batch of price windows: the pandas
+Preprocessor.engineer_features path (one DataFrame per series) against the
+vectorized builders in app.services.features.
+
+Run from the backend directory:
+    python -m benchmarks.bench_features [--series 10000] [--length 60]
+"""
+
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from app.services.features import FEATURE_NAMES, feature_matrix, latest_features
+from app.services.preprocessing import Preprocessor
+
+
+SHARED = ("return_1", "ma_5", "ma_10", "volatility_5")   # features both paths compute
+PANDAS_NAMES = {"return_1": "return"}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--series", type=int, default=10000)
+    parser.add_argument("--length", type=int, default=60)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    prices = 100 + np.cumsum(rng.normal(size=(args.series, args.length)), axis=1)
+    pre = Preprocessor()
+
+    frames, t_pandas = timed(lambda: [pre.engineer_features(pd.DataFrame({"close": row})) for row in prices])
+    matrix, t_matrix = timed(lambda: feature_matrix(prices))
+    latest, t_latest = timed(lambda: latest_features(prices))
+
+    # Same values on the last row of every series
+    for name in SHARED:
+        col = PANDAS_NAMES.get(name, name)
+        expected = np.array([f[col].iloc[-1] for f in frames])
+        got = latest[:, FEATURE_NAMES.index(name)]
+        assert np.allclose(got, expected), name
+        assert np.allclose(matrix[:, -1, FEATURE_NAMES.index(name)], expected), name
+
+    print(f"{args.series} series x {args.length} prices")
+    print(f"  pandas engineer_features : {t_pandas * 1000:9.1f} ms")
+    print(f"  feature_matrix (all rows): {t_matrix * 1000:9.1f} ms  ({t_pandas / t_matrix:.0f}x)")
+    print(f"  latest_features (serving): {t_latest * 1000:9.1f} ms  ({t_pandas / t_latest:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
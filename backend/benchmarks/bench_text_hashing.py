@@ -0,0 +1,64 @@
+"""
+bench_text_hashing.py
+---------------------
+Latency and memory of the hashed event vectorizer (EventVectorizer) on
+100k synthetic headlines: transform time, size of the CSR matrix against
+its dense equivalent, peak RSS growth during the transform and the
+persisted vectorizer size (parameters only: there is no vocabulary).
+Also times transform + one sparse predict call of a Ridge model.
+
+Run from the backend directory:
+    python -m benchmarks.bench_text_hashing [--headlines 100000]
+"""
+
+import time
+import pickle
+import argparse
+import resource
+import numpy as np
+from app.services.text_hashing import EventVectorizer, HashedEventModel
+from benchmarks.bench_event_bulk import random_headlines
+
+
+def csr_bytes(X) -> int:
+    return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+
+
+def mb(n_bytes: float) -> str:
+    return f"{n_bytes / 2**20:,.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--headlines", type=int, default=100_000)
+    args = parser.parse_args()
+
+    headlines = random_headlines(args.headlines)
+    rng = np.random.default_rng(0)
+    numeric = rng.normal(size=(len(headlines), 3))
+    vectorizer = EventVectorizer()
+    vectorizer.transform(headlines[:10], numeric[:10])   # import sklearn / build hashers outside the timing
+
+    peak_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    start = time.perf_counter()
+    X = vectorizer.transform(headlines, numeric)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 - peak_before
+
+    print(f"{len(headlines):,} headlines → {X.shape[1]:,} columns, {X.nnz:,} non-zeros")
+    print(f"  transform          {elapsed * 1000:>10,.0f} ms  ({len(headlines) / elapsed:,.0f} headlines/s)")
+    print(f"  CSR matrix         {mb(csr_bytes(X)):>13}  (dense float32 would be {mb(X.shape[0] * X.shape[1] * 4)})")
+    print(f"  peak RSS growth    {mb(peak):>13}")
+    print(f"  vectorizer pickle  {len(pickle.dumps(vectorizer)):>10,} bytes")
+
+    from sklearn.linear_model import Ridge
+    y = numeric @ [0.8, 0.4, -0.3]
+    model = HashedEventModel(vectorizer, Ridge(solver="sparse_cg").fit(X[:10_000], y[:10_000]))
+    start = time.perf_counter()
+    model.predict(headlines, numeric)
+    elapsed = time.perf_counter() - start
+    print(f"  transform + predict{elapsed * 1000:>10,.0f} ms  ({len(headlines) / elapsed:,.0f} headlines/s)")
+
+
+if __name__ == "__main__":
+    main()
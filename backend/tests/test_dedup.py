@@ -0,0 +1,80 @@
+import pytest
+from app.services.dedup import NearDuplicateIndex
+
+
+# Syndicated copies of one story (wire suffixes / prefixes, case,
+# punctuation); every copy must resolve to the first one
+SYNDICATED = (
+    ("Apple beats quarterly earnings estimates as iPhone sales surge",
+     "Apple beats quarterly earnings estimates as iPhone sales surge - Reuters",
+     "UPDATE 1-Apple beats quarterly earnings estimates as iPhone sales surge",
+     "Apple Beats Quarterly Earnings Estimates As iPhone Sales Surge",
+     "Apple beats quarterly earnings estimates, as iPhone sales surge"),
+    ("Federal Reserve raises interest rates by a quarter point to fight inflation",
+     "Federal Reserve raises interest rates by a quarter-point to fight inflation",
+     "Federal Reserve raises interest rates by a quarter point to fight inflation (Bloomberg)",
+     "BREAKING: Federal Reserve raises interest rates by a quarter point to fight inflation"),
+    ("Oil prices jump after OPEC+ agrees to deeper production cuts",
+     "Oil prices jump after OPEC+ agrees to deeper production cuts -sources",
+     "Oil prices jump after OPEC agrees to deeper production cuts"),
+    ("Tesla recalls 2 million vehicles over Autopilot safety concerns",
+     "Tesla recalls 2 million vehicles over autopilot safety concerns | CNBC"),
+)
+
+# Different stories on the same companies / topics; none may merge
+DISTINCT = (
+    "Microsoft beats quarterly earnings estimates as cloud revenue climbs",
+    "Apple misses revenue forecasts as China demand weakens",
+    "European Central Bank holds interest rates steady despite inflation",
+    "Oil prices slide as US crude inventories rise more than expected",
+    "Tesla shares fall after delivery numbers disappoint investors",
+    "Pfizer wins FDA approval for new RSV vaccine",
+    "Boeing faces lawsuit over 737 MAX door plug blowout",
+)
+
+
+@pytest.fixture
+def index():
+    index = NearDuplicateIndex(threshold=0.8, window_s=60.0)
+    for story in SYNDICATED:
+        index.resolve(story[0], now=0.0)
+    return index
+
+
+@pytest.mark.parametrize("story", SYNDICATED, ids=lambda story: story[0][:24])
+def test_syndicated_copies_resolve_to_first_copy(index, story):
+    canonical, _ = index.resolve(story[0], now=1.0)
+    for copy in story[1:]:
+        event, duplicate = index.resolve(copy, now=1.0)
+        assert duplicate, copy
+        assert event.id == canonical.id, copy
+
+
+@pytest.mark.parametrize("text", DISTINCT)
+def test_distinct_stories_do_not_merge(index, text):
+    event, duplicate = index.resolve(text, now=1.0)
+    assert not duplicate
+    assert event.text == text
+
+
+def test_copies_after_window_start_a_new_event(index):
+    for story in SYNDICATED:
+        event, duplicate = index.resolve(story[1], now=120.0)
+        assert not duplicate
+        assert event.text == story[1]
+    assert index.stats()["window_events"] == len(SYNDICATED)
+
+
+def test_cached_results_are_capped_and_cleared():
+    index = NearDuplicateIndex(max_results=2)
+    event, _ = index.resolve(SYNDICATED[0][0], now=0.0)
+    for key in ("a", "b", "c"):
+        index.store_result(event, key, key.upper())
+
+    assert index.cached_result(event, "a") is None
+    assert index.cached_result(event, "c") == "C"
+
+    index.clear_results()
+    assert index.cached_result(event, "c") is None
+    duplicate_of, duplicate = index.resolve(SYNDICATED[0][1], now=1.0)
+    assert duplicate and duplicate_of is event
@@ -0,0 +1,71 @@
+import os
+import random
+import re
+import pytest
+from app.services.lexicon import DEFAULT_LEXICON, KeywordMatcher, load_lexicon
+
+
+LEXICON_FILE = os.path.join(os.path.dirname(__file__), "..", "app", "models", "event_lexicon.csv")
+
+# Overlapping terms, word-boundary traps, case and spacing
+TRICKY_HEADLINES = (
+    "Software maker warns of warfare-style price war",
+    "RATE   HIKE expected; rate hikes priced in",
+    "Earnings: earnings-per-share beat, inflationary pressure eases",
+    "Merger and acquisition talks end in lawsuit",
+    "Bankruptcy_filing rumours (bankruptcy) denied",
+    "",
+    "war",
+)
+
+
+def scan_match(lexicon, text):
+    """ Reference matcher: one word-boundary search per term (the old `term in text` loop) """
+    text = " ".join(text.lower().split())
+    found = {}
+    for term, weight in lexicon.items():
+        term = " ".join(term.lower().split())
+        if term and re.search(rf"(?<!\w){re.escape(term)}(?!\w)", text):
+            found[term] = float(weight)
+    return found
+
+
+def random_headlines(lexicon, n=5000, seed=0):
+    """ Lexicon terms, fragments of them and filler words with mixed glue and case """
+    rng = random.Random(seed)
+    terms = list(lexicon)
+    words = [w for term in terms for w in term.split()]
+    fragments = [t[:rng.randint(1, len(t))] for t in terms] + [t[1:] for t in terms]
+    filler = ["shares", "investors", "say", "after", "amid", "the", "new", "software", "forward", "hiked"]
+
+    for _ in range(n):
+        pool = [rng.choice(terms), rng.choice(words), rng.choice(fragments), rng.choice(filler)]
+        parts = [rng.choice(pool) for _ in range(rng.randint(1, 12))]
+        glue = [rng.choice((" ", " ", "  ", "-", ", ", "")) for _ in parts]
+        text = "".join(p + g for p, g in zip(parts, glue))
+        yield text.upper() if rng.random() < 0.1 else text
+
+
+@pytest.fixture(params=["default", "file"])
+def lexicon(request):
+    if request.param == "default":
+        return DEFAULT_LEXICON
+    return load_lexicon(LEXICON_FILE)
+
+
+def test_automaton_matches_per_term_scan(lexicon):
+    matcher = KeywordMatcher(lexicon)
+    for headline in (*TRICKY_HEADLINES, *random_headlines(lexicon)):
+        assert dict(matcher.match(headline)) == scan_match(lexicon, headline), headline
+
+
+def test_matches_respect_word_boundaries():
+    matches = dict(KeywordMatcher(DEFAULT_LEXICON).match(TRICKY_HEADLINES[0]))
+    assert matches == {"war": DEFAULT_LEXICON["war"]}
+    assert KeywordMatcher(DEFAULT_LEXICON).match("Software and warfare") == []
+
+
+def test_matches_are_heaviest_first():
+    weights = [w for _, w in KeywordMatcher(DEFAULT_LEXICON).match(TRICKY_HEADLINES[3])]
+    assert weights == sorted(weights, reverse=True)
+    assert len(weights) == 3
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from app.services.preprocessing import Preprocessor
+
+
+def test_chunked_pipeline_keeps_all_nan_columns(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 1000
+    source = tmp_path / "prices.csv"
+    pd.DataFrame({
+        "close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+        "volume": rng.integers(1_000, 10_000, n).astype(float),
+        "open_interest": np.full(n, np.nan),
+    }).to_csv(source, index=False)
+
+    pre = Preprocessor().fit_chunked(str(source), chunksize=300)
+    rows = pre.transform_chunked(str(source), str(tmp_path / "features.csv"), chunksize=300)
+
+    out = pd.read_csv(tmp_path / "features.csv")
+    assert rows == len(out) == n
+    assert (out["open_interest"] == 0).all()
+    assert not out.isna().any().any()
@@ -0,0 +1,115 @@
+import math
+import os
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import Ridge
+from sklearn.preprocessing import StandardScaler
+from app.config import Settings
+from app.services.model_registry import ModelRegistry
+from app.services.risk_engine import RiskEngine, liquidity_risk
+from app.services.risk_state import RiskStateStore
+
+
+DECAY = 0.94
+N_TICKERS, N_TICKS = 200, 500
+
+
+def batch_state(prices, volumes, decay):
+    """ The state fields of one ticker recomputed from its whole history at once """
+    returns = np.diff(np.log(prices))
+    weights = (1 - decay) * decay ** np.arange(len(returns) - 1, -1, -1)
+    volume_weights = (1 - decay) * decay ** np.arange(len(volumes) - 2, -1, -1)
+    ewma_volume = decay ** (len(volumes) - 1) * volumes[0] + volume_weights @ volumes[1:]
+    peak = np.maximum.accumulate(prices)
+    return {
+        "volatility": math.sqrt(weights @ returns ** 2),
+        "liquidity": float(liquidity_risk(prices[-1], ewma_volume)),
+        "drawdown": 1.0 - prices[-1] / peak[-1],
+        "max_drawdown": float(np.max(1.0 - prices / peak)),
+    }
+
+
+def per_row_score(volatility, sentiment, liquidity, event_severity, model=None, scaler=None):
+    """ Scalar scoring as RiskEngine.predict did before it was vectorized """
+    features = np.array([volatility, sentiment, liquidity, event_severity]).reshape(1, -1)
+    if model is not None and scaler is not None:
+        return float(model.predict(scaler.transform(features))[0])
+    return max(0, min(1, 0.4 * volatility - 0.3 * sentiment + 0.2 * liquidity + 0.1 * event_severity))
+
+
+def per_row_category(score):
+    return "High Risk" if score >= 0.7 else "Medium Risk" if score >= 0.4 else "Low Risk"
+
+
+@pytest.fixture(scope="module")
+def feed():
+    rng = np.random.default_rng(0)
+    tickers = [f"T{i}" for i in range(N_TICKERS)]
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (N_TICKERS, N_TICKS)), axis=1))
+    volumes = rng.integers(1_000, 1_000_000, (N_TICKERS, N_TICKS)).astype(float)
+    return tickers, prices, volumes
+
+
+@pytest.fixture(scope="module")
+def store(feed):
+    tickers, prices, volumes = feed
+    store = RiskStateStore(decay=DECAY, capacity=16)   # also exercises growth
+    for t in range(N_TICKS):
+        for i, ticker in enumerate(tickers):
+            store.update(ticker, prices[i, t], volumes[i, t], timestamp=float(t))
+    return store
+
+
+def test_live_state_matches_full_history(feed, store):
+    tickers, prices, volumes = feed
+    live = store.features_many(tickers)
+    for i in range(len(tickers)):
+        for name, value in batch_state(prices[i], volumes[i], DECAY).items():
+            assert live[name][i] == pytest.approx(value, abs=1e-9), (tickers[i], name)
+
+
+def test_snapshot_round_trip(feed, store, tmp_path):
+    tickers = feed[0]
+    path = str(tmp_path / "risk_state.npz")
+    store.snapshot(path)
+    restored = RiskStateStore.load(path)
+
+    assert len(restored) == len(store)
+    for name, values in store.features_many(tickers).items():
+        np.testing.assert_array_equal(restored.features_many(tickers)[name], values)
+
+
+def _registry(directory, artifacts):
+    registry = ModelRegistry(Settings())
+    for name, artifact in zip(("risk_model", "scaler"), artifacts or (None, None)):
+        path = os.path.join(directory, f"{name}.pkl")
+        if artifact is not None:
+            joblib.dump(artifact, path)
+        registry.register(name, path, joblib.load)
+    return registry
+
+
+def _fitted_model():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(500, 4))
+    scaler = StandardScaler().fit(X)
+    return Ridge().fit(scaler.transform(X), X @ [0.5, -0.3, 0.2, 0.1] + 0.5), scaler
+
+
+@pytest.mark.parametrize("artifacts", [None, _fitted_model()], ids=["rule", "model"])
+def test_batch_scoring_matches_per_row(feed, store, tmp_path, artifacts):
+    tickers = feed[0]
+    rng = np.random.default_rng(2)
+    sentiment = rng.uniform(-1, 1, len(tickers))
+    severity = rng.uniform(0, 1, len(tickers))
+    live = store.features_many(tickers)
+
+    engine = RiskEngine(Settings(), _registry(str(tmp_path), artifacts), state=store)
+    batch = engine.predict_batch(live["volatility"], sentiment, live["liquidity"], severity)
+
+    for i in range(len(tickers)):
+        expected = per_row_score(live["volatility"][i], sentiment[i], live["liquidity"][i], severity[i],
+                                 *(artifacts or (None, None)))
+        assert batch["risk_score"][i] == pytest.approx(expected, abs=1e-9)
+        assert batch["risk_category"][i] == per_row_category(expected)
@@ -0,0 +1,15 @@
+from app.config import get_settings
+from app.utils.startup import measure_import
+
+
+def test_import_app_main_within_budget():
+    result = measure_import()
+    budget_s = get_settings().STARTUP_IMPORT_BUDGET_S
+    assert result["import_s"] <= budget_s, (
+        f"import app.main took {result['import_s'] * 1000:.0f} ms (budget {budget_s * 1000:.0f} ms)"
+    )
+
+
+def test_import_app_main_loads_no_heavy_modules():
+    heavy = measure_import()["heavy_modules"]
+    assert not heavy, f"import app.main pulled in {heavy}; these must be imported on first use"
@@ -0,0 +1,38 @@
+import threading
+from app.services.state_space import StateSpaceStore
+
+
+class Base:
+    """ Stand-in for fitted results: forecasts its own tag """
+    def __init__(self, tag):
+        self.tag = tag
+
+    def forecast(self, steps):
+        return [self.tag] * steps
+
+
+def test_reset_during_forecast_drops_stale_state():
+    current = {"base": Base(1.0)}
+    resolved, resume = threading.Event(), threading.Event()
+
+    def base_results(ticker):
+        base = current["base"]
+        resolved.set()
+        resume.wait(5)
+        return base
+
+    store = StateSpaceStore("arima", base_results)
+    out = []
+    worker = threading.Thread(target=lambda: out.append(store.forecast("X", [1, 2, 3, 4, 5], 1)))
+    worker.start()
+
+    # Base model reloaded while the forecast is building on the old one
+    resolved.wait(5)
+    current["base"] = Base(2.0)
+    store.reset()
+    resume.set()
+    worker.join(5)
+
+    assert out[0].tolist() == [1.0]
+    assert store.tickers() == []
+    assert store.forecast("X", [1, 2, 3, 4, 5], 1).tolist() == [2.0]
@@ -0,0 +1,88 @@
+"""
+retrain_event.py
+----------------
+Retrains the event impact model on hashed word / character n-grams of the
+event text plus the numeric features the API computes (lexicon keyword
+strength, sentiment, volatility). Vectorization and numeric features come
+from the backend (app/services/text_hashing.py, EventEngine), so training
+and serving build identical sparse rows and no vocabulary is stored.
+
+Input: a CSV with a text column, an impact column in [-1, 1] and,
+optionally, sentiment / volatility columns (default 0). A description
+column, if present, is appended to the headline the way the API does.
+
+Usage (from the repository root):
+    python frontend/scripts/retrain_event.py events.csv \
+        [--text-col headline] [--target-col impact] [--out-dir backend/app/models]
+
+Writes event_impact_model.pkl (vectorizer parameters + regressor). The API
+picks it up through the model reload endpoint.
+"""
+
+import os
+import sys
+import argparse
+import logging
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend")
+sys.path.insert(0, os.path.normpath(BACKEND_DIR))
+
+from app.config import Settings  # noqa: E402
+from app.services.event_engine import EventEngine  # noqa: E402
+from app.services.text_hashing import EventVectorizer, HashedEventModel  # noqa: E402
+
+
+def load_events(csv_path: str, text_col: str, target_col: str):
+    import pandas as pd
+
+    df = pd.read_csv(csv_path)
+    texts = df[text_col].fillna("").astype(str)
+    if "description" in df.columns:
+        description = df["description"].fillna("").astype(str)
+        texts = texts.where(description == "", texts + ". " + description)
+    sentiment = df["sentiment"].fillna(0.0).to_numpy(float) if "sentiment" in df.columns else np.zeros(len(df))
+    volatility = df["volatility"].fillna(0.0).to_numpy(float) if "volatility" in df.columns else np.zeros(len(df))
+    return texts.tolist(), sentiment, volatility, df[target_col].to_numpy(float)
+
+
+def train(texts, numeric, y, vectorizer: EventVectorizer, valid_fraction: float = 0.2, alpha: float = 1.0):
+    from sklearn.linear_model import Ridge
+    from sklearn.metrics import mean_absolute_error
+
+    X = vectorizer.transform(texts, numeric)   # CSR, never densified
+    split = int(len(y) * (1 - valid_fraction))
+    estimator = Ridge(alpha=alpha, solver="sparse_cg").fit(X[:split], y[:split])
+    if split < len(y):
+        mae = mean_absolute_error(y[split:], estimator.predict(X[split:]))
+        logging.info(f"Validation MAE on {len(y) - split} rows: {mae:.4f}")
+
+    # Final model on every row
+    estimator = Ridge(alpha=alpha, solver="sparse_cg").fit(X, y)
+    return HashedEventModel(vectorizer, estimator), X
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv")
+    parser.add_argument("--text-col", default="headline")
+    parser.add_argument("--target-col", default="impact")
+    parser.add_argument("--word-features", type=int, default=2 ** 18)
+    parser.add_argument("--char-features", type=int, default=2 ** 18)
+    parser.add_argument("--alpha", type=float, default=1.0)
+    parser.add_argument("--out-dir", default=os.path.join(BACKEND_DIR, "app", "models"))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    import joblib
+
+    texts, sentiment, volatility, y = load_events(args.csv, args.text_col, args.target_col)
+    numeric, _ = EventEngine(Settings()).numeric_features(texts, sentiment, volatility)
+    vectorizer = EventVectorizer(args.word_features, args.char_features)
+
+    model, X = train(texts, numeric, y, vectorizer, alpha=args.alpha)
+    logging.info(f"Trained on {X.shape[0]} rows x {X.shape[1]} hashed features ({X.nnz} non-zeros)")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    joblib.dump(model, os.path.join(args.out_dir, "event_impact_model.pkl"))
+    logging.info(f"Saved event_impact_model.pkl to {args.out_dir}")
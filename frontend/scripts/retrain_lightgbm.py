@@ -0,0 +1,93 @@
+"""
+retrain_lightgbm.py
+-------------------
+Retrains the LightGBM next-price model on raw closing prices using the same
+feature builder as the API (backend/app/services/features.py), so training
+and serving can never drift apart.
+
+Input: a CSV with a close-price column and, optionally, a ticker column
+(features are built per ticker, never across ticker boundaries).
+
+Usage (from the repository root):
+    python frontend/scripts/retrain_lightgbm.py prices.csv \
+        [--price-col close] [--ticker-col ticker] [--out-dir backend/app/models]
+
+Writes lightgbm_model.txt and lightgbm_scaler.pkl, the MinMax scaler the
+serving path applies to the features. It is kept apart from scaler.pkl,
+which the risk and event engines read. The API picks both up through the
+model reload endpoint.
+"""
+
+import os
+import sys
+import argparse
+import logging
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend")
+sys.path.insert(0, os.path.normpath(BACKEND_DIR))
+
+from app.services.features import FEATURE_NAMES, training_set  # noqa: E402
+
+
+def load_series(csv_path: str, price_col: str, ticker_col: str):
+    import pandas as pd
+
+    df = pd.read_csv(csv_path)
+    if ticker_col in df.columns:
+        return [group[price_col].to_numpy(dtype=float) for _, group in df.groupby(ticker_col, sort=False)]
+    return [df[price_col].to_numpy(dtype=float)]
+
+
+def build_dataset(series):
+    parts = [training_set(prices) for prices in series]
+    parts = [(X, y) for X, y in parts if len(y)]
+    if not parts:
+        raise ValueError("Not enough history to build any training rows")
+    return np.vstack([X for X, _ in parts]), np.concatenate([y for _, y in parts])
+
+
+def train(X: np.ndarray, y: np.ndarray, valid_fraction: float = 0.2, rounds: int = 500):
+    import lightgbm as lgb
+    from sklearn.preprocessing import MinMaxScaler
+
+    scaler = MinMaxScaler().fit(X)
+    Xs = scaler.transform(X)
+
+    # Chronological split (rows of each ticker are in time order)
+    split = int(len(y) * (1 - valid_fraction))
+    train_set = lgb.Dataset(Xs[:split], y[:split], feature_name=FEATURE_NAMES)
+    valid_set = lgb.Dataset(Xs[split:], y[split:], reference=train_set)
+
+    params = {
+        "objective": "regression",
+        "learning_rate": 0.05,
+        "num_leaves": 31,
+        "verbose": -1,
+    }
+    booster = lgb.train(
+        params, train_set, num_boost_round=rounds,
+        valid_sets=[valid_set], callbacks=[lgb.early_stopping(50, verbose=False)]
+    )
+    return booster, scaler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv")
+    parser.add_argument("--price-col", default="close")
+    parser.add_argument("--ticker-col", default="ticker")
+    parser.add_argument("--out-dir", default=os.path.join(BACKEND_DIR, "app", "models"))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    import joblib
+
+    X, y = build_dataset(load_series(args.csv, args.price_col, args.ticker_col))
+    logging.info(f"Training on {len(y)} rows x {X.shape[1]} features")
+
+    booster, scaler = train(X, y)
+    os.makedirs(args.out_dir, exist_ok=True)
+    booster.save_model(os.path.join(args.out_dir, "lightgbm_model.txt"))
+    joblib.dump(scaler, os.path.join(args.out_dir, "lightgbm_scaler.pkl"))
+    logging.info(f"Saved lightgbm_model.txt and lightgbm_scaler.pkl to {args.out_dir} (best iteration {booster.best_iteration})")
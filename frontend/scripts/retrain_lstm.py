@@ -0,0 +1,64 @@
+"""
+retrain_lstm.py
+---------------
+Retrains the LSTM next-price model from memory-mapped price arrays, so the
+training set can be larger than RAM: windows are cut on the fly by
+SequenceBatchStream (backend/app/services/sequence_stream.py) and only one
+shuffled mini-batch is materialized at a time.
+
+Input: one 1-D float .npy file of closing prices per ticker, in time order
+(e.g. np.save("AAPL.npy", closes)).
+
+Usage (from the repository root):
+    python frontend/scripts/retrain_lstm.py data/AAPL.npy data/MSFT.npy ... \
+        [--seq-length 60] [--epochs 10] [--batch-size 256] [--out-dir backend/app/models]
+
+Writes lstm_model.h5 and its NumPy-engine export lstm_model.npz.
+"""
+
+import os
+import sys
+import argparse
+import logging
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend")
+sys.path.insert(0, os.path.normpath(BACKEND_DIR))
+
+from app.services.lstm_numpy import export_lstm_weights  # noqa: E402
+from app.services.sequence_stream import SequenceBatchStream  # noqa: E402
+
+
+def build_model(seq_length: int, units: int = 50):
+    import tensorflow as tf
+
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(seq_length, 1)),
+        tf.keras.layers.LSTM(units),
+        tf.keras.layers.Dense(1),
+    ])
+    model.compile(optimizer="adam", loss="mse")
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("npy", nargs="+")
+    parser.add_argument("--seq-length", type=int, default=60)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--out-dir", default=os.path.join(BACKEND_DIR, "app", "models"))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    stream = SequenceBatchStream.from_npy(args.npy, args.seq_length, batch_size=args.batch_size, seed=0)
+    logging.info(f"{stream.n_windows} windows in {len(stream)} batches per epoch")
+
+    model = build_model(args.seq_length)
+    model.fit(stream.as_tf_dataset(), epochs=args.epochs)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    h5_path = os.path.join(args.out_dir, "lstm_model.h5")
+    model.save(h5_path)
+    export_lstm_weights(h5_path, os.path.join(args.out_dir, "lstm_model.npz"))
+    logging.info(f"Saved lstm_model.h5 / lstm_model.npz to {args.out_dir}")